@@ -7,26 +7,24 @@ Usage:
 
 This is an alternative to running `python run.py`.
 Both methods are equivalent - create_app() handles all initialization.
+Set SERVER_MODE=production to serve with Gunicorn (see app/server.py).
 """
 
 
 def main():
     """Main entry point for module execution."""
     from .app import create_app
+    from .server import serve
 
     # Create and configure the application
     # create_app() handles all initialization including:
-    # - Data file downloads (anime_data.db, app.ini, titles.ini)
+    # - Data file downloads (anime_data.db, app.ini) in the background
     # - Database initialization
     # - Extension setup
     app = create_app()
 
-    # Get host and port from config
-    port = app.config.get("PORT", 5000)
-    host = app.config.get("HOST", "0.0.0.0")
-
-    # Run the Flask application
-    app.run(host=host, port=port)
+    # Serve in the mode selected by SERVER_MODE (development or production)
+    serve(app)
 
 
 if __name__ == "__main__":
@@ -60,6 +60,7 @@ toloka_ns = api.namespace("toloka", description="Toloka operations")
 mal_ns = api.namespace("mal", description="MyAnimeList operations")
 tmdb_ns = api.namespace("tmdb", description="TMDB operations")
 users_ns = api.namespace("users", description="User operations")
+batch_ns = api.namespace("batch", description="Batched API calls")
 
 # Import models (defined in models.py - single source of truth)
 # This must be done after api is created since models use api.model()
@@ -135,23 +136,15 @@ class TokenRefresh(Resource):
         Use this endpoint with your refresh token to get a new access token.
         The refresh token should be provided in the Authorization header as 'Bearer <refresh_token>'.
         """
-        from flask_jwt_extended import get_jwt_identity, get_jwt, verify_jwt_in_request
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
         from app.models.user import User
-        from app.models.revoked_token import RevokedToken
         from app.models.base import db
-        from app.routes.auth import token_blocklist
 
         try:
             verify_jwt_in_request(refresh=True)
 
-            # Get user info
+            # Revoked refresh tokens are rejected by verify_jwt_in_request
             current_user_id = get_jwt_identity()
-            jwt = get_jwt()
-
-            # Check if token is in blocklist (both in-memory and database)
-            jti = jwt.get("jti")
-            if jti in token_blocklist or RevokedToken.is_token_revoked(jti):
-                return {"error": "Token has been revoked", "code": "token_revoked"}, 401
 
             user = db.session.get(User, int(current_user_id))
             if not user:
@@ -70,7 +70,35 @@ studio_model = api.model(
     {
         "id": fields.Integer(description="Studio ID"),
         "name": fields.String(description="Studio name"),
-        "description": fields.String(description="Studio description"),
+        "telegram": fields.String(description="Studio Telegram link"),
+        "synonyms": fields.List(fields.String, description="Other names"),
+        "title_count": fields.Integer(description="Titles in the catalogue"),
+        "ongoing_count": fields.Integer(description="Titles still airing"),
+        "latest_release": fields.String(description="Newest release date"),
+    },
+)
+
+episode_model = api.model(
+    "Episode",
+    {
+        "id": fields.Integer(description="Episode ID"),
+        "episode": fields.Integer(description="Episode number"),
+        "subtitles": fields.Boolean(description="Subtitled rather than dubbed"),
+        "player": fields.Integer(description="Player ID"),
+        "anime_id": fields.Integer(description="Anime ID"),
+        "videoUrl": fields.String(description="Video URL"),
+    },
+)
+
+anime_full_model = api.model(
+    "AnimeFull",
+    {
+        "anime": fields.Nested(anime_model, description="Anime details"),
+        "related": fields.List(
+            fields.Nested(anime_model), description="Related titles"
+        ),
+        "studios": fields.List(fields.Nested(studio_model), description="Studios"),
+        "episodes": fields.List(fields.Nested(episode_model), description="Episodes"),
     },
 )
 
@@ -134,6 +162,76 @@ release_input = api.model(
     },
 )
 
+release_spec = api.model(
+    "ReleaseSpec",
+    {
+        "url": fields.String(required=True, description="Toloka topic URL"),
+        "season": fields.String(required=True, description="Season number"),
+        "index": fields.Integer(required=True, description="Episode index"),
+        "correction": fields.Integer(
+            required=True, description="Episode number correction"
+        ),
+        "title": fields.String(required=True, description="Release title"),
+        "ongoing": fields.Boolean(description="Ongoing (partial) season"),
+        "release_group": fields.String(description="Release group"),
+        "meta": fields.String(description="Meta/tags, e.g. WEBDL"),
+    },
+)
+
+release_bulk_input = api.model(
+    "ReleaseBulkInput",
+    {"releases": fields.List(fields.Nested(release_spec), required=True)},
+)
+
+release_bulk_response = api.model(
+    "ReleaseBulkResponse",
+    {
+        "total": fields.Integer(description="Number of releases submitted"),
+        "added": fields.Integer(description="Number of releases added"),
+        "failed": fields.Integer(description="Number of releases that failed"),
+        "results": fields.List(
+            fields.Raw, description="Per-release result, in input order"
+        ),
+    },
+)
+
+release_bulk_selection = api.model(
+    "ReleaseBulkSelection",
+    {
+        "codenames": fields.List(
+            fields.String, description="Release codenames (INI sections)"
+        ),
+        "filter": fields.Raw(
+            description="Column equality filter on season_number, download_dir, "
+            'release_group, meta or ongoing, e.g. {"ongoing": true}'
+        ),
+    },
+)
+
+release_bulk_edit_input = api.inherit(
+    "ReleaseBulkEditInput",
+    release_bulk_selection,
+    {
+        "changes": fields.Raw(
+            required=True,
+            description="New values for episode_index, season_number, download_dir, "
+            "release_group, meta, adjusted_episode_number or ongoing",
+        ),
+    },
+)
+
+release_bulk_edit_response = api.model(
+    "ReleaseBulkEditResponse",
+    {
+        "updated": fields.Integer(description="Number of releases changed"),
+        "deleted": fields.Integer(description="Number of releases deleted"),
+        "codenames": fields.List(fields.String, description="Affected codenames"),
+        "not_found": fields.List(
+            fields.String, description="Requested codenames that do not exist"
+        ),
+    },
+)
+
 release_defaults_response = api.model(
     "ReleaseDefaultsResponse",
     {
@@ -270,3 +368,28 @@ image_proxy_response = api.model(
         "data": fields.String(description="Base64 encoded image data"),
     },
 )
+
+# Batch Models
+batch_sub_request = api.model(
+    "BatchSubRequest",
+    {
+        "id": fields.String(required=False, description="Client-chosen identifier"),
+        "method": fields.String(required=False, description="HTTP method (GET)"),
+        "path": fields.String(required=True, description="API path, e.g. /api/anime/1"),
+        "body": fields.Raw(required=False, description="JSON body"),
+    },
+)
+
+batch_input = api.model(
+    "BatchInput",
+    {"requests": fields.List(fields.Nested(batch_sub_request), required=True)},
+)
+
+batch_result = api.model(
+    "BatchResult",
+    {
+        "id": fields.String(description="Identifier of the sub-request"),
+        "status": fields.Integer(description="HTTP status code"),
+        "body": fields.Raw(description="Response body"),
+    },
+)
@@ -14,6 +14,7 @@ from . import (
     mal_ns,
     tmdb_ns,
     users_ns,
+    batch_ns,
 )
 from .models import (
     error_response,
@@ -22,8 +23,13 @@ from .models import (
     token_response,
     user_info,
     anime_model,
+    anime_full_model,
     studio_model,
     release_input,
+    release_bulk_input,
+    release_bulk_response,
+    release_bulk_edit_input,
+    release_bulk_edit_response,
     release_defaults_response,
     setting_model,
     anime_list_response,
@@ -43,6 +49,8 @@ from .models import (
     aggregated_search_response,
     auth_check_response,
     image_proxy_response,
+    batch_input,
+    batch_result,
 )
 
 # Local imports - App
@@ -111,6 +119,44 @@ class AnimeDetail(Resource):
         return get_anime_byid(anime_id)
 
 
+@anime_ns.route("/<int:anime_id>/full")
+class AnimeFull(Resource):
+    @api.doc(
+        "get_anime_full",
+        responses={
+            200: ("Success", anime_full_model),
+            401: ("Unauthorized", error_response),
+            404: ("Not Found", error_response),
+            500: ("Server Error", error_response),
+        },
+    )
+    @multi_auth_required
+    def get(self, anime_id):
+        """Get anime details with related titles, studios and episodes"""
+        from app.routes.anime import get_anime_full
+
+        return get_anime_full(anime_id)
+
+
+@anime_ns.route("/<int:anime_id>/franchise")
+class AnimeFranchise(Resource):
+    @api.doc(
+        "get_anime_franchise",
+        responses={
+            200: ("Success", anime_list_response),
+            401: ("Unauthorized", error_response),
+            404: ("Not Found", error_response),
+            500: ("Server Error", error_response),
+        },
+    )
+    @multi_auth_required
+    def get(self, anime_id):
+        """List every anime of an anime's franchise (all seasons, movies, OVAs)"""
+        from app.routes.anime import get_anime_franchise
+
+        return get_anime_franchise(anime_id)
+
+
 # Studio Routes
 @studio_ns.route("")
 class StudioList(Resource):
@@ -455,8 +501,27 @@ class ReleaseList(Resource):
 
         return edit_release()
 
+    @api.doc(
+        "bulk_edit_releases",
+        responses={
+            200: ("Success", release_bulk_edit_response),
+            400: ("Bad Request", error_response),
+            401: ("Unauthorized", error_response),
+            500: ("Server Error", error_response),
+        },
+    )
+    @api.expect(release_bulk_edit_input)
+    @multi_auth_required
+    def patch(self):
+        """Change many releases at once, selected by codenames or filter"""
+        from app.routes.release import bulk_edit_releases
+
+        return bulk_edit_releases()
+
     @api.doc(
         "delete_release",
+        description="Send codename to delete one release, or codenames/filter "
+        "(see ReleaseBulkSelection) to delete many in one transaction.",
         responses={
             200: ("Success", success_response),
             400: ("Bad Request", error_response),
@@ -467,12 +532,33 @@ class ReleaseList(Resource):
     @api.expect(release_input)
     @multi_auth_required
     def delete(self):
-        """Delete a release"""
+        """Delete a release, or many releases"""
         from app.routes.release import delete_release
 
         return delete_release()
 
 
+@releases_ns.route("/bulk")
+class ReleaseBulk(Resource):
+    @api.doc(
+        "add_releases_bulk",
+        responses={
+            200: ("Success", release_bulk_response),
+            400: ("Bad Request", error_response),
+            401: ("Unauthorized", error_response),
+            409: ("Bulk import already running", error_response),
+            500: ("Server Error", error_response),
+        },
+    )
+    @api.expect(release_bulk_input)
+    @multi_auth_required
+    def post(self):
+        """Add many releases at once"""
+        from app.routes.release import add_releases_bulk
+
+        return add_releases_bulk()
+
+
 @releases_ns.route("/update")
 class ReleaseUpdate(Resource):
     @api.doc(
@@ -662,3 +748,29 @@ class ImageProxy(Resource):
         from app.routes.routes import proxy_image
 
         return proxy_image()
+
+
+# Batch Routes
+@batch_ns.route("")
+class Batch(Resource):
+    @api.doc(
+        "batch",
+        responses={
+            200: ("Success", batch_result),
+            400: ("Bad Request", error_response),
+            401: ("Unauthorized", error_response),
+        },
+    )
+    @api.expect(batch_input)
+    def post(self):
+        """Execute several API calls in one request
+
+        Consecutive GET sub-requests run concurrently, other methods run in
+        order. Results are returned in request order.
+        """
+        from flask import make_response
+        from app.routes.batch import batch
+
+        # The view handles auth; its error tuples are converted to a Response
+        # here so that RESTX does not try to marshal them
+        return make_response(batch())
@@ -2,10 +2,6 @@
 from datetime import timedelta
 import os
 import sqlite3
-import logging
-
-# Third-party imports
-import requests
 
 # Flask and extensions
 from flask import Flask, jsonify
@@ -14,6 +10,7 @@ from flask_principal import Principal, Permission, RoleNeed
 from flask_jwt_extended import JWTManager
 
 # Local imports
+from app.services.bootstrap_service import BootstrapService
 from app.services.config_service import ConfigService
 from app.services.services_db import DatabaseService
 from .models.base import db
@@ -27,57 +24,6 @@ _DEFAULT_SECRETS = {
 }
 
 
-def _initialize_data_files():
-    """Initialize required data files before app startup.
-
-    Creates necessary directories and downloads required files if they don't exist:
-    - data/anime_data.db: Anime database (downloaded if missing)
-    - data/app.ini: Application configuration (downloaded if missing)
-    - data/titles.ini: Release tracking (created empty if missing)
-
-    This function is called during create_app() to ensure all required
-    files exist before the Flask application is fully initialized.
-    """
-
-    # Ensure data directory exists
-    os.makedirs("data", exist_ok=True)
-
-    # Check and download anime database if not exists
-    local_db_path = "data/anime_data.db"
-    if not os.path.exists(local_db_path):
-        logging.info("Database not found. Downloading the database...")
-        try:
-            DatabaseService.update_database()
-        except Exception as e:
-            logging.warning(f"Failed to download anime database: {e}")
-
-    # Check and download app.ini if not exists
-    app_ini_path = "data/app.ini"
-    if not os.path.exists(app_ini_path):
-        logging.info("app.ini not found. Downloading template...")
-        try:
-            response = requests.get(
-                "https://raw.githubusercontent.com/CakesTwix/Toloka2MediaServer/main/data/app-example.ini",
-                timeout=30,
-            )
-            response.raise_for_status()
-            with open(app_ini_path, "wb") as f:
-                f.write(response.content)
-            logging.info(f"Downloaded app.ini to {app_ini_path}")
-        except Exception as e:
-            logging.warning(f"Failed to download app.ini: {e}")
-
-    # Check and create titles.ini if not exists
-    titles_ini_path = "data/titles.ini"
-    if not os.path.exists(titles_ini_path):
-        logging.info("titles.ini not found. Creating empty file...")
-        try:
-            with open(titles_ini_path, "w", encoding="utf-8") as f:
-                pass  # Create empty file
-        except OSError as e:
-            logging.warning(f"Failed to create titles.ini: {e}")
-
-
 def _validate_environment_config(app):
     """Validate environment configuration and log warnings for insecure defaults.
 
@@ -165,9 +111,10 @@ def create_app(test_config=None):
     Returns:
         Configured Flask application instance.
     """
-    # Initialize data files before creating app (downloads if missing)
+    # Create the data directory and titles.ini; missing downloads are
+    # started in the background once the database tables exist
     if test_config is None:
-        _initialize_data_files()
+        BootstrapService.prepare()
 
     app = Flask(__name__)
 
@@ -202,6 +149,8 @@ def create_app(test_config=None):
             # Server Configuration
             PORT=int(os.environ.get("PORT", 5000)),
             HOST=os.environ.get("HOST", "0.0.0.0"),
+            # "development" (Werkzeug) or "production" (Gunicorn), see app/server.py
+            SERVER_MODE=os.environ.get("SERVER_MODE", "development").lower(),
             # CORS Configuration
             CORS_ORIGINS=os.environ.get("CORS_ORIGINS", "*").split(","),
         )
@@ -257,15 +206,13 @@ def create_app(test_config=None):
     def check_if_token_revoked(jwt_header, jwt_payload):
         """Check if a JWT token has been revoked.
 
-        Checks both the in-memory blocklist (for immediate revocation)
-        and the database (for persistence across restarts).
+        Served from the in-memory revocation cache kept by RevokedToken,
+        which is loaded from the database at startup and updated on revoke.
         """
-        from .routes.auth import token_blocklist
-        from .models.revoked_token import RevokedToken  # noqa: F401
+        from .models.release_event import ReleaseEvent  # noqa: F401
+        from .models.revoked_token import RevokedToken
 
-        jti = jwt_payload["jti"]
-        # Check in-memory first (faster), then database
-        return jti in token_blocklist or RevokedToken.is_token_revoked(jti)
+        return RevokedToken.is_token_revoked(jwt_payload["jti"])
 
     # Initialize login manager
     login_manager = LoginManager(app)
@@ -287,25 +234,56 @@ def create_app(test_config=None):
 
     register_error_handlers(app)
 
+    # Serialize jsonify/app.json with orjson and the typed encoders
+    from .utils.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+
+    # Request metrics (registered before other hooks so that they measure
+    # the final, compressed response)
+    from .utils.metrics import configure_metrics
+
+    configure_metrics(app)
+
+    # Compress responses and answer conditional GETs with 304
+    from .utils.http_cache import configure_http_cache
+
+    configure_http_cache(app)
+
+    # Opt-in per-request sampling profiler for admins (?profile=speedscope)
+    from .utils.profiler import configure_profiler
+
+    configure_profiler(app)
+
     # Run database migrations before creating tables
     run_database_migrations(app)
 
     with app.app_context():
         # Import models here to avoid circular imports
         from .models.releases import Releases
-        from .models.application_settings import ApplicationSettings
-        from .models.revoked_token import RevokedToken  # noqa: F401
+        from .models.application_settings import ApplicationSettings  # noqa: F401
+        from .models.cache_version import CacheVersion  # noqa: F401
+        from .models.revoked_token import RevokedToken
         from .models.user_settings import UserSettings  # noqa: F401
 
         # Create database tables (including revoked_tokens for JWT blocklist)
         db.create_all()
+        # Tokens revoked longer ago than the refresh lifetime have expired
+        refresh_lifetime = app.config.get(
+            "JWT_REFRESH_TOKEN_EXPIRES", timedelta(days=30)
+        )
+        RevokedToken.cleanup_expired_tokens(max_age_days=refresh_lifetime.days)
+        RevokedToken.load_cache()
+
+        # Download a missing catalogue and app.ini without blocking startup;
+        # catalogue endpoints answer 503 WARMING_UP until they arrive
+        downloading = BootstrapService.start(app) if test_config is None else []
         DatabaseService.initialize_database()
 
-        # Initialize application settings if needed
-        if not ApplicationSettings.query.first():
-            app_config_path = "data/app.ini"
-            ConfigService.read_settings_ini_and_sync_to_db(app_config_path)
-            ConfigService.init_web_settings()
+        # Initialize application settings if needed (seeded by the bootstrap
+        # thread instead while app.ini is being downloaded)
+        if "app.ini" not in downloading:
+            ConfigService.init_settings_if_empty()
 
         # Initialize releases if needed
         if not Releases.query.first():
@@ -324,6 +302,9 @@ def create_app(test_config=None):
     from .routes.settings import setting_bp
     from .routes.auth import auth_bp
     from .routes.users import user_bp
+    from .routes.metrics import metrics_bp
+    from .routes.batch import batch_bp
+    from .routes.health import health_bp
     from .api import api_bp  # Import the API blueprint
 
     # Register blueprints with URL prefixes
@@ -341,6 +322,7 @@ def create_app(test_config=None):
         setting_bp,
         auth_bp,
         user_bp,
+        batch_bp,
     ]
 
     # Define blueprints that should be registered without API prefix (HTML pages)
@@ -357,6 +339,12 @@ def create_app(test_config=None):
     for blueprint in html_blueprints:
         app.register_blueprint(blueprint)
 
+    # Prometheus scrape endpoint lives at the conventional /metrics path
+    app.register_blueprint(metrics_bp)
+
+    # Liveness/readiness probes, unauthenticated at the conventional paths
+    app.register_blueprint(health_bp)
+
     # Configure main routes that should be registered directly with the app
     configure_routes(app, login_manager, admin_permission, user_permission)
 
@@ -364,7 +352,6 @@ def create_app(test_config=None):
 
 
 if __name__ == "__main__":
-    app = create_app()
-    port = app.config["PORT"]
-    host = app.config["HOST"]
-    app.run(host=host, port=port, debug=app.config.get("DEBUG", False))
+    from .server import serve
+
+    serve(create_app())
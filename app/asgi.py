@@ -0,0 +1,534 @@
+"""ASGI entry point with asyncio-native handlers for I/O-bound endpoints.
+
+The endpoints below spend nearly all their time waiting on remote HTTP.
+Under ``SERVER_MODE=asgi`` they are served by ``AsyncGateway`` on the event
+loop with a shared ``httpx.AsyncClient``, so a few workers can keep
+hundreds of slow upstream calls in flight without tying up a thread each:
+
+- ``/api/search`` (MAL, TMDB and local DB queried concurrently)
+- ``/api/mal/search``, ``/api/mal/detail/<id>``
+- ``/api/tmdb/search``, ``/api/tmdb/detail/<id>``, ``/api/tmdb/trending``
+- ``/image/``
+- ``/api/toloka`` and ``/api/stream`` searches; these wrap synchronous
+  libraries, so they run on a bounded thread pool (``ASGI_BLOCKING_THREADS``)
+  instead of the event loop
+
+Every other request is passed to the Flask application unchanged, on a
+separate pool (``ASGI_WSGI_THREADS``). Live release event streams hold
+their thread while connected and get a pool of their own, sized
+``RELEASE_EVENTS_MAX_CLIENTS``, so they cannot starve either of the others.
+
+Async handlers run inside a Flask request context built from the ASGI
+scope, with the application's before_request and after_request hooks:
+auth, metrics, ETag/compression and the admin profiler behave as on the
+Flask routes. The profiler samples the event loop thread, so a profile of
+a native endpoint also shows whatever other requests the loop ran.
+
+Run standalone with ``uvicorn --factory app.asgi:create_asgi_app``.
+"""
+
+import asyncio
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import httpx
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import Response, request
+from werkzeug.test import EnvironBuilder
+
+from app.services.event_service import EventService
+from app.services.mal_service import MALService
+from app.services.services import SearchService, StreamingService, TolokaService
+from app.services.tmdb_service import TMDBService
+from app.utils.auth_utils import get_current_identity
+from app.utils.errors import APIError, InternalError, NotFoundError
+from app.utils.metrics import track_upstream
+
+JsonResult = Tuple[Any, int]
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """asgiref's WSGI adapter, running the WSGI app on a given thread pool.
+
+    WsgiToAsgi runs the app thread-sensitively, i.e. one request at a time
+    on a single shared thread, so one slow or streaming Flask response
+    (release events) would stall all others.
+    """
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        await _PooledWsgiInstance(self.wsgi_application, self.executor)(
+            scope, receive, send
+        )
+
+
+class _PooledWsgiInstance(WsgiToAsgiInstance):
+    """One request of PooledWsgiToAsgi.
+
+    Builds the environ and handles start_response like asgiref. The app
+    runs on the executor, and messages are passed to the event loop with
+    run_coroutine_threadsafe. The response iterable is closed as PEP 3333
+    requires, and iteration stops once the client disconnects, so an
+    abandoned stream releases its thread at its next message.
+    """
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+        self.disconnected = threading.Event()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            raise ValueError("WSGI wrapper received a non-HTTP scope")
+        self.scope = scope
+        loop = asyncio.get_running_loop()
+
+        def sync_send(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        self.sync_send = sync_send
+        with SpooledTemporaryFile(max_size=65536) as body:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                if message["type"] != "http.request":
+                    raise ValueError("WSGI wrapper received a non-HTTP-request message")
+                body.write(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            body.seek(0)
+
+            watcher = asyncio.create_task(self._watch_disconnect(receive))
+            try:
+                await loop.run_in_executor(self.executor, self.run_wsgi_app, body)
+            finally:
+                watcher.cancel()
+
+    async def _watch_disconnect(self, receive) -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        self.disconnected.set()
+
+    def run_wsgi_app(self, body):
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            self.sync_send(
+                {
+                    "type": "http.response.start",
+                    "status": 400,
+                    "headers": [(b"content-type", b"text/plain")],
+                }
+            )
+            self.sync_send(
+                {
+                    "type": "http.response.body",
+                    "body": b"Bad Request: Too many duplicate headers",
+                }
+            )
+            return
+
+        result = self.wsgi_application(environ, self.start_response)
+        bytes_sent = 0
+        try:
+            for output in result:
+                if self.disconnected.is_set():
+                    return
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                if self.response_content_length is not None:
+                    output = output[: self.response_content_length - bytes_sent]
+                self.sync_send(
+                    {"type": "http.response.body", "body": output, "more_body": True}
+                )
+                bytes_sent += len(output)
+                if bytes_sent == self.response_content_length:
+                    break
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({"type": "http.response.body"})
+
+
+class AsyncGateway:
+    """ASGI application routing I/O-bound endpoints to async handlers.
+
+    Args:
+        flask_app: The Flask application that serves every other request
+        blocking_threads: Size of the thread pool for synchronous libraries
+        wsgi_threads: Size of the thread pool for Flask requests
+    """
+
+    # Flask responses that stay open while the client is connected
+    STREAM_PATHS = ("/api/releases/events",)
+
+    def __init__(
+        self,
+        flask_app,
+        blocking_threads: Optional[int] = None,
+        wsgi_threads: Optional[int] = None,
+    ):
+        self.flask_app = flask_app
+        self.client: Optional[httpx.AsyncClient] = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=blocking_threads
+            or int(os.environ.get("ASGI_BLOCKING_THREADS", 16)),
+            thread_name_prefix="asgi-blocking",
+        )
+        self.wsgi_executor = ThreadPoolExecutor(
+            max_workers=wsgi_threads or int(os.environ.get("ASGI_WSGI_THREADS", 16)),
+            thread_name_prefix="asgi-wsgi",
+        )
+        self.stream_executor = ThreadPoolExecutor(
+            max_workers=max(1, EventService.MAX_CLIENTS),
+            thread_name_prefix="asgi-stream",
+        )
+        # (path pattern, handler, requires auth)
+        self.routes: List[Tuple[re.Pattern, Callable[..., Awaitable], bool]] = [
+            (re.compile(r"^/api/search$"), self.search_aggregated, True),
+            (re.compile(r"^/api/mal/search$"), self.mal_search, True),
+            (re.compile(r"^/api/mal/detail/(?P<anime_id>\d+)$"), self.mal_detail, True),
+            (re.compile(r"^/api/tmdb/search$"), self.tmdb_search, True),
+            (
+                re.compile(r"^/api/tmdb/detail/(?P<media_id>\d+)$"),
+                self.tmdb_detail,
+                True,
+            ),
+            (re.compile(r"^/api/tmdb/trending$"), self.tmdb_trending, False),
+            (re.compile(r"^/api/toloka$"), self.toloka_search, True),
+            (re.compile(r"^/api/stream$"), self.stream_search, True),
+        ]
+
+    # ASGI plumbing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            path = scope["path"]
+            if path in ("/image", "/image/"):
+                await self.proxy_image(scope, send)
+                return
+            for pattern, handler, auth_required in self.routes:
+                match = pattern.match(path)
+                if match:
+                    await self._dispatch(
+                        scope, send, handler, auth_required, match.groupdict()
+                    )
+                    return
+
+        executor = self.wsgi_executor
+        # A full stream pool would queue the request; the Flask pool lets the
+        # app answer 503 at once
+        if scope.get("path") in self.STREAM_PATHS and EventService.has_capacity():
+            executor = self.stream_executor
+        await PooledWsgiToAsgi(self.flask_app, executor)(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        """Open the shared HTTP client on startup and close it on shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._get_client()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            )
+        return self.client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and the thread pools."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        for executor in (self.executor, self.wsgi_executor, self.stream_executor):
+            executor.shutdown(wait=False)
+
+    def _request_context(self, scope):
+        """Build a Flask request context equivalent to the ASGI request."""
+        headers = [
+            (k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"]
+        ]
+        host = dict(headers).get("host", "localhost")
+        builder = EnvironBuilder(
+            path=scope.get("root_path", "") + scope["path"],
+            base_url=f"{scope.get('scheme', 'http')}://{host}",
+            query_string=scope.get("query_string", b"").decode("latin-1"),
+            method=scope["method"],
+            headers=headers,
+        )
+        environ = builder.get_environ()
+        if scope.get("client"):
+            environ["REMOTE_ADDR"] = scope["client"][0]
+        return self.flask_app.request_context(environ)
+
+    async def _dispatch(self, scope, send, handler, auth_required, params) -> None:
+        """Run an async handler inside a Flask request context."""
+        with self._request_context(scope):
+            response = self._preprocess()
+            if response is not None:
+                pass
+            elif auth_required and get_current_identity() is None:
+                response = self._json_response(
+                    {"error": "Authentication required"}, 401
+                )
+            else:
+                try:
+                    body, status = await handler(request.args, **params)
+                except APIError as e:
+                    body, status = self._error_body(e), e.status
+                except Exception as e:
+                    self.flask_app.logger.error(
+                        f"Unexpected error: {str(e)}", exc_info=True
+                    )
+                    error = InternalError(
+                        message="An unexpected error occurred",
+                        details=str(e) if self.flask_app.debug else None,
+                    )
+                    body, status = self._error_body(error), error.status
+                response = self._json_response(body, status)
+            response = self.flask_app.process_response(response)
+            await self._send_response(send, response)
+
+    def _preprocess(self) -> Optional[Response]:
+        """Run the before_request hooks; their response if they return one."""
+        result = self.flask_app.preprocess_request()
+        return None if result is None else self.flask_app.make_response(result)
+
+    def _json_response(self, body: Any, status: int) -> Response:
+        """Response for a JSON-serializable body or pre-encoded JSON text."""
+        if not isinstance(body, (bytes, str)):
+            body = self.flask_app.json.dumps(body)
+        return self.flask_app.response_class(
+            body, status=status, mimetype="application/json"
+        )
+
+    def _error_body(self, error: APIError) -> dict:
+        """Format an APIError the way handle_errors does."""
+        return {"error": error.to_dict(self.flask_app.debug)}
+
+    @staticmethod
+    def _start_message(response: Response) -> dict:
+        return {
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in response.headers.to_wsgi_list()
+            ],
+        }
+
+    async def _send_response(self, send, response: Response) -> None:
+        """Send a complete (non-streamed) Flask response."""
+        payload = response.get_data()
+        response.content_length = len(payload)
+        await send(self._start_message(response))
+        await send({"type": "http.response.body", "body": payload})
+
+    def _run_blocking(self, fn, *args) -> Awaitable:
+        """Run a synchronous call on the bounded thread pool."""
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # Handlers: return (JSON-serializable body, status)
+
+    async def search_aggregated(self, args) -> JsonResult:
+        query = args.get("query")
+        if not query:
+            return {"error": "Query parameter is required"}, 400
+        try:
+            return await SearchService.multi_search_async(
+                self._get_client(), query
+            ), 200
+        except Exception as e:
+            return {"error": "Failed to perform search", "details": str(e)}, 500
+
+    async def mal_search(self, args) -> JsonResult:
+        query = args.get("query")
+        if not query:
+            return {"error": "Query parameter is required"}, 400
+        try:
+            return await MALService.search_anime_async(self._get_client(), query), 200
+        except Exception as e:
+            return {"error": "Failed to search MAL anime", "details": str(e)}, 500
+
+    async def mal_detail(self, args, anime_id: str) -> JsonResult:
+        try:
+            result = await MALService.get_anime_detail_async(
+                self._get_client(), int(anime_id)
+            )
+        except Exception as e:
+            return {
+                "error": "Failed to fetch MAL anime details",
+                "details": str(e),
+            }, 500
+        if not result:
+            return {"error": "Anime not found"}, 404
+        return result, 200
+
+    async def tmdb_search(self, args) -> JsonResult:
+        query = args.get("query")
+        if not query:
+            return {"error": "Query parameter is required"}, 400
+        try:
+            return await TMDBService.search_media_async(self._get_client(), query), 200
+        except Exception as e:
+            return {"error": "Failed to search TMDB media", "details": str(e)}, 500
+
+    async def tmdb_detail(self, args, media_id: str) -> JsonResult:
+        media_type = args.get("type")
+        if not media_type:
+            return {"error": "Media type parameter is required"}, 400
+        try:
+            result = await TMDBService.get_media_detail_async(
+                self._get_client(), int(media_id), media_type
+            )
+        except Exception as e:
+            return {
+                "error": "Failed to fetch TMDB media details",
+                "details": str(e),
+            }, 500
+        if not result:
+            return {"error": "Media not found"}, 404
+        return result, 200
+
+    async def tmdb_trending(self, args) -> JsonResult:
+        media_type = args.get("type")
+        if not media_type:
+            return {"error": "Media type parameter is required"}, 400
+        try:
+            result = await TMDBService.get_trending_by_type_async(
+                self._get_client(), media_type
+            )
+            return result, 200
+        except Exception as e:
+            return {"error": "Failed to fetch trending media", "details": str(e)}, 500
+
+    async def toloka_search(self, args) -> JsonResult:
+        result = await self._run_blocking(
+            TolokaService.get_torrents_logic, args.get("query")
+        )
+        if isinstance(result, str) and result.startswith("No results found"):
+            raise NotFoundError(result)
+        return result, 200
+
+    async def stream_search(self, args) -> JsonResult:
+        query = args.get("query")
+        if not query:
+            return {"error": "Query parameter is required"}, 400
+        try:
+            result = await self._run_blocking(
+                StreamingService.search_titles_from_streaming_site, query
+            )
+            return self.flask_app.json.dumps(result), 200
+        except Exception as e:
+            return {
+                "error": "Failed to search streaming titles",
+                "details": str(e),
+            }, 500
+
+    async def proxy_image(self, scope, send) -> None:
+        """Stream a remote image to the client without buffering it.
+
+        As for a streamed Flask response, the after_request hooks see the
+        response before its body (metrics record the time to headers).
+        """
+        with self._request_context(scope):
+            response = self._preprocess()
+            if response is None:
+                response = await self._stream_image(send)
+            if response is not None:
+                await self._send_response(
+                    send, self.flask_app.process_response(response)
+                )
+
+    async def _stream_image(self, send) -> Optional[Response]:
+        """Stream the image; returns an error response if nothing was sent."""
+        url = request.args.get("url")
+        if not url:
+            return self._json_response({"error": "URL parameter is required"}, 400)
+
+        url = TolokaService.normalize_image_url(url)
+        started = False
+        try:
+            with track_upstream("image", "/image") as call:
+                async with self._get_client().stream(
+                    "GET", url, headers=TolokaService.IMAGE_PROXY_HEADERS, timeout=30
+                ) as upstream:
+                    call.record_response(upstream, size=0)
+                    if upstream.is_error:
+                        return self.flask_app.response_class(
+                            f"Failed to fetch image: {upstream.status_code}",
+                            status=upstream.status_code,
+                            mimetype="text/plain",
+                        )
+
+                    headers = self.flask_app.process_response(
+                        self.flask_app.response_class(
+                            iter(()),
+                            content_type=upstream.headers.get(
+                                "Content-Type", "image/jpeg"
+                            ),
+                        )
+                    )
+                    await send(self._start_message(headers))
+                    started = True
+                    async for chunk in upstream.aiter_bytes(1024):
+                        call.size += len(chunk)
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": chunk,
+                                "more_body": True,
+                            }
+                        )
+                    await send({"type": "http.response.body", "body": b""})
+        except httpx.HTTPError as e:
+            if started:
+                # Headers are out; end the truncated body
+                await send({"type": "http.response.body", "body": b""})
+                return None
+            return self.flask_app.response_class(
+                f"Failed to fetch image: {e}", status=502, mimetype="text/plain"
+            )
+        return None
+
+
+def create_asgi_app(flask_app=None) -> AsyncGateway:
+    """Create the ASGI application.
+
+    Args:
+        flask_app: Existing Flask application; created with create_app()
+            when omitted (e.g. when started by uvicorn --factory)
+
+    Returns:
+        ASGI application
+    """
+    if flask_app is None:
+        from app.app import create_app
+
+        flask_app = create_app()
+    return AsyncGateway(flask_app)
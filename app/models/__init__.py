@@ -4,22 +4,26 @@ from .base import db
 from .user import User
 from .user_settings import UserSettings
 from .application_settings import ApplicationSettings
+from .cache_version import CacheVersion
 from .anime import Anime
 from .releases import Releases
 from .request_data import RequestData
 from .login_form import LoginForm
 from .registration_form import RegistrationForm
 from .revoked_token import RevokedToken
+from .release_event import ReleaseEvent
 
 __all__ = [
     "db",
     "User",
     "UserSettings",
     "ApplicationSettings",
+    "CacheVersion",
     "Anime",
     "Releases",
     "RequestData",
     "LoginForm",
     "RegistrationForm",
     "RevokedToken",
+    "ReleaseEvent",
 ]
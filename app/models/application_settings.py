@@ -1,11 +1,24 @@
 """Application settings model for storing global configuration."""
 
+import threading
+import time
+from typing import ClassVar, Dict, Optional, Tuple
+
+from app.utils.metrics import record_cache
+
 from .base import db
+from .cache_version import CacheVersion
 
 
 class ApplicationSettings(db.Model):
     """Model for storing application-wide settings.
 
+    Reads through ``get_value``/``get_bool`` are served from an in-memory
+    copy of the whole table. The copy is dropped by ``invalidate_cache``
+    (called by ConfigService on every write), and other worker processes
+    notice writes through the ``application_settings`` CacheVersion,
+    checked at most once every ``SYNC_INTERVAL`` seconds.
+
     Attributes:
         id: The primary key
         section: Settings section/category name
@@ -21,3 +34,97 @@ class ApplicationSettings(db.Model):
     value = db.Column(db.String(255), nullable=False)
 
     __table_args__ = (db.UniqueConstraint("section", "key", name="_app_setting_uc"),)
+
+    # In-memory settings cache shared by all requests in this process
+    SYNC_INTERVAL = 5.0
+    _cache_lock = threading.Lock()
+    _cache_key = None
+    _cache_version = None
+    _cached_values: ClassVar[Optional[Dict[Tuple[str, str], str]]] = None
+    _cached_by_key: ClassVar[Dict[str, str]] = {}
+    _last_sync = 0.0
+
+    @classmethod
+    def _load_cache(cls) -> Tuple[Dict[Tuple[str, str], str], Dict[str, str]]:
+        """Return the in-memory copy of the table, reloading it if stale.
+
+        Returns:
+            Tuple of (values by (section, key), values by key)
+        """
+        cache_key = str(db.engine.url)
+        now = time.monotonic()
+        values, by_key = cls._cached_values, cls._cached_by_key
+        if (
+            values is not None
+            and cache_key == cls._cache_key
+            and now - cls._last_sync < cls.SYNC_INTERVAL
+        ):
+            record_cache("settings", hit=True)
+            return values, by_key
+
+        with cls._cache_lock:
+            version = CacheVersion.get_version(cls.__tablename__)
+            if (
+                cls._cached_values is None
+                or cache_key != cls._cache_key
+                or version != cls._cache_version
+            ):
+                record_cache("settings", hit=False)
+                values = {}
+                by_key = {}
+                for setting in cls.query.order_by(cls.id).all():
+                    values[(setting.section, setting.key)] = setting.value
+                    by_key.setdefault(setting.key, setting.value)
+                cls._cached_values = values
+                cls._cached_by_key = by_key
+                cls._cache_key = cache_key
+                cls._cache_version = version
+            else:
+                record_cache("settings", hit=True)
+            cls._last_sync = now
+            return cls._cached_values, cls._cached_by_key
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drop the cached settings here and in all other worker processes."""
+        CacheVersion.bump(cls.__tablename__)
+        cls._cached_values = None
+
+    @classmethod
+    def get_value(
+        cls, key: str, section: Optional[str] = None, default: Optional[str] = None
+    ) -> Optional[str]:
+        """Get a setting value from the cache.
+
+        Args:
+            key: Setting key name
+            section: Settings section; if omitted the first setting with
+                this key is used
+            default: Value returned when the setting does not exist
+
+        Returns:
+            The setting value or default
+        """
+        values, by_key = cls._load_cache()
+        if section is None:
+            return by_key.get(key, default)
+        return values.get((section, key), default)
+
+    @classmethod
+    def get_bool(
+        cls, key: str, section: Optional[str] = None, default: bool = False
+    ) -> bool:
+        """Get a setting as a boolean ("true", "1" and "yes" are truthy).
+
+        Args:
+            key: Setting key name
+            section: Settings section (optional)
+            default: Value returned when the setting does not exist
+
+        Returns:
+            The setting value as a boolean
+        """
+        value = cls.get_value(key, section)
+        if value is None:
+            return default
+        return value.strip().lower() in ("true", "1", "yes")
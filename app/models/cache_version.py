@@ -0,0 +1,60 @@
+"""Cache version model for cheap cross-process cache invalidation."""
+
+from sqlalchemy import select
+
+from .base import db
+
+
+class CacheVersion(db.Model):
+    """Model for storing a version counter per cached data set.
+
+    Writers bump the counter for a name after changing the underlying data;
+    readers in any worker process compare it with the version their
+    in-memory cache was built from and reload when it differs.
+
+    Attributes:
+        name: Name of the cached data set (e.g. a table name)
+        version: Monotonically increasing version number
+    """
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """String representation of the CacheVersion."""
+        return f"<CacheVersion {self.name}={self.version}>"
+
+    @classmethod
+    def get_version(cls, name: str) -> int:
+        """Get the current version for a data set.
+
+        Args:
+            name: Name of the cached data set
+
+        Returns:
+            Current version, 0 if it was never bumped
+        """
+        version = db.session.execute(
+            select(cls.version).where(cls.name == name)
+        ).scalar_one_or_none()
+        return version or 0
+
+    @classmethod
+    def bump(cls, name: str) -> int:
+        """Increment the version for a data set and commit.
+
+        Args:
+            name: Name of the cached data set
+
+        Returns:
+            The new version
+        """
+        entry = db.session.get(cls, name)
+        if entry is None:
+            entry = cls(name=name, version=0)
+            db.session.add(entry)
+        entry.version += 1
+        db.session.commit()
+        return entry.version
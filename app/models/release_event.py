@@ -0,0 +1,80 @@
+"""Release event model relaying job events between worker processes."""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, select
+
+from .base import db
+
+
+class ReleaseEvent(db.Model):
+    """Model for job events published to the live release streams.
+
+    A job runs in one worker process while the clients watching it may be
+    connected to any other, so job events are written here and every
+    process relays new rows to its own clients. Ids only grow (the table
+    uses AUTOINCREMENT), so a reader can resume after the last id it saw.
+
+    Attributes:
+        id: Primary key, never reused
+        event: Event name sent to the clients
+        data: Event payload as JSON text
+        created_at: Timestamp when the event was published
+    """
+
+    __tablename__ = "release_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # Rows kept; older ones are removed when new events are added
+    KEEP = 1000
+
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the ReleaseEvent."""
+        return f"<ReleaseEvent {self.id} {self.event}>"
+
+    @classmethod
+    def add(cls, event: str, data: Dict) -> int:
+        """Store an event and commit.
+
+        Args:
+            event: Event name
+            data: JSON-serializable payload
+
+        Returns:
+            Id of the new event
+        """
+        entry = cls(event=event, data=json.dumps(data, default=str))
+        db.session.add(entry)
+        db.session.flush()
+        db.session.execute(delete(cls).where(cls.id <= entry.id - cls.KEEP))
+        db.session.commit()
+        return entry.id
+
+    @classmethod
+    def latest_id(cls) -> int:
+        """Id of the newest event, 0 if there is none."""
+        return db.session.execute(select(func.max(cls.id))).scalar() or 0
+
+    @classmethod
+    def since(cls, last_id: int) -> List[Tuple[int, str, Dict]]:
+        """Events newer than last_id, oldest first.
+
+        Args:
+            last_id: Id of the last event already relayed
+
+        Returns:
+            (id, event, data) tuples
+        """
+        rows = db.session.execute(
+            select(cls.id, cls.event, cls.data).where(cls.id > last_id).order_by(cls.id)
+        ).all()
+        return [(row_id, event, json.loads(data)) for row_id, event, data in rows]
@@ -1,7 +1,14 @@
 """Revoked Token model for persistent JWT blocklist."""
 
+import threading
+import time
 from datetime import datetime, timezone
+from typing import ClassVar, Set
+
+from sqlalchemy import select
+
 from .base import db
+from .cache_version import CacheVersion
 
 
 class RevokedToken(db.Model):
@@ -10,6 +17,13 @@ class RevokedToken(db.Model):
     This provides a persistent token blocklist that survives application restarts.
     Tokens are stored by their JTI (JWT ID) and can be checked during authentication.
 
+    Lookups are served from an in-memory set of revoked JTIs that is loaded
+    once per database and updated on revoke. Other worker processes pick up
+    new revocations by fetching only rows with an id above the highest one
+    already cached, at most once every ``SYNC_INTERVAL`` seconds. Removing
+    tokens bumps the ``revoked_tokens`` CacheVersion, since SQLite may then
+    reuse their ids, and every process reloads the whole table.
+
     Attributes:
         id: Primary key
         jti: JWT ID (unique identifier for the token)
@@ -24,10 +38,60 @@ class RevokedToken(db.Model):
         db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
     )
 
+    # In-memory revocation cache shared by all requests in this process
+    SYNC_INTERVAL = 5.0
+    _cache_lock = threading.Lock()
+    _cache_key = None
+    _cache_version = None
+    _cached_jtis: ClassVar[Set[str]] = set()
+    _cached_max_id = 0
+    _last_sync = 0.0
+
     def __repr__(self) -> str:
         """String representation of the RevokedToken."""
         return f"<RevokedToken {self.jti}>"
 
+    @classmethod
+    def _sync_cache(cls, force: bool = False) -> None:
+        """Load new revocations from the database into the in-memory set.
+
+        The first call for a database, or after tokens were removed, loads
+        the whole table; later calls only fetch rows added since the last
+        sync (e.g. by another worker).
+
+        Args:
+            force: Sync even if SYNC_INTERVAL has not elapsed yet
+        """
+        cache_key = str(db.engine.url)
+        now = time.monotonic()
+        if (
+            not force
+            and cache_key == cls._cache_key
+            and now - cls._last_sync < cls.SYNC_INTERVAL
+        ):
+            return
+
+        with cls._cache_lock:
+            version = CacheVersion.get_version(cls.__tablename__)
+            if cache_key != cls._cache_key or version != cls._cache_version:
+                cls._cache_key = cache_key
+                cls._cache_version = version
+                cls._cached_jtis = set()
+                cls._cached_max_id = 0
+
+            rows = db.session.execute(
+                select(cls.id, cls.jti).where(cls.id > cls._cached_max_id)
+            ).all()
+            for row_id, jti in rows:
+                cls._cached_jtis.add(jti)
+                cls._cached_max_id = max(cls._cached_max_id, row_id)
+            cls._last_sync = now
+
+    @classmethod
+    def load_cache(cls) -> None:
+        """Load all revoked tokens into memory (called at startup)."""
+        cls._sync_cache(force=True)
+
     @classmethod
     def is_token_revoked(cls, jti: str) -> bool:
         """Check if a token has been revoked.
@@ -38,7 +102,8 @@ class RevokedToken(db.Model):
         Returns:
             True if token is revoked, False otherwise
         """
-        return cls.query.filter_by(jti=jti).first() is not None
+        cls._sync_cache()
+        return jti in cls._cached_jtis
 
     @classmethod
     def revoke_token(cls, jti: str) -> "RevokedToken":
@@ -53,6 +118,8 @@ class RevokedToken(db.Model):
         revoked = cls(jti=jti)
         db.session.add(revoked)
         db.session.commit()
+        cls._sync_cache()
+        cls._cached_jtis.add(jti)
         return revoked
 
     @classmethod
@@ -60,7 +127,7 @@ class RevokedToken(db.Model):
         """Remove old revoked tokens from the database.
 
         Tokens older than max_age_days are removed since they would have
-        expired anyway.
+        expired anyway. Called at startup.
 
         Args:
             max_age_days: Maximum age of tokens to keep
@@ -73,4 +140,8 @@ class RevokedToken(db.Model):
         cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
         result = cls.query.filter(cls.revoked_at < cutoff).delete()
         db.session.commit()
+        if result:
+            # Ids of removed rows may be reused; all processes reload
+            CacheVersion.bump(cls.__tablename__)
+            cls._sync_cache(force=True)
         return result
@@ -5,6 +5,7 @@ from flask_login import login_required
 
 from app.utils.auth_utils import multi_auth_required
 from app.utils.errors import handle_errors, NotFoundError
+from app.utils.http_cache import versioned
 from app.services.services_db import DatabaseService
 
 # Create two separate blueprints: one for HTML routes and one for API routes
@@ -31,6 +32,7 @@ def anime_detail(anime_id):
 @anime_api_bp.route("/anime", methods=["GET"])
 @multi_auth_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def list_anime():
     """List all anime or search by name."""
     query = request.args.get("query")
@@ -44,6 +46,7 @@ def list_anime():
 @anime_api_bp.route("/anime/<int:anime_id>", methods=["GET"])
 @multi_auth_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def get_anime_byid(anime_id):
     """Get anime details by ID."""
     result = DatabaseService.get_anime_by_id(anime_id)
@@ -55,6 +58,7 @@ def get_anime_byid(anime_id):
 @anime_api_bp.route("/anime/<int:anime_id>/related", methods=["GET"])
 @login_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def get_anime_related(anime_id):
     """Get related anime for a given anime ID."""
     result = DatabaseService.get_related_animes(anime_id)
@@ -64,7 +68,32 @@ def get_anime_related(anime_id):
 @anime_api_bp.route("/anime/<int:anime_id>/studios", methods=["GET"])
 @login_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def get_anime_studios(anime_id):
     """Get studios for a given anime ID."""
     result = DatabaseService.get_studios_by_anime_id(anime_id)
     return make_response(jsonify(result), 200)
+
+
+@anime_api_bp.route("/anime/<int:anime_id>/full", methods=["GET"])
+@multi_auth_required
+@handle_errors
+@versioned(DatabaseService.data_version)
+def get_anime_full(anime_id):
+    """Get anime details with related titles, studios and episodes."""
+    result = DatabaseService.get_anime_full(anime_id)
+    if result is None:
+        raise NotFoundError("Anime not found")
+    return make_response(jsonify(result), 200)
+
+
+@anime_api_bp.route("/anime/<int:anime_id>/franchise", methods=["GET"])
+@multi_auth_required
+@handle_errors
+@versioned(DatabaseService.data_version)
+def get_anime_franchise(anime_id):
+    """Get all anime of an anime's franchise, by season and release date."""
+    result = DatabaseService.get_franchise(anime_id)
+    if result is None:
+        raise NotFoundError("Anime not found")
+    return make_response(jsonify(result), 200)
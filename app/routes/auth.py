@@ -1,8 +1,5 @@
-# Standard library imports
-import secrets
-
 # Flask and extensions
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
@@ -12,9 +9,7 @@ from flask_jwt_extended import (
     set_access_cookies,
     set_refresh_cookies,
     unset_jwt_cookies,
-    verify_jwt_in_request,
 )
-from flask_login import current_user
 from sqlalchemy.exc import IntegrityError
 
 # Local imports
@@ -22,6 +17,7 @@ from app.models.user import User
 from app.models.application_settings import ApplicationSettings
 from app.models.revoked_token import RevokedToken
 from app.models.base import db
+from app.utils.auth_utils import get_current_identity
 from app.utils.errors import (
     handle_errors,
     ValidationError,
@@ -34,80 +30,25 @@ from app.utils.errors import (
 
 auth_bp = Blueprint("auth", __name__)
 
-# Legacy token blocklist for backward compatibility
-# New code should use RevokedToken model directly
-token_blocklist = set()
-
-
-def _is_valid_api_key(provided_key: str) -> bool:
-    """Check if the provided API key is valid using constant-time comparison.
-
-    Args:
-        provided_key: The API key provided in the request
-
-    Returns:
-        True if the key is valid, False otherwise
-    """
-    expected_key = current_app.config.get("API_KEY", "")
-    if not provided_key or not expected_key:
-        return False
-    return secrets.compare_digest(provided_key, expected_key)
-
 
 def check_auth():
     """Check authentication status using multiple methods.
 
-    Checks in order: JWT token, session auth, API key.
+    Checks in order: JWT token, session auth, API key. The identity is
+    resolved once per request by ``get_current_identity``.
 
     Returns:
         dict: Authentication info or error response
     """
     try:
-        # Check for JWT token
-        try:
-            verify_jwt_in_request(optional=True)
-            jwt = get_jwt()
-            if jwt:
-                jti = jwt.get("jti")
-                # Check both in-memory and database blocklist
-                if (
-                    jti
-                    and not RevokedToken.is_token_revoked(jti)
-                    and jti not in token_blocklist
-                ):
-                    return {
-                        "auth_type": "jwt",
-                        "id": jwt.get("sub"),
-                        "username": jwt.get("username"),
-                        "roles": jwt.get("roles"),
-                    }
-        except Exception:
-            pass  # JWT not present or invalid, continue to next auth method
-
-        # Check for session auth
-        if current_user.is_authenticated:
-            return {
-                "auth_type": "session",
-                "id": current_user.id,
-                "username": current_user.username,
-                "roles": current_user.roles,
-            }
-
-        # Check for API key (using constant-time comparison)
-        api_key = request.headers.get("X-API-Key")
-        if api_key and _is_valid_api_key(api_key):
-            return {
-                "auth_type": "api_key",
-                "roles": "admin",  # API key has admin privileges
-            }
-
-        raise UnauthorizedError("Not authenticated")
-    except UnauthorizedError:
-        raise
+        identity = get_current_identity()
     except Exception as e:
         raise InternalError(
             "An error occurred while checking authentication", details=str(e)
         )
+    if identity is None:
+        raise UnauthorizedError("Not authenticated")
+    return dict(identity)
 
 
 @auth_bp.route("/auth/register", methods=["POST"])
@@ -120,13 +61,7 @@ def register():
         raise ValidationError("Username and password are required")
 
     # Check if registration is open
-    open_registration = ApplicationSettings.query.filter_by(
-        key="open_registration"
-    ).first()
-    if (
-        not getattr(open_registration, "value", None)
-        or open_registration.value.lower() != "true"
-    ):
+    if not ApplicationSettings.get_bool("open_registration"):
         raise ForbiddenError("Registration is currently closed")
 
     # Validate password strength
@@ -200,13 +135,6 @@ def login():
 def refresh():
     """Refresh an access token using a refresh token."""
     current_user_id = get_jwt_identity()
-    jwt = get_jwt()
-
-    # Check if token is in blocklist (both in-memory and database)
-    token_id = jwt.get("jti")
-    if token_id in token_blocklist or RevokedToken.is_token_revoked(token_id):
-        raise UnauthorizedError("Token has been revoked")
-
     user = db.session.get(User, int(current_user_id))
 
     if not user:
@@ -236,10 +164,8 @@ def logout():
     jwt = get_jwt()
     token_id = jwt.get("jti")
 
-    # Store in database for persistence
+    # Persist to the database and the in-memory revocation cache
     RevokedToken.revoke_token(token_id)
-    # Also add to in-memory set for immediate effect
-    token_blocklist.add(token_id)
 
     response = jsonify({"message": "Successfully logged out"})
     unset_jwt_cookies(response)
@@ -252,13 +178,6 @@ def logout():
 def me():
     """Get current user information."""
     current_user_id = get_jwt_identity()
-    jwt = get_jwt()
-
-    # Check if token is in blocklist (both in-memory and database)
-    token_id = jwt.get("jti")
-    if token_id in token_blocklist or RevokedToken.is_token_revoked(token_id):
-        raise UnauthorizedError("Token has been revoked")
-
     user = db.session.get(User, int(current_user_id))
 
     if not user:
@@ -273,12 +192,7 @@ def me():
 def change_password():
     """Change the current user's password."""
     current_user_id = get_jwt_identity()
-    jwt = get_jwt()
-
-    # Check if token is in blocklist (both in-memory and database)
-    token_id = jwt.get("jti")
-    if token_id in token_blocklist or RevokedToken.is_token_revoked(token_id):
-        raise UnauthorizedError("Token has been revoked")
+    token_id = get_jwt().get("jti")
 
     data = request.get_json()
     if not data or not data.get("current_password") or not data.get("new_password"):
@@ -298,9 +212,8 @@ def change_password():
     user.set_password(data["new_password"])
     db.session.commit()
 
-    # Invalidate current token (persist to database)
+    # Invalidate current token
     RevokedToken.revoke_token(token_id)
-    token_blocklist.add(token_id)
 
     return jsonify({"message": "Password changed successfully"}), 200
 
@@ -310,12 +223,9 @@ def change_password():
 @jwt_required(verify_type=False)
 @handle_errors
 def validate_token():
-    """Validate if a JWT token is still valid and not revoked."""
-    jwt = get_jwt()
-    token_id = jwt.get("jti")
-
-    # Check both in-memory and database blocklist
-    if token_id in token_blocklist or RevokedToken.is_token_revoked(token_id):
-        raise UnauthorizedError("Token has been revoked")
+    """Validate if a JWT token is still valid and not revoked.
 
+    Expired and revoked tokens are rejected by ``jwt_required`` before
+    this handler runs.
+    """
     return jsonify({"valid": True}), 200
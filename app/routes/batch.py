@@ -0,0 +1,21 @@
+"""Batch API route: several API calls in one round trip."""
+
+from flask import Blueprint, current_app, jsonify, make_response, request
+
+from app.services.batch_service import BatchService
+from app.utils.auth_utils import get_current_identity, multi_auth_required
+from app.utils.errors import handle_errors
+
+batch_bp = Blueprint("batch", __name__)
+
+
+@batch_bp.route("/batch", methods=["POST"])
+@multi_auth_required
+@handle_errors
+def batch():
+    """Execute a list of API sub-requests and return their responses in order."""
+    sub_requests = BatchService.parse_requests(request.get_json(silent=True))
+    results = BatchService.execute(
+        current_app._get_current_object(), sub_requests, get_current_identity()
+    )
+    return make_response(jsonify(results), 200)
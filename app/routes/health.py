@@ -0,0 +1,35 @@
+"""Liveness and readiness endpoints for orchestrators."""
+
+import time
+
+from flask import Blueprint, current_app, jsonify, make_response
+
+from app.services.bootstrap_service import BootstrapService
+from app.services.health_service import HealthService
+
+health_bp = Blueprint("health", __name__)
+
+_STARTED = time.monotonic()
+
+
+@health_bp.route("/healthz", methods=["GET"])
+def healthz():
+    """Report that the process is alive; no I/O."""
+    return make_response(
+        jsonify(
+            {
+                "status": "ok",
+                "uptime_seconds": round(time.monotonic() - _STARTED, 1),
+                "assets": BootstrapService.status(check_disk=False)["assets"],
+            }
+        ),
+        200,
+    )
+
+
+@health_bp.route("/readyz", methods=["GET"])
+def readyz():
+    """Report cached dependency probe results; 503 unless ready or degraded."""
+    HealthService.start(current_app._get_current_object())
+    report = HealthService.readiness()
+    return make_response(jsonify(report), 200 if report["ready"] else 503)
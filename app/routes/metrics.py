@@ -0,0 +1,44 @@
+"""Metrics routes for monitoring."""
+
+from flask import Blueprint, Response, jsonify, make_response, send_from_directory
+from werkzeug.utils import secure_filename
+
+from app.utils.auth_utils import multi_auth_admin_required
+from app.utils.errors import NotFoundError, handle_errors
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, registry, upstream_summary
+from app.utils.profiler import list_profiles, profile_dir
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+@multi_auth_admin_required
+def metrics():
+    """Expose request, database and cache metrics in Prometheus text format."""
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@metrics_bp.route("/api/metrics/upstreams", methods=["GET"])
+@multi_auth_admin_required
+def upstream_metrics():
+    """Summarize latency, status codes and errors of upstream calls."""
+    return make_response(jsonify(upstream_summary()), 200)
+
+
+@metrics_bp.route("/api/profiles", methods=["GET"])
+@multi_auth_admin_required
+def get_profiles():
+    """List stored request profiles, newest first."""
+    return make_response(jsonify(list_profiles()), 200)
+
+
+@metrics_bp.route("/api/profiles/<string:name>", methods=["GET"])
+@multi_auth_admin_required
+@handle_errors
+def download_profile(name):
+    """Download a stored request profile."""
+    if name != secure_filename(name) or name not in {
+        entry["name"] for entry in list_profiles()
+    }:
+        raise NotFoundError("Profile not found")
+    return send_from_directory(profile_dir(), name, as_attachment=True)
@@ -1,12 +1,12 @@
 """Release routes for managing torrent releases."""
 
-from flask import Blueprint, jsonify, request, make_response
-import jsonpickle
+from flask import Blueprint, Response, jsonify, request, make_response
 
 from app.utils.auth_utils import multi_auth_required
 from app.utils.errors import handle_errors, ValidationError
 from app.services.services import TolokaService, TorrentService
 from app.services.config_service import ConfigService
+from app.services.event_service import EventService
 
 release_bp = Blueprint("release", __name__)
 
@@ -20,6 +20,35 @@ def get_titles():
     return make_response(jsonify(titles_data), 200)
 
 
+def _run_job(operation: str, run, summarize=None, **fields):
+    """Run a release job, publishing its started and finished or failed events.
+
+    Args:
+        operation: Job name sent to the clients
+        run: Callable doing the work and returning the response body
+        summarize: Turns the response into the event's ``result``
+        **fields: Extra fields of every event of the job
+
+    Returns:
+        The response body returned by run
+    """
+    EventService.publish_job({"operation": operation, "status": "started", **fields})
+    finished = {"operation": operation, "status": "failed", **fields}
+    try:
+        response = run()
+        ConfigService.sync_settings("release", "from")
+        # The logic methods report library failures as {"error": ...}
+        if not (isinstance(response, dict) and "error" in response):
+            finished["status"] = "finished"
+        finished["result"] = summarize(response) if summarize else response
+        return response
+    except Exception as e:
+        finished["error"] = str(e)
+        raise
+    finally:
+        EventService.publish_job(finished)
+
+
 @release_bp.route("/releases", methods=["POST"])
 @multi_auth_required
 @handle_errors
@@ -29,8 +58,25 @@ def add_release():
     if not data:
         raise ValidationError("Request data is required")
 
-    response = TolokaService.add_release_logic(data)
-    ConfigService.sync_settings("release", "from")
+    response = _run_job("add", lambda: TolokaService.add_release_logic(data))
+    return make_response(jsonify(response), 200)
+
+
+@release_bp.route("/releases/bulk", methods=["POST"])
+@multi_auth_required
+@handle_errors
+def add_releases_bulk():
+    """Add many releases at once, syncing titles.ini to the database once."""
+    specs = TolokaService.parse_release_specs(request.get_json(silent=True))
+
+    response = _run_job(
+        "bulk_add",
+        lambda: TolokaService.add_releases_bulk(specs),
+        summarize=lambda result: {
+            key: result[key] for key in ("total", "added", "failed")
+        },
+        total=len(specs),
+    )
     return make_response(jsonify(response), 200)
 
 
@@ -40,12 +86,14 @@ def add_release():
 def update_release():
     """Update release(s) - if no data provided, updates all releases."""
     data = request.get_json() if request.is_json else request.form
-    if data:
-        response = TolokaService.update_release_logic(data)
-    else:
-        response = TolokaService.update_all_releases_logic()
+    codename = data.get("codename") if data else None
+
+    def run():
+        if data:
+            return TolokaService.update_release_logic(data)
+        return TolokaService.update_all_releases_logic()
 
-    ConfigService.sync_settings("release", "from")
+    response = _run_job("update", run, codename=codename)
     return make_response(jsonify(response), 200)
 
 
@@ -55,7 +103,24 @@ def update_release():
 def torrent_info_all_releases():
     """Get torrent info for all releases."""
     result = TorrentService.get_releases_torrent_status()
-    return make_response(jsonpickle.encode(result, unpicklable=False), 200)
+    return make_response(jsonify(result), 200)
+
+
+@release_bp.route("/releases/events", methods=["GET"])
+@multi_auth_required
+@handle_errors
+def release_events():
+    """Stream torrent progress and release job events (Server-Sent Events)."""
+    # Subscribe before streaming so that a full worker can still answer 503
+    subscriber = EventService.subscribe()
+    response = Response(
+        EventService.stream(subscriber),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Also covers a stream closed before its first message
+    response.call_on_close(lambda: EventService.unsubscribe(subscriber))
+    return response
 
 
 @release_bp.route("/releases/defaults", methods=["GET"])
@@ -94,10 +159,26 @@ def edit_release():
 @multi_auth_required
 @handle_errors
 def delete_release():
-    """Delete a release."""
+    """Delete a release, or many when codenames or a filter are given."""
     data = request.get_json() if request.is_json else request.form
     if not data:
         raise ValidationError("Request data is required")
 
+    if "codenames" in data or "filter" in data:
+        return make_response(jsonify(ConfigService.bulk_delete_releases(data)), 200)
+
     response = ConfigService.delete_release(data)
     return make_response(jsonify({"msg": response}), 200)
+
+
+@release_bp.route("/releases", methods=["PATCH"])
+@multi_auth_required
+@handle_errors
+def bulk_edit_releases():
+    """Apply the same changes to all releases selected by codenames or filter."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValidationError("JSON request body is required")
+
+    response = ConfigService.bulk_edit_releases(data)
+    return make_response(jsonify(response), 200)
@@ -32,6 +32,7 @@ from app.models.registration_form import RegistrationForm
 from app.models.user import User
 from app.models.base import db
 from app.services.services import SearchService, TolokaService
+from app.utils.auth_utils import multi_auth_required
 
 
 def search_aggregated():
@@ -107,7 +108,7 @@ def configure_routes(app, login_manager, admin_permission, user_permission):
         return proxy_image()
 
     @app.route("/api/search")
-    @login_required
+    @multi_auth_required
     def search_aggregated_route():
         return search_aggregated()
 
@@ -179,14 +180,8 @@ def configure_routes(app, login_manager, admin_permission, user_permission):
     def register():
         try:
             form = RegistrationForm()
-            open_registration = ApplicationSettings.query.filter_by(
-                key="open_registration"
-            ).first()
-
-            if (
-                not getattr(open_registration, "value", None)
-                or open_registration.value.lower() != "true"
-            ):
+
+            if not ApplicationSettings.get_bool("open_registration"):
                 flash("Registration is closed or not set.", "error")
                 return render_template("register.html", form=form)
 
@@ -1,5 +1,4 @@
 # Third-party imports
-import jsonpickle
 from flask import Blueprint, jsonify, request, make_response
 
 # Local imports
@@ -17,7 +16,7 @@ def search_titles_from_streaming():
         if not query:
             return make_response(jsonify({"error": "Query parameter is required"}), 400)
         result = StreamingService.search_titles_from_streaming_site(query)
-        return make_response(jsonpickle.encode(result, unpicklable=False), 200)
+        return make_response(jsonify(result), 200)
     except Exception as e:
         error_message = {
             "error": "Failed to search streaming titles",
@@ -52,7 +51,7 @@ def get_title_details():
         result = StreamingService.get_streaming_site_release_details(
             data["provider"], data["link"]
         )
-        return make_response(jsonpickle.encode(result, unpicklable=False), 200)
+        return make_response(jsonify(result), 200)
     except Exception as e:
         error_message = {
             "error": "Failed to fetch streaming title details",
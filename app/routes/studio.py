@@ -5,6 +5,7 @@ from flask_login import login_required
 
 from app.utils.auth_utils import multi_auth_required
 from app.utils.errors import handle_errors, NotFoundError
+from app.utils.http_cache import versioned
 from app.services.services_db import DatabaseService
 
 # Create two separate blueprints: one for HTML routes and one for API routes
@@ -31,6 +32,7 @@ def studio_detail(studio_id):
 @studio_api_bp.route("/studio", methods=["GET"])
 @multi_auth_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def search_studio():
     """Search studios by name or list all."""
     query = request.args.get("query")
@@ -44,6 +46,7 @@ def search_studio():
 @studio_api_bp.route("/studio/<int:studio_id>", methods=["GET"])
 @multi_auth_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def get_studio_details(studio_id):
     """Get studio details by ID."""
     result = DatabaseService.search_studio_by_id(studio_id)
@@ -55,6 +58,7 @@ def get_studio_details(studio_id):
 @studio_api_bp.route("/studio/<int:studio_id>/anime", methods=["GET"])
 @multi_auth_required
 @handle_errors
+@versioned(DatabaseService.data_version)
 def list_titles_by_studio(studio_id):
     """List anime from a specific studio."""
     result = DatabaseService.get_anime_by_studio_id(studio_id)
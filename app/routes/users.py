@@ -1,13 +1,12 @@
 # Flask and extensions
 from flask import Blueprint, jsonify, request, make_response
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, get_jwt
 from flask_login import current_user
 
 # Local imports
 from app.utils.auth_utils import (
     multi_auth_required,
     multi_auth_admin_required,
-    _is_valid_api_key,
+    get_current_identity,
 )
 from app.utils.errors import (
     handle_errors,
@@ -15,12 +14,9 @@ from app.utils.errors import (
     NotFoundError,
     ForbiddenError,
     ConflictError,
-    UnauthorizedError,
 )
 from app.models.user import User
 from app.models.base import db
-from app.models.revoked_token import RevokedToken
-from app.routes.auth import token_blocklist
 
 user_bp = Blueprint("user", __name__)
 
@@ -30,45 +26,7 @@ user_bp = Blueprint("user", __name__)
 @handle_errors
 def get_profile():
     """Get current user profile (auth type and identity)."""
-    # Check for JWT token
-    try:
-        verify_jwt_in_request(optional=True)
-        jwt = get_jwt()
-        if jwt:
-            jti = jwt.get("jti")
-            if (
-                jti
-                and not RevokedToken.is_token_revoked(jti)
-                and jti not in token_blocklist
-            ):
-                return jsonify(
-                    {
-                        "auth_type": "jwt",
-                        "id": jwt.get("sub"),
-                        "username": jwt.get("username"),
-                        "roles": jwt.get("roles"),
-                    }
-                )
-    except Exception:
-        pass  # JWT not present or invalid, continue to next auth method
-
-    # Check for session auth
-    if current_user.is_authenticated:
-        return jsonify(
-            {
-                "auth_type": "session",
-                "id": current_user.id,
-                "username": current_user.username,
-                "roles": current_user.roles,
-            }
-        )
-
-    # Check for API key (constant-time comparison)
-    api_key = request.headers.get("X-API-Key")
-    if api_key and _is_valid_api_key(api_key):
-        return jsonify({"auth_type": "api_key", "roles": "admin"})
-
-    raise UnauthorizedError("Not authenticated")
+    return jsonify(get_current_identity())
 
 
 @user_bp.route("/profile", methods=["PUT"])
@@ -76,19 +34,13 @@ def get_profile():
 @handle_errors
 def update_profile():
     """Update current user profile."""
-    # Try JWT first
-    try:
-        verify_jwt_in_request(optional=True)
-        jwt_identity = get_jwt_identity()
-        if jwt_identity:
-            user = db.session.get(User, int(jwt_identity))
-            if user:
-                return update_user_profile(user)
-    except Exception:
-        pass
-
-    # Then try session auth
-    if current_user and current_user.is_authenticated:
+    identity = get_current_identity()
+
+    if identity["auth_type"] == "jwt":
+        user = db.session.get(User, int(identity["id"]))
+        if user:
+            return update_user_profile(user)
+    elif identity["auth_type"] == "session":
         return update_user_profile(current_user)
 
     raise NotFoundError("User not found")
@@ -0,0 +1,181 @@
+"""Serving modes for the Toloka2Web application.
+
+``SERVER_MODE`` selects how ``python run.py`` and ``python -m app`` serve
+the application:
+
+- ``development`` (default): the single-process Werkzeug server
+- ``production``: Gunicorn with multiple threaded workers. The app is
+  created once in the master process (catalogue reflection, config loading
+  and data bootstrap happen once) and forked into the workers.
+  ``SIGHUP`` gracefully restarts the workers, ``SIGTERM`` drains in-flight
+  requests for up to ``WEB_GRACEFUL_TIMEOUT`` seconds before exiting.
+- ``asgi``: Gunicorn with Uvicorn workers serving ``app.asgi.AsyncGateway``.
+  Upstream-bound endpoints (search, MAL/TMDB, image proxy) run on an
+  asyncio event loop, everything else goes through the Flask app in a
+  thread pool. ``WEB_THREADS`` is unused in this mode.
+
+Worker settings are read from environment variables:
+
+- ``WEB_WORKERS``: number of worker processes (default: 2)
+- ``WEB_THREADS``: threads per worker (default: 8)
+- ``WEB_TIMEOUT``: worker timeout in seconds (default: 120)
+- ``WEB_GRACEFUL_TIMEOUT``: shutdown/reload grace period (default: 30)
+- ``WEB_MAX_REQUESTS``: recycle a worker after this many requests,
+  0 disables recycling (default: 0)
+
+Workers share their metrics through ``METRICS_DIR``; without it, a
+temporary directory is created for each server run.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+PRODUCTION_MODE = "production"
+DEVELOPMENT_MODE = "development"
+ASGI_MODE = "asgi"
+ASGI_WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+
+
+def _env_int(env: Mapping[str, str], name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to default."""
+    try:
+        value = int(env.get(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+    return value if value >= 0 else default
+
+
+def build_server_options(
+    host: str,
+    port: int,
+    env: Optional[Mapping[str, str]] = None,
+    mode: str = PRODUCTION_MODE,
+) -> Dict[str, Any]:
+    """Build Gunicorn settings for production or asgi mode.
+
+    Args:
+        host: Address to bind to
+        port: Port to bind to
+        env: Environment mapping (defaults to os.environ)
+        mode: PRODUCTION_MODE or ASGI_MODE
+
+    Returns:
+        Dictionary of Gunicorn setting names to values
+    """
+    env = os.environ if env is None else env
+    max_requests = _env_int(env, "WEB_MAX_REQUESTS", 0)
+    return {
+        "bind": f"{host}:{port}",
+        "workers": max(1, _env_int(env, "WEB_WORKERS", 2)),
+        "threads": max(1, _env_int(env, "WEB_THREADS", 8)),
+        "worker_class": ASGI_WORKER_CLASS if mode == ASGI_MODE else "gthread",
+        "timeout": _env_int(env, "WEB_TIMEOUT", 120),
+        "graceful_timeout": _env_int(env, "WEB_GRACEFUL_TIMEOUT", 30),
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "preload_app": True,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+def _post_fork(app):
+    """Build a Gunicorn post_fork hook that drops database connections.
+
+    Connections opened in the master while preloading must not be shared
+    with the forked workers, so each worker starts with empty pools. Each
+    worker also starts its own health prober.
+    """
+
+    def post_fork(server, worker):
+        from app.models.base import db
+        from app.services.services_db import DatabaseService
+
+        with app.app_context():
+            db.engine.dispose(close=False)
+        if DatabaseService.engine is not None:
+            DatabaseService.engine.dispose(close=False)
+
+        # The master's threads do not exist in the worker
+        from app.services.health_service import HealthService
+
+        HealthService.start(app)
+
+    return post_fork
+
+
+def run_production(app, host: str, port: int, mode: str = PRODUCTION_MODE) -> None:
+    """Serve the application with Gunicorn.
+
+    Args:
+        app: Flask application (already created, i.e. preloaded)
+        host: Address to bind to
+        port: Port to bind to
+        mode: PRODUCTION_MODE for threaded WSGI workers, ASGI_MODE for
+            Uvicorn workers running the async gateway
+    """
+    from gunicorn.app.base import BaseApplication
+
+    from app.utils.metrics import registry
+
+    options = build_server_options(host, port, mode=mode)
+    options["post_fork"] = _post_fork(app)
+    if registry.directory is None:
+        # Let a scrape served by any worker report all of them
+        registry.set_directory(tempfile.mkdtemp(prefix="toloka2web-metrics-"))
+
+    if mode == ASGI_MODE:
+        from app.asgi import create_asgi_app
+
+        application = create_asgi_app(app)
+    else:
+        application = app
+
+    class _GunicornApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return application
+
+    app.logger.info(
+        f"Starting {mode} server on {options['bind']} with "
+        f"{options['workers']} workers ({options['worker_class']})"
+    )
+    _GunicornApplication().run()
+
+
+def serve(app) -> None:
+    """Serve the application in the mode selected by SERVER_MODE.
+
+    Falls back to the development server when Gunicorn (or, for asgi mode,
+    the Uvicorn worker) is not available, e.g. on Windows.
+
+    Args:
+        app: Flask application returned by create_app()
+    """
+    host = app.config.get("HOST", "0.0.0.0")
+    port = app.config.get("PORT", 5000)
+    mode = app.config.get("SERVER_MODE", DEVELOPMENT_MODE)
+
+    if mode in (PRODUCTION_MODE, ASGI_MODE):
+        try:
+            import gunicorn  # noqa: F401
+
+            if mode == ASGI_MODE:
+                import uvicorn_worker  # noqa: F401
+        except ImportError as e:
+            app.logger.warning(
+                f"{e.name} is not installed; falling back to the development server"
+            )
+        else:
+            run_production(app, host, port, mode)
+            return
+
+    app.run(host=host, port=port, debug=app.config.get("DEBUG", False))
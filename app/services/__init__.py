@@ -5,7 +5,10 @@ from .config_service import ConfigService
 from .mal_service import MALService
 from .tmdb_service import TMDBService
 from .services_db import DatabaseService
+from .event_service import EventService
+from .bootstrap_service import BootstrapService
 from .services import TolokaService, StreamingService, SearchService, TorrentService
+from .health_service import HealthService
 
 __all__ = [
     "BaseService",
@@ -13,8 +16,11 @@ __all__ = [
     "MALService",
     "TMDBService",
     "DatabaseService",
+    "EventService",
+    "BootstrapService",
     "TolokaService",
     "StreamingService",
     "SearchService",
     "TorrentService",
+    "HealthService",
 ]
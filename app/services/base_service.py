@@ -1,15 +1,20 @@
 from typing import Any, Dict, Optional
+import requests
+
 from app.models.application_settings import ApplicationSettings
+from app.utils.metrics import track_upstream
 
 
 class BaseService:
     """Base class for all services providing common functionality."""
 
+    # Upstream name used to label metrics of http_get()/http_get_async()
+    UPSTREAM = "unknown"
+
     @classmethod
     def get_api_key(cls, key_name: str) -> Optional[str]:
-        """Get API key from application settings."""
-        setting = ApplicationSettings.query.filter_by(key=key_name).first()
-        return setting.value if setting else None
+        """Get API key from the cached application settings."""
+        return ApplicationSettings.get_value(key_name)
 
     @classmethod
     def serialize(cls, data: Any) -> Any:
@@ -36,3 +41,42 @@ class BaseService:
             return response.json()
         except Exception as e:
             return {"error": f"{error_msg}: {str(e)}"}
+
+    @classmethod
+    def http_get(
+        cls, endpoint: str, request_args: Dict[str, Any], timeout: float = 30
+    ) -> requests.Response:
+        """Perform an instrumented GET request against the service's upstream.
+
+        Args:
+            endpoint: Endpoint template used as metrics label (e.g. "/anime/{id}")
+            request_args: Keyword arguments for requests.get (url, params, headers)
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response
+        """
+        with track_upstream(cls.UPSTREAM, endpoint) as call:
+            response = requests.get(**request_args, timeout=timeout)
+            call.record_response(response)
+        return response
+
+    @classmethod
+    async def http_get_async(
+        cls, client, endpoint: str, request_args: Dict[str, Any], timeout: float = 30
+    ):
+        """Perform an instrumented GET request with an httpx.AsyncClient.
+
+        Args:
+            client: Shared httpx.AsyncClient
+            endpoint: Endpoint template used as metrics label
+            request_args: Keyword arguments for client.get (url, params, headers)
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response
+        """
+        with track_upstream(cls.UPSTREAM, endpoint) as call:
+            response = await client.get(**request_args, timeout=timeout)
+            call.record_response(response)
+        return response
@@ -0,0 +1,179 @@
+"""Execute several API calls from one HTTP request."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, g, request
+from werkzeug.test import EnvironBuilder
+
+from app.services.base_service import BaseService
+from app.utils.errors import ValidationError
+
+# Request headers forwarded to sub-requests (credentials)
+FORWARDED_HEADERS = ("Authorization", "Cookie", "X-API-Key", "X-CSRF-TOKEN")
+
+
+class BatchService(BaseService):
+    """Dispatch batched sub-requests through the Flask app in-process.
+
+    Each sub-request runs in its own app and request context, so it passes
+    through the regular before/after request hooks (metrics, caching) and
+    views see an ordinary request. The caller's identity, resolved once for
+    the batch, is handed to every sub-request instead of being resolved
+    again. Runs of consecutive GET sub-requests are executed concurrently;
+    any other method runs alone, in order, after everything before it.
+    """
+
+    MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", 20))
+    MAX_WORKERS = 8
+    ALLOWED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=cls.MAX_WORKERS, thread_name_prefix="api-batch"
+            )
+        return cls._executor
+
+    @classmethod
+    def parse_requests(cls, payload: Any) -> List[Dict]:
+        """Validate a batch payload.
+
+        Args:
+            payload: ``{"requests": [...]}`` or a bare list of sub-requests,
+                each ``{"method": "GET", "path": "/api/...", "body": ...}``
+                with an optional client-chosen ``id``
+
+        Returns:
+            Normalized sub-requests
+
+        Raises:
+            ValidationError: If the payload is malformed or too large
+        """
+        items = payload.get("requests") if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of requests")
+        if len(items) > cls.MAX_REQUESTS:
+            raise ValidationError(
+                f"A batch may contain at most {cls.MAX_REQUESTS} requests"
+            )
+
+        sub_requests = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+                raise ValidationError(f"Request {index} must have a path")
+            method = str(item.get("method", "GET")).upper()
+            path = item["path"]
+            if method not in cls.ALLOWED_METHODS:
+                raise ValidationError(f"Request {index}: unsupported method {method}")
+            if not path.startswith("/api/") or path.split("?")[0].rstrip("/") == (
+                "/api/batch"
+            ):
+                raise ValidationError(
+                    f"Request {index}: path must be an /api/ endpoint other than /api/batch"
+                )
+            sub_requests.append(
+                {
+                    "id": item.get("id", index),
+                    "method": method,
+                    "path": path,
+                    "body": item.get("body"),
+                }
+            )
+        return sub_requests
+
+    @classmethod
+    def execute(
+        cls, app: Flask, sub_requests: List[Dict], identity: Optional[Dict]
+    ) -> List[Dict]:
+        """Run sub-requests and collect their responses in request order.
+
+        Must be called while handling the batch request; its credentials
+        headers are forwarded to the sub-requests.
+
+        Args:
+            app: The Flask application
+            sub_requests: Requests returned by parse_requests
+            identity: Identity already resolved for the batch request
+
+        Returns:
+            One ``{"id", "status", "body"}`` dict per sub-request
+        """
+        headers = {
+            name: request.headers[name]
+            for name in FORWARDED_HEADERS
+            if name in request.headers
+        }
+        base_url = request.host_url
+
+        def run(sub_request: Dict) -> Dict:
+            return cls._dispatch(app, sub_request, headers, base_url, identity)
+
+        results: List[Dict] = []
+        pending_reads: List[Dict] = []
+
+        def flush_reads() -> None:
+            if len(pending_reads) == 1:
+                results.append(run(pending_reads[0]))
+            elif pending_reads:
+                results.extend(cls._get_executor().map(run, pending_reads))
+            pending_reads.clear()
+
+        for sub_request in sub_requests:
+            if sub_request["method"] == "GET":
+                pending_reads.append(sub_request)
+                continue
+            flush_reads()
+            results.append(run(sub_request))
+        flush_reads()
+        return results
+
+    @staticmethod
+    def _dispatch(
+        app: Flask,
+        sub_request: Dict,
+        headers: Dict[str, str],
+        base_url: str,
+        identity: Optional[Dict],
+    ) -> Dict:
+        """Run one sub-request through the app and capture its response."""
+        path, _, query_string = sub_request["path"].partition("?")
+        builder = EnvironBuilder(
+            path=path,
+            base_url=base_url,
+            query_string=query_string,
+            method=sub_request["method"],
+            headers=headers,
+            json=sub_request["body"],
+        )
+        try:
+            environ = builder.get_environ()
+        finally:
+            builder.close()
+
+        with app.app_context(), app.request_context(environ):
+            # Reuse the identity resolved for the batch (see get_current_identity)
+            g.auth_identity = identity
+            g.auth_identity_request = request._get_current_object()
+            try:
+                response = app.full_dispatch_request()
+            except Exception as e:
+                response = app.handle_exception(e)
+            try:
+                if response.is_streamed:
+                    status = 400
+                    body: Any = {"error": "Streaming endpoints cannot be batched"}
+                elif response.is_json:
+                    status = response.status_code
+                    body = response.get_json(silent=True)
+                else:
+                    status = response.status_code
+                    body = response.get_data(as_text=True)
+            finally:
+                response.close()
+
+        return {"id": sub_request["id"], "status": status, "body": body}
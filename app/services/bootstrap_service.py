@@ -0,0 +1,203 @@
+"""First-run download of the data files, off the startup critical path."""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import requests
+from flask import Flask
+
+from app.services.base_service import BaseService
+from app.services.config_service import ConfigService
+from app.services.services_db import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class BootstrapService(BaseService):
+    """Create or download missing data files in a background thread.
+
+    titles.ini is created empty at startup. The anime catalogue and the
+    app.ini template are downloaded by a daemon thread so the server starts
+    listening immediately; until they arrive catalogue endpoints answer 503
+    WARMING_UP and /readyz reports not ready. Presence is checked on disk,
+    so processes that did not run the download (e.g. Gunicorn workers
+    forked from the master) notice the files once they appear. The
+    download state belongs to the process that started the download:
+    forked children inherit a copy of it that nothing would ever clear,
+    so they ignore it and only look at the disk.
+    """
+
+    APP_INI_TEMPLATE_URL = "https://raw.githubusercontent.com/CakesTwix/Toloka2MediaServer/main/data/app-example.ini"
+    DOWNLOAD_TIMEOUT = 30
+
+    ASSETS = {
+        "anime_data.db": DatabaseService.DATABASE_PATH,
+        "app.ini": "data/app.ini",
+        "titles.ini": "data/titles.ini",
+    }
+
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    # Process running the download; _downloading and _errors are its state
+    _pid: Optional[int] = None
+    _downloading: set = set()
+    _errors: Dict[str, str] = {}
+    _present: set = set()
+
+    @classmethod
+    def prepare(cls) -> None:
+        """Create the data directory and an empty titles.ini if missing."""
+        os.makedirs("data", exist_ok=True)
+        titles_ini_path = cls.ASSETS["titles.ini"]
+        if not os.path.exists(titles_ini_path):
+            logger.info("titles.ini not found. Creating empty file...")
+            try:
+                with open(titles_ini_path, "w", encoding="utf-8"):
+                    pass
+            except OSError as e:
+                logger.warning(f"Failed to create titles.ini: {e}")
+
+    @classmethod
+    def start(cls, app: Flask) -> List[str]:
+        """Start downloading missing files in the background.
+
+        Args:
+            app: Application used for the app context of the settings sync
+
+        Returns:
+            Names of the assets being downloaded (empty if all are present)
+        """
+        missing = [
+            name for name in ("app.ini", "anime_data.db") if not cls.is_present(name)
+        ]
+        if not missing:
+            return []
+
+        with cls._lock:
+            if (
+                cls._pid == os.getpid()
+                and cls._thread is not None
+                and cls._thread.is_alive()
+            ):
+                return sorted(cls._downloading)
+            cls._pid = os.getpid()
+            cls._downloading = set(missing)
+            cls._errors = {}
+            cls._thread = threading.Thread(
+                target=cls._run, args=(app, missing), name="data-bootstrap", daemon=True
+            )
+            cls._thread.start()
+        return missing
+
+    @classmethod
+    def _run(cls, app: Flask, missing: List[str]) -> None:
+        # app.ini first: it is small and settings are seeded from it
+        if "app.ini" in missing:
+            cls._download_app_ini(app)
+        if "anime_data.db" in missing:
+            cls._download_catalogue()
+
+    @classmethod
+    def _finish(cls, name: str, error: Optional[str] = None) -> None:
+        with cls._lock:
+            cls._downloading.discard(name)
+            if error:
+                cls._errors[name] = error
+                logger.warning(f"Failed to download {name}: {error}")
+            else:
+                logger.info(f"Downloaded {name}")
+
+    @classmethod
+    def _download_app_ini(cls, app: Flask) -> None:
+        path = cls.ASSETS["app.ini"]
+        logger.info("app.ini not found. Downloading template...")
+        error = None
+        try:
+            response = requests.get(
+                cls.APP_INI_TEMPLATE_URL, timeout=cls.DOWNLOAD_TIMEOUT
+            )
+            response.raise_for_status()
+            with open(f"{path}.part", "wb") as f:
+                f.write(response.content)
+            os.replace(f"{path}.part", path)
+        except Exception as e:
+            error = str(e)
+
+        # Settings are seeded even if the download failed, so the web
+        # defaults (registration, API keys) exist either way
+        try:
+            with app.app_context():
+                ConfigService.init_settings_if_empty()
+        except Exception as e:
+            error = error or f"Failed to initialize settings: {e}"
+        cls._finish("app.ini", error)
+
+    @classmethod
+    def _download_catalogue(cls) -> None:
+        logger.info("Database not found. Downloading the database...")
+        # update_database also opens the new catalogue
+        result = DatabaseService.update_database()
+        error = None if result["status"] == "success" else result["message"]
+        cls._finish("anime_data.db", error)
+
+    @classmethod
+    def _own_state(cls) -> tuple:
+        """(downloading, errors) of downloads started by this process."""
+        if cls._pid != os.getpid():
+            return set(), {}
+        return cls._downloading, cls._errors
+
+    @classmethod
+    def is_present(cls, name: str, check_disk: bool = True) -> bool:
+        """Whether an asset exists on disk (remembered once seen).
+
+        Args:
+            name: Asset name, a key of ASSETS
+            check_disk: Look for a file not seen before; with False only
+                what earlier checks found is reported (no I/O)
+        """
+        if name in cls._present:
+            return True
+        downloading, _ = cls._own_state()
+        if name in downloading or not check_disk:
+            # Only complete files are moved into place, but the settings
+            # seeded from app.ini are not there yet
+            return False
+        if os.path.exists(cls.ASSETS[name]):
+            cls._present.add(name)
+            return True
+        return False
+
+    @classmethod
+    def status(cls, check_disk: bool = True) -> Dict:
+        """Report the state of every asset.
+
+        Args:
+            check_disk: See is_present
+
+        Returns:
+            ``ready`` (all assets present) and per asset ``present`` and
+            ``state``: present, downloading, failed or missing, plus
+            ``error`` for failed downloads
+        """
+        downloading, errors = cls._own_state()
+        assets = {}
+        for name in cls.ASSETS:
+            present = cls.is_present(name, check_disk)
+            if present:
+                state = "present"
+            elif name in downloading:
+                state = "downloading"
+            elif name in errors:
+                state = "failed"
+            else:
+                state = "missing"
+            assets[name] = {"present": present, "state": state}
+            if state == "failed":
+                assets[name]["error"] = errors[name]
+        return {
+            "ready": all(asset["present"] for asset in assets.values()),
+            "assets": assets,
+        }
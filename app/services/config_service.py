@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Any, Dict, List
 import configparser
 import datetime
 
@@ -7,11 +7,39 @@ from app.models.releases import Releases
 from app.models.base import db
 from app.services.base_service import BaseService
 from app.utils.errors import ValidationError
+from app.utils.file_lock import FileLock
+
+
+def _parse_bool(value: Any) -> bool:
+    """Parse a boolean form value (checkbox strings, JSON booleans)."""
+    return value in ("true", "True", True, "1", 1)
 
 
 class ConfigService(BaseService):
     """Service for managing application configuration and releases."""
 
+    # Held by every reader and writer of titles.ini, across workers
+    TITLES_LOCK = FileLock("data/titles.ini.lock")
+
+    # Release columns a bulk edit may change, with their value parsers
+    BULK_EDIT_FIELDS = {
+        "episode_index": int,
+        "season_number": str,
+        "download_dir": str,
+        "release_group": str,
+        "meta": str,
+        "adjusted_episode_number": int,
+        "ongoing": _parse_bool,
+    }
+    # Release columns a bulk filter may match on (equality)
+    BULK_FILTER_FIELDS = (
+        "season_number",
+        "download_dir",
+        "release_group",
+        "meta",
+        "ongoing",
+    )
+
     @staticmethod
     def _parse_publish_date(value: str) -> datetime.datetime:
         """Parse publish date from supported formats."""
@@ -25,6 +53,11 @@ class ConfigService(BaseService):
             "Publish date must be in YYYY-MM-DD HH:MM or YY-MM-DD HH:MM format."
         )
 
+    @classmethod
+    def _settings_changed(cls) -> None:
+        """Invalidate cached settings after the application_settings table changed."""
+        ApplicationSettings.invalidate_cache()
+
     @classmethod
     def read_all_settings_from_db(cls) -> List[Dict]:
         """Read all application settings from database."""
@@ -34,10 +67,9 @@ class ConfigService(BaseService):
     @classmethod
     def get_release_defaults(cls) -> Dict:
         """Get default values for the Add Release form (e.g. default_meta from Toloka section in DB)."""
-        setting = ApplicationSettings.query.filter_by(
-            section="Toloka", key="default_meta"
-        ).first()
-        default_meta = setting.value if setting else ""
+        default_meta = ApplicationSettings.get_value(
+            "default_meta", section="Toloka", default=""
+        )
         return {"default_meta": default_meta}
 
     @classmethod
@@ -47,12 +79,20 @@ class ConfigService(BaseService):
         cls.add_new_setting("toloka2web", "mal_api", "")
         cls.add_new_setting("toloka2web", "tmdb_api", "")
 
+    @classmethod
+    def init_settings_if_empty(cls) -> None:
+        """Seed settings from app.ini plus the web defaults on first run."""
+        if not ApplicationSettings.query.first():
+            cls.read_settings_ini_and_sync_to_db("data/app.ini")
+            cls.init_web_settings()
+
     @classmethod
     def add_new_setting(cls, section: str, key: str, value: str) -> None:
         """Add a new setting to the database."""
         new_setting = ApplicationSettings(section=section, key=key, value=value)
         db.session.add(new_setting)
         db.session.commit()
+        cls._settings_changed()
         cls.sync_settings("app", "to")
 
     @classmethod
@@ -65,6 +105,7 @@ class ConfigService(BaseService):
             setting.value = value
             db.session.add(setting)
             db.session.commit()
+            cls._settings_changed()
             cls.sync_settings("app", "to")
 
     @classmethod
@@ -74,6 +115,7 @@ class ConfigService(BaseService):
         if setting:
             db.session.delete(setting)
             db.session.commit()
+            cls._settings_changed()
             cls.sync_settings("app", "to")
             return True, "Setting deleted successfully."
         return False, "Setting not found."
@@ -112,12 +154,147 @@ class ConfigService(BaseService):
         release.guid = form["guid"]
 
         # Handle ongoing field - convert string to boolean
-        ongoing_value = form.get("ongoing", "true")
-        release.ongoing = ongoing_value in ("true", "True", True, "1", 1)
+        release.ongoing = _parse_bool(form.get("ongoing", "true"))
 
         db.session.commit()
         cls.sync_settings("release", "to")
 
+    @classmethod
+    def _select_releases(cls, form: Dict) -> Any:
+        """Build the releases query for a bulk operation.
+
+        Args:
+            form: Request body with either ``codenames`` (list of release
+                sections) or ``filter`` (column -> value, see
+                BULK_FILTER_FIELDS); both narrow the selection when given
+
+        Returns:
+            Releases query matching the selection
+
+        Raises:
+            ValidationError: If neither selector is given or one is invalid
+        """
+        codenames = form.get("codenames")
+        filters = form.get("filter")
+        if not codenames and not filters:
+            raise ValidationError("Either codenames or filter is required")
+
+        query = Releases.query
+        if codenames:
+            if not isinstance(codenames, list) or not all(
+                isinstance(codename, str) for codename in codenames
+            ):
+                raise ValidationError("codenames must be a list of strings")
+            query = query.filter(Releases.section.in_(codenames))
+        if filters:
+            if not isinstance(filters, dict):
+                raise ValidationError("filter must be an object")
+            unknown = sorted(set(filters) - set(cls.BULK_FILTER_FIELDS))
+            if unknown:
+                raise ValidationError(
+                    f"Unsupported filter fields: {', '.join(unknown)}",
+                    details={"allowed": list(cls.BULK_FILTER_FIELDS)},
+                )
+            for field, value in filters.items():
+                if field == "ongoing":
+                    value = _parse_bool(value)
+                query = query.filter(getattr(Releases, field) == value)
+        return query
+
+    @staticmethod
+    def _missing_codenames(form: Dict, found: List[str]) -> List[str]:
+        found_set = set(found)
+        return [
+            codename
+            for codename in form.get("codenames") or []
+            if codename not in found_set
+        ]
+
+    @classmethod
+    def bulk_edit_releases(cls, form: Dict) -> Dict:
+        """Apply the same changes to many releases in one transaction.
+
+        Matching releases are updated with a single UPDATE statement and
+        titles.ini is rewritten once afterwards.
+
+        Args:
+            form: Selection (see _select_releases) plus ``changes``, a
+                mapping of BULK_EDIT_FIELDS columns to new values
+
+        Returns:
+            Number of updated releases and requested codenames not found
+
+        Raises:
+            ValidationError: If the selection or changes are invalid
+        """
+        changes = form.get("changes")
+        if not isinstance(changes, dict) or not changes:
+            raise ValidationError("changes must be a non-empty object")
+        unknown = sorted(set(changes) - set(cls.BULK_EDIT_FIELDS))
+        if unknown:
+            raise ValidationError(
+                f"Unsupported fields: {', '.join(unknown)}",
+                details={"allowed": list(cls.BULK_EDIT_FIELDS)},
+            )
+        try:
+            values = {
+                getattr(Releases, field): cls.BULK_EDIT_FIELDS[field](value)
+                for field, value in changes.items()
+            }
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid value: {e}")
+
+        query = cls._select_releases(form)
+        try:
+            sections = [section for (section,) in query.with_entities(Releases.section)]
+            updated = 0
+            if sections:
+                updated = query.update(values, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if updated:
+            cls.sync_settings("release", "to")
+        return {
+            "updated": updated,
+            "codenames": sections,
+            "not_found": cls._missing_codenames(form, sections),
+        }
+
+    @classmethod
+    def bulk_delete_releases(cls, form: Dict) -> Dict:
+        """Delete many releases in one transaction.
+
+        Args:
+            form: Selection, see _select_releases
+
+        Returns:
+            Number of deleted releases and requested codenames not found
+
+        Raises:
+            ValidationError: If the selection is invalid
+        """
+        query = cls._select_releases(form)
+        try:
+            sections = [section for (section,) in query.with_entities(Releases.section)]
+            deleted = 0
+            if sections:
+                deleted = query.delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if deleted:
+            cls.sync_settings("release", "to")
+        return {
+            "deleted": deleted,
+            "codenames": sections,
+            "not_found": cls._missing_codenames(form, sections),
+        }
+
     @classmethod
     def sync_settings(cls, setting_type: str, direction: str) -> None:
         """Synchronize settings between database and INI files."""
@@ -167,6 +344,7 @@ class ConfigService(BaseService):
                     )
                     db.session.add(new_setting)
         db.session.commit()
+        cls._settings_changed()
 
     @classmethod
     def load_releases_from_db_and_write_to_ini(cls, file_path: str) -> None:
@@ -176,7 +354,7 @@ class ConfigService(BaseService):
 
         for release in releases:
             section = release.section
-            if section not in config.sections():
+            if not config.has_section(section):
                 config.add_section(section)
             config.set(section, "episode_index", str(release.episode_index))
             config.set(section, "season_number", release.season_number)
@@ -198,17 +376,20 @@ class ConfigService(BaseService):
                 str(release.ongoing if release.ongoing is not None else True),
             )
 
-        with open(file_path, "w", encoding="utf-8") as configfile:
+        with cls.TITLES_LOCK, open(file_path, "w", encoding="utf-8") as configfile:
             config.write(configfile)
 
     @classmethod
     def read_releases_ini_and_sync_to_db(cls, file_path: str) -> None:
         """Read releases from INI file and sync to database."""
         config = configparser.ConfigParser()
-        config.read(file_path, encoding="utf-8")
+        with cls.TITLES_LOCK:
+            config.read(file_path, encoding="utf-8")
 
+        # One query for all existing releases instead of one per section
+        releases = {release.section: release for release in Releases.query.all()}
         for section in config.sections():
-            release = Releases.query.filter_by(section=section).first()
+            release = releases.get(section)
             if not release:
                 release = Releases(section=section)
                 db.session.add(release)
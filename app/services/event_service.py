@@ -0,0 +1,215 @@
+"""Live release and torrent events pushed to browsers over Server-Sent Events."""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from flask import Flask, current_app, has_app_context
+
+from app.models.base import db
+from app.models.release_event import ReleaseEvent
+from app.services.base_service import BaseService
+from app.utils.errors import ServiceUnavailableError
+from app.utils.json_provider import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class EventService(BaseService):
+    """Fan out torrent progress and release job events to connected clients.
+
+    A single background poller per process queries the torrent client and
+    publishes only what changed since the previous poll. Every connected
+    client gets its own bounded queue, so N open tabs cost one torrent
+    client query per interval instead of N. The poller only runs while at
+    least one client is subscribed; each poller has its own stop event, so
+    a client connecting while a stopped poller is still sleeping starts a
+    fresh one.
+
+    Job events are written to the database (ReleaseEvent) by the worker
+    running the job. Each process's poller relays new rows to its own
+    clients every JOB_POLL_INTERVAL, so every client sees every job
+    whichever worker it is connected to. Torrent progress is polled by
+    each worker itself.
+
+    Each open stream occupies one request thread of its worker for as
+    long as it is connected (a gthread worker thread, or an ASGI pool
+    thread), so at most ``RELEASE_EVENTS_MAX_CLIENTS`` streams are served
+    per worker. Further clients get 503, and the releases page then falls
+    back to polling.
+    """
+
+    POLL_INTERVAL = 5.0
+    JOB_POLL_INTERVAL = 1.0
+    HEARTBEAT_INTERVAL = 15.0
+    QUEUE_SIZE = 100
+    MAX_CLIENTS = int(os.environ.get("RELEASE_EVENTS_MAX_CLIENTS", 4))
+
+    _subscribers: List[queue.Queue] = []
+    _snapshot: Dict[str, Dict] = {}
+    _lock = threading.Lock()
+    _poller: Optional[threading.Thread] = None
+    # Stop event of the current poller
+    _stop = threading.Event()
+    # Id of the last job event relayed to this process's clients
+    _job_cursor = 0
+
+    @classmethod
+    def subscribe(cls) -> queue.Queue:
+        """Register a new client and make sure the poller is running.
+
+        Raises:
+            ServiceUnavailableError: If MAX_CLIENTS streams are already open
+        """
+        subscriber: queue.Queue = queue.Queue(maxsize=cls.QUEUE_SIZE)
+        with cls._lock:
+            if len(cls._subscribers) >= cls.MAX_CLIENTS:
+                raise ServiceUnavailableError(
+                    "Too many live event streams; reload the page later"
+                )
+            cls._subscribers.append(subscriber)
+            if cls._poller is None or not cls._poller.is_alive() or cls._stop.is_set():
+                # A stopped poller may still be sleeping; leave it to exit
+                # on its own event and start a new one
+                app = current_app._get_current_object() if has_app_context() else None
+                if app is not None:
+                    cls._job_cursor = ReleaseEvent.latest_id()
+                cls._stop = threading.Event()
+                cls._poller = threading.Thread(
+                    target=cls._poll_loop,
+                    args=(cls._stop, app),
+                    name="release-events",
+                    daemon=True,
+                )
+                cls._poller.start()
+        return subscriber
+
+    @classmethod
+    def has_capacity(cls) -> bool:
+        """Whether another client could subscribe now."""
+        with cls._lock:
+            return len(cls._subscribers) < cls.MAX_CLIENTS
+
+    @classmethod
+    def unsubscribe(cls, subscriber: queue.Queue) -> None:
+        """Remove a client; the poller stops once nobody is listening."""
+        with cls._lock:
+            if subscriber in cls._subscribers:
+                cls._subscribers.remove(subscriber)
+            if not cls._subscribers:
+                cls._stop.set()
+
+    @classmethod
+    def publish(cls, event: str, data: Dict) -> None:
+        """Send an event to every connected client.
+
+        Slow clients whose queue is full miss the event instead of
+        blocking the publisher.
+        """
+        with cls._lock:
+            subscribers = list(cls._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event, data))
+            except queue.Full:
+                pass
+
+    @classmethod
+    def publish_job(cls, data: Dict) -> None:
+        """Publish a job event to the clients of every worker.
+
+        Needs an app context. If the event cannot be stored it is only
+        sent to this process's clients.
+        """
+        try:
+            ReleaseEvent.add("job", data)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Release events: storing job event failed: {e}")
+            cls.publish("job", data)
+
+    @classmethod
+    def relay_jobs(cls) -> None:
+        """Publish job events stored since the last relay (app context)."""
+        for row_id, event, data in ReleaseEvent.since(cls._job_cursor):
+            cls._job_cursor = row_id
+            cls.publish(event, data)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict]:
+        """Return the last known torrent status keyed by hash."""
+        with cls._lock:
+            return dict(cls._snapshot)
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Poll the torrent client once and publish changed torrents."""
+        from app.services.services import TorrentService
+
+        try:
+            current = TorrentService.get_torrent_status_by_hash()
+        except Exception as e:
+            logger.warning(f"Release events: torrent status poll failed: {e}")
+            return
+
+        with cls._lock:
+            previous = cls._snapshot
+            cls._snapshot = current
+
+        for torrent_hash, info in current.items():
+            if previous.get(torrent_hash) != info:
+                cls.publish("torrent", {"hash": torrent_hash, **info})
+        for torrent_hash in previous.keys() - current.keys():
+            cls.publish("torrent_removed", {"hash": torrent_hash})
+
+    @classmethod
+    def _poll_loop(cls, stop: threading.Event, app: Optional[Flask] = None) -> None:
+        """Background loop that polls until its stop event is set.
+
+        Job events are relayed every JOB_POLL_INTERVAL (when an app is
+        given for database access), torrents are polled every POLL_INTERVAL.
+        """
+        next_refresh = 0.0
+        while not stop.is_set():
+            if app is not None:
+                try:
+                    with app.app_context():
+                        cls.relay_jobs()
+                except Exception as e:
+                    logger.warning(f"Release events: job event poll failed: {e}")
+            if time.monotonic() >= next_refresh:
+                cls.refresh()
+                next_refresh = time.monotonic() + cls.POLL_INTERVAL
+            stop.wait(cls.JOB_POLL_INTERVAL if app is not None else cls.POLL_INTERVAL)
+
+    @staticmethod
+    def format_event(event: str, data: Dict) -> str:
+        """Encode an event in the text/event-stream wire format."""
+        return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+    @classmethod
+    def stream(cls, subscriber: Optional[queue.Queue] = None) -> Iterator[str]:
+        """Yield SSE messages for one client until it disconnects.
+
+        Args:
+            subscriber: Queue returned by subscribe; subscribes on the first
+                iteration when omitted (too late to answer 503 when full)
+        """
+        if subscriber is None:
+            subscriber = cls.subscribe()
+        try:
+            yield f"retry: {int(cls.POLL_INTERVAL * 1000)}\n\n"
+            yield cls.format_event("snapshot", cls.snapshot())
+            while True:
+                try:
+                    event, data = subscriber.get(timeout=cls.HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield cls.format_event(event, data)
+        finally:
+            cls.unsubscribe(subscriber)
@@ -0,0 +1,95 @@
+"""In-memory relation graph of the anime catalogue."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (anime_id1, anime_id2, franchise_id) rows of the related_anime table
+Edge = Tuple[int, int, Optional[int]]
+
+
+def _order_key(anime: Dict) -> Tuple:
+    season = anime.get("season")
+    return (
+        season is None,
+        season or 0,
+        anime.get("releaseDate") or "",
+        anime["id"],
+    )
+
+
+class FranchiseGraph:
+    """Adjacency lists and franchises (connected components) of the catalogue.
+
+    Built once from the whole catalogue; lookups afterwards are dictionary
+    accesses. Anime linked through related_anime, or sharing a franchise ID
+    (of the anime or of a relation), belong to the same franchise. Entries
+    are shared between lookups and must not be modified by callers.
+
+    Args:
+        animes: Serialized anime keyed by ID
+        edges: Rows of related_anime
+        version: Catalogue version the graph was built from
+    """
+
+    def __init__(self, animes: Dict[int, Dict], edges: Iterable[Edge], version: str):
+        self.version = version
+        self._animes = animes
+        self._related: Dict[int, List[Dict]] = {}
+        parent = {anime_id: anime_id for anime_id in animes}
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def union(a, b) -> None:
+            for node in (a, b):
+                parent.setdefault(node, node)
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        # Franchise IDs become nodes of their own so that anime sharing one
+        # end up in the same component
+        for anime_id, anime in animes.items():
+            franchise = anime.get("franchise_id")
+            if franchise is not None:
+                union(anime_id, ("franchise", franchise))
+
+        for anime_id1, anime_id2, franchise_id in edges:
+            if anime_id1 not in animes or anime_id2 not in animes:
+                continue
+            self._related.setdefault(anime_id1, []).append(animes[anime_id2])
+            union(anime_id1, anime_id2)
+            if franchise_id is not None:
+                union(anime_id1, ("franchise", franchise_id))
+
+        members: Dict[object, List[Dict]] = {}
+        for anime_id, anime in animes.items():
+            members.setdefault(find(anime_id), []).append(anime)
+        self._franchise: Dict[int, List[Dict]] = {}
+        for group in members.values():
+            group.sort(key=_order_key)
+            for anime in group:
+                self._franchise[anime["id"]] = group
+
+    def __len__(self) -> int:
+        return len(self._animes)
+
+    def anime(self, anime_id: int) -> Optional[Dict]:
+        """The anime with this ID, or None."""
+        return self._animes.get(anime_id)
+
+    def related(self, anime_id: int) -> List[Dict]:
+        """Anime directly related to anime_id (one hop)."""
+        return list(self._related.get(anime_id, ()))
+
+    def franchise(self, anime_id: int) -> Optional[List[Dict]]:
+        """Every anime of anime_id's franchise, by season then release date.
+
+        Returns:
+            The franchise including anime_id itself, or None if the anime
+            does not exist
+        """
+        group = self._franchise.get(anime_id)
+        return list(group) if group is not None else None
@@ -0,0 +1,181 @@
+"""Background dependency probes behind /readyz."""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from flask import Flask
+from sqlalchemy import text
+
+from app.models.base import db
+from app.services.base_service import BaseService
+from app.services.bootstrap_service import BootstrapService
+from app.services.services import TolokaService
+from app.services.services_db import DatabaseService
+from app.utils.errors import WarmingUpError
+
+logger = logging.getLogger(__name__)
+
+
+class HealthService(BaseService):
+    """Probe dependencies periodically and serve the cached results.
+
+    A daemon thread per process runs every probe each PROBE_INTERVAL
+    seconds, in parallel and bounded by PROBE_TIMEOUT, and stores the
+    outcome. readiness() only reads the stored outcome, so /readyz never
+    logs in or touches the network itself. The thread is started lazily
+    (and again in each forked Gunicorn worker, where the parent's thread
+    does not exist).
+
+    The application databases are critical: when they fail, the instance
+    is not ready. Upstream failures (Toloka, torrent client) only mark it
+    degraded, since taking the instance out of rotation does not help.
+    """
+
+    PROBE_INTERVAL = float(os.environ.get("HEALTH_PROBE_INTERVAL", 60))
+    PROBE_TIMEOUT = float(os.environ.get("HEALTH_PROBE_TIMEOUT", 10))
+
+    PROBE_NAMES = ("toloka2web_db", "anime_data_db", "torrent_client", "toloka")
+    CRITICAL = ("toloka2web_db", "anime_data_db")
+
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _pid: Optional[int] = None
+    _results: Dict[str, Dict] = {}
+
+    @classmethod
+    def probes(cls, app: Flask) -> Dict[str, Callable[[], None]]:
+        """Probe callables by name; each raises if its dependency is down."""
+        return {
+            "toloka2web_db": lambda: cls._probe_app_db(app),
+            "anime_data_db": DatabaseService.ping,
+            "torrent_client": TolokaService.probe_torrent_client,
+            "toloka": TolokaService.probe_toloka,
+        }
+
+    @staticmethod
+    def _probe_app_db(app: Flask) -> None:
+        with app.app_context():
+            db.session.execute(text("SELECT 1"))
+
+    @classmethod
+    def start(cls, app: Flask) -> None:
+        """Start this process's prober thread unless it is running."""
+        with cls._lock:
+            if (
+                cls._pid == os.getpid()
+                and cls._thread is not None
+                and cls._thread.is_alive()
+            ):
+                return
+            cls._pid = os.getpid()
+            cls._results = {}
+            cls._thread = threading.Thread(
+                target=cls._loop, args=(app,), name="health-probes", daemon=True
+            )
+            cls._thread.start()
+
+    @classmethod
+    def _loop(cls, app: Flask) -> None:
+        while True:
+            try:
+                cls.run_probes(app)
+            except Exception:
+                logger.exception("Health probes failed")
+            time.sleep(cls.PROBE_INTERVAL)
+
+    @classmethod
+    def run_probes(cls, app: Flask) -> Dict[str, Dict]:
+        """Run every probe once and store the results.
+
+        Returns:
+            Result per probe: ``status`` (ok, warming_up or error),
+            ``latency_ms``, ``checked_at`` and ``error`` when not ok
+        """
+        # Refresh the on-disk view of the data files for readiness()
+        BootstrapService.status()
+
+        probes = cls.probes(app)
+        executor = ThreadPoolExecutor(
+            max_workers=len(probes), thread_name_prefix="health-probe"
+        )
+        futures = {
+            name: executor.submit(cls._timed, probe) for name, probe in probes.items()
+        }
+        done, _ = wait(futures.values(), timeout=cls.PROBE_TIMEOUT)
+        # Do not wait for hung probes; their threads finish on their own
+        executor.shutdown(wait=False)
+
+        checked_at = datetime.now(timezone.utc).isoformat()
+        results = {}
+        for name, future in futures.items():
+            if future in done:
+                result = future.result()
+            else:
+                result = {
+                    "status": "error",
+                    "error": f"Timed out after {cls.PROBE_TIMEOUT:g}s",
+                }
+            result["checked_at"] = checked_at
+            results[name] = result
+
+        with cls._lock:
+            cls._results = results
+        return results
+
+    @staticmethod
+    def _timed(probe: Callable[[], None]) -> Dict:
+        started = time.perf_counter()
+        error = None
+        try:
+            probe()
+            status = "ok"
+        except WarmingUpError as e:
+            status, error = "warming_up", e.message
+        except Exception as e:
+            status, error = "error", str(e) or type(e).__name__
+        result = {
+            "status": status,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        if error:
+            result["error"] = error
+        return result
+
+    @classmethod
+    def readiness(cls) -> Dict:
+        """Readiness from the last probe results and data files, without I/O.
+
+        Returns:
+            ``ready`` flag, overall ``status`` (ready, degraded, starting,
+            warming_up or unavailable), per-dependency results and the data
+            file states (see BootstrapService.status)
+        """
+        bootstrap = BootstrapService.status(check_disk=False)
+        results = cls._results
+        dependencies = {
+            name: results.get(name, {"status": "pending"}) for name in cls.PROBE_NAMES
+        }
+
+        critical = [dependencies[name]["status"] for name in cls.CRITICAL]
+        if not results:
+            status = "starting"
+        elif not bootstrap["ready"] or "warming_up" in critical:
+            status = "warming_up"
+        elif any(state != "ok" for state in critical):
+            status = "unavailable"
+        elif any(result["status"] != "ok" for result in dependencies.values()):
+            status = "degraded"
+        else:
+            status = "ready"
+
+        return {
+            "ready": status in ("ready", "degraded"),
+            "status": status,
+            "dependencies": dependencies,
+            "assets": bootstrap["assets"],
+        }
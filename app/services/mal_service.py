@@ -1,47 +1,92 @@
 """MAL (MyAnimeList) API service."""
 
-from typing import Dict
-import requests
+import os
+from typing import Any, Dict, Optional
 
 from app.services.base_service import BaseService
 
 
 class MALService(BaseService):
-    """Service for interacting with MyAnimeList API."""
+    """Service for interacting with MyAnimeList API.
 
-    API_BASE_URL = "https://api.myanimelist.net/v2"
+    Each call has a blocking variant using ``requests`` and an ``*_async``
+    variant taking an ``httpx.AsyncClient``; both share the request
+    building in the ``_*_request`` helpers.
+    """
+
+    API_BASE_URL = os.environ.get("MAL_API_BASE_URL", "https://api.myanimelist.net/v2")
+    UPSTREAM = "mal"
+    KEY_MISSING_ERROR = {"error": "MAL API key not found"}
 
     @classmethod
-    def search_anime(cls, query: str) -> Dict:
-        """Search for anime using MAL API."""
+    def _search_anime_request(cls, query: str) -> Optional[Dict[str, Any]]:
+        """Build request arguments for an anime search, None without API key."""
+        api_key = cls.get_api_key("mal_api")
+        if not api_key:
+            return None
+
+        return {
+            "url": f"{cls.API_BASE_URL}/anime",
+            "params": {
+                "q": query,
+                "limit": 10,
+                "fields": "id,title,main_picture,alternative_titles,media_type,status,start_date,end_date",
+            },
+            "headers": {"X-MAL-CLIENT-ID": api_key},
+        }
+
+    @classmethod
+    def _anime_detail_request(cls, anime_id: int) -> Optional[Dict[str, Any]]:
+        """Build request arguments for anime details, None without API key."""
         api_key = cls.get_api_key("mal_api")
         if not api_key:
-            return {"error": "MAL API key not found"}
+            return None
 
-        url = f"{cls.API_BASE_URL}/anime"
-        params = {
-            "q": query,
-            "limit": 10,
-            "fields": "id,title,main_picture,alternative_titles,media_type,status,start_date,end_date",
+        return {
+            "url": f"{cls.API_BASE_URL}/anime/{anime_id}",
+            "params": {
+                "fields": "id,title,main_picture,alternative_titles,start_date,end_date,synopsis,rank,"
+                "popularity,status,num_episodes,rating,pictures,background,related_anime"
+            },
+            "headers": {"X-MAL-CLIENT-ID": api_key},
         }
-        headers = {"X-MAL-CLIENT-ID": api_key}
 
-        response = requests.get(url, params=params, headers=headers, timeout=30)
+    @classmethod
+    def search_anime(cls, query: str) -> Dict:
+        """Search for anime using MAL API."""
+        request_args = cls._search_anime_request(query)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = cls.http_get("/anime", request_args)
         return cls.handle_api_response(response, "MAL API Error")
 
     @classmethod
     def get_anime_detail(cls, anime_id: int) -> Dict:
         """Get detailed information about a specific anime."""
-        api_key = cls.get_api_key("mal_api")
-        if not api_key:
-            return {"error": "MAL API key not found"}
+        request_args = cls._anime_detail_request(anime_id)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
 
-        url = f"{cls.API_BASE_URL}/anime/{anime_id}"
-        params = {
-            "fields": "id,title,main_picture,alternative_titles,start_date,end_date,synopsis,rank,"
-            "popularity,status,num_episodes,rating,pictures,background,related_anime"
-        }
-        headers = {"X-MAL-CLIENT-ID": api_key}
+        response = cls.http_get("/anime/{id}", request_args)
+        return cls.handle_api_response(response, "MAL API Error")
+
+    @classmethod
+    async def search_anime_async(cls, client, query: str) -> Dict:
+        """Search for anime using MAL API without blocking the event loop."""
+        request_args = cls._search_anime_request(query)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = await cls.http_get_async(client, "/anime", request_args)
+        return cls.handle_api_response(response, "MAL API Error")
+
+    @classmethod
+    async def get_anime_detail_async(cls, client, anime_id: int) -> Dict:
+        """Get anime details without blocking the event loop."""
+        request_args = cls._anime_detail_request(anime_id)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
 
-        response = requests.get(url, params=params, headers=headers, timeout=30)
+        response = await cls.http_get_async(client, "/anime/{id}", request_args)
         return cls.handle_api_response(response, "MAL API Error")
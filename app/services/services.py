@@ -1,39 +1,94 @@
 # services.py
 
-from typing import Dict, Any, List
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Set, Tuple
 from flask import Response, json
 import requests
 
-from toloka2MediaServer.config_parser import load_configurations, get_toloka_client
-from toloka2MediaServer.clients.dynamic import dynamic_client_init
 from toloka2MediaServer.models.config import Config
-from toloka2MediaServer.logger_setup import setup_logging
-from toloka2MediaServer.main_logic import (
-    add_release_by_url,
-    update_release_by_name,
-    update_releases,
-    search_torrents,
-    get_torrent as get_torrent_external,
-    add_torrent as add_torrent_external,
-)
-from stream2mediaserver.main_logic import MainLogic
 
 from app.models.request_data import RequestData
 from app.services.base_service import BaseService
+from app.services.config_service import ConfigService
 from app.services.mal_service import MALService
 from app.services.tmdb_service import TMDBService
 from app.services.services_db import DatabaseService
+from app.utils.errors import ConflictError, ValidationError
+from app.utils.file_lock import FileLock
+from app.utils.lazy_import import lazy_attr
+from app.utils.metrics import track_upstream
+from app.utils.ttl_cache import TTLCache, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# toloka2MediaServer pulls in the tracker and torrent client libraries and
+# stream2mediaserver every streaming provider; import them on first use
+_T2M = "toloka2MediaServer"
+load_configurations = lazy_attr(f"{_T2M}.config_parser", "load_configurations")
+get_toloka_client = lazy_attr(f"{_T2M}.config_parser", "get_toloka_client")
+dynamic_client_init = lazy_attr(f"{_T2M}.clients.dynamic", "dynamic_client_init")
+setup_logging = lazy_attr(f"{_T2M}.logger_setup", "setup_logging")
+add_release_by_url = lazy_attr(f"{_T2M}.main_logic", "add_release_by_url")
+update_release_by_name = lazy_attr(f"{_T2M}.main_logic", "update_release_by_name")
+update_releases = lazy_attr(f"{_T2M}.main_logic", "update_releases")
+search_torrents = lazy_attr(f"{_T2M}.main_logic", "search_torrents")
+get_torrent_external = lazy_attr(f"{_T2M}.main_logic", "get_torrent")
+add_torrent_external = lazy_attr(f"{_T2M}.main_logic", "add_torrent")
+MainLogic = lazy_attr("stream2mediaserver.main_logic", "MainLogic")
 
 
 class TolokaService(BaseService):
     """Service for handling Toloka-related operations."""
 
+    UPSTREAM = "toloka"
+
     CONFIG_PATHS = {
         "app": "data/app.ini",
         "titles": "data/titles.ini",
         "logger": "data/app_web.log",
     }
 
+    # Search results by normalized query; concurrent identical searches
+    # share one upstream call
+    SEARCH_CACHE = TTLCache(
+        "toloka_search", ttl=float(os.environ.get("TOLOKA_SEARCH_CACHE_TTL", 60))
+    )
+    SEARCH_RETRY_BASE_DELAY = 0.5
+    SEARCH_RETRY_MAX_DELAY = 4.0
+
+    # Bulk release import: releases added concurrently, at most per call
+    BULK_IMPORT_WORKERS = int(os.environ.get("BULK_IMPORT_WORKERS", 4))
+    BULK_IMPORT_MAX_ITEMS = int(os.environ.get("BULK_IMPORT_MAX_ITEMS", 200))
+    RELEASE_REQUIRED_FIELDS = ("url", "season", "index", "correction", "title")
+    # One bulk import at a time across all workers
+    _bulk_import_lock = FileLock("data/bulk_import.lock")
+
+    _library_logger: Any = None
+    _library_logger_lock = threading.Lock()
+
+    IMAGE_PROXY_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+    }
+
+    @classmethod
+    def get_library_logger(cls) -> Any:
+        """Logger handed to toloka2MediaServer, set up once per process.
+
+        setup_logging attaches a file handler each time it is called, so
+        calling it per request would stack handlers.
+        """
+        if cls._library_logger is None:
+            with cls._library_logger_lock:
+                if cls._library_logger is None:
+                    cls._library_logger = setup_logging(cls.CONFIG_PATHS["logger"])
+        return cls._library_logger
+
     @classmethod
     def initiate_config(cls) -> Config:
         """Initialize full configuration with Toloka client."""
@@ -41,10 +96,8 @@ class TolokaService(BaseService):
             cls.CONFIG_PATHS["app"], cls.CONFIG_PATHS["titles"]
         )
         toloka = get_toloka_client(application_config)
-        logger = setup_logging(cls.CONFIG_PATHS["logger"])
-
         config = Config(
-            logger=logger,
+            logger=cls.get_library_logger(),
             toloka=toloka,
             app_config=app_config,
             titles_config=titles_config,
@@ -62,15 +115,28 @@ class TolokaService(BaseService):
         app_config, titles_config, application_config = load_configurations(
             cls.CONFIG_PATHS["app"], cls.CONFIG_PATHS["titles"]
         )
-        logger = setup_logging(cls.CONFIG_PATHS["logger"])
-
         return Config(
-            logger=logger,
+            logger=cls.get_library_logger(),
             app_config=app_config,
             titles_config=titles_config,
             application_config=application_config,
         )
 
+    @classmethod
+    def probe_toloka(cls) -> None:
+        """Create a logged-in Toloka client (health probe)."""
+        _, _, application_config = load_configurations(
+            cls.CONFIG_PATHS["app"], cls.CONFIG_PATHS["titles"]
+        )
+        if get_toloka_client(application_config) is None:
+            raise RuntimeError("Toloka client could not be created")
+
+    @classmethod
+    def probe_torrent_client(cls) -> None:
+        """Connect to the configured torrent client (health probe)."""
+        if dynamic_client_init(cls.initiate_min_config()) is None:
+            raise RuntimeError("Torrent client could not be created")
+
     @classmethod
     def get_titles_logic(cls) -> Dict:
         """Get all titles configuration."""
@@ -91,40 +157,57 @@ class TolokaService(BaseService):
         then merges torrent state/progress/name into each title by hash.
         """
         titles_data = cls.get_titles_logic()
-        torrents_data = TorrentService.get_releases_torrent_status()
-
-        torrents_dict = {}
-        if hasattr(torrents_data, "data") and torrents_data.data:
-            for torrent in torrents_data.data:
-                if isinstance(torrent, dict) and torrent.get("hash"):
-                    torrents_dict[torrent["hash"]] = torrent
+        torrents_dict = TorrentService.get_torrent_status_by_hash()
 
         for title, data in titles_data.items():
             if not isinstance(data, dict):
                 continue
             hash_value = data.get("hash")
             if hash_value in torrents_dict:
-                t = torrents_dict[hash_value]
-                data["torrent_info"] = {
-                    "state": t.get("state"),
-                    "progress": t.get("progress"),
-                    "name": t.get("name"),
-                }
+                data["torrent_info"] = dict(torrents_dict[hash_value])
 
         return titles_data
 
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a search query for caching (case and whitespace)."""
+        return " ".join(query.split()).casefold()
+
+    @staticmethod
+    def _is_cacheable_search(result: Any) -> bool:
+        """Error payloads and retry suggestions are not cached."""
+        if isinstance(result, dict):
+            return not (result.get("error") or result.get("retry_suggested"))
+        return True
+
     @classmethod
     def get_torrents_logic(cls, query: str) -> Dict:
         """Search for torrents using query.
-        If the API returns retry_suggested=True, retries once with the same query.
-        If the retry still returns retry_suggested, returns an error payload with message.
+
+        Results are cached for ``TOLOKA_SEARCH_CACHE_TTL`` seconds by
+        normalized query, and concurrent identical searches wait for the one
+        already in flight. See _search_torrents for the retry behaviour.
         """
-        if not query:
+        if not query or not query.strip():
             return {}
 
+        return cls.SEARCH_CACHE.get_or_load(
+            cls.normalize_query(query),
+            lambda: cls._search_torrents(query.strip()),
+            should_cache=cls._is_cacheable_search,
+        )
+
+    @classmethod
+    def _search_torrents(cls, query: str) -> Dict:
+        """Run a Toloka search.
+        If the API returns retry_suggested=True, retries once with the same query
+        after a jittered backoff delay.
+        If the retry still returns retry_suggested, returns an error payload with message.
+        """
         config = cls.initiate_config()
         config.args = query
-        search_result = search_torrents(config)
+        with track_upstream(cls.UPSTREAM, "search"):
+            search_result = search_torrents(config)
         response = search_result.response
 
         if not isinstance(response, dict):
@@ -133,8 +216,13 @@ class TolokaService(BaseService):
         if response.get("retry_suggested") is not True:
             return response
 
-        # One automatic retry for this search action
-        search_result = search_torrents(config)
+        # One automatic retry for this search action, after a random delay so
+        # that simultaneous searches do not hit Toloka again in lockstep
+        time.sleep(
+            backoff_delay(0, cls.SEARCH_RETRY_BASE_DELAY, cls.SEARCH_RETRY_MAX_DELAY)
+        )
+        with track_upstream(cls.UPSTREAM, "search"):
+            search_result = search_torrents(config)
         retry_response = search_result.response
 
         if not isinstance(retry_response, dict):
@@ -159,7 +247,8 @@ class TolokaService(BaseService):
 
         config = cls.initiate_config()
         config.args = torrent_id
-        search_result = get_torrent_external(config)
+        with track_upstream(cls.UPSTREAM, "torrent"):
+            search_result = get_torrent_external(config)
         return search_result.response
 
     @classmethod
@@ -173,47 +262,159 @@ class TolokaService(BaseService):
 
         config = cls.initiate_config()
         config.args = RequestData(url=torrent_url)
-        output = add_torrent_external(config)
+        with track_upstream(cls.UPSTREAM, "add_torrent"):
+            output = add_torrent_external(config)
         return cls.serialize_operation_result(output)
 
+    @staticmethod
+    def _release_request_data(config: Config, request: Dict) -> RequestData:
+        """Build library arguments for adding the release described by request."""
+        # Handle ongoing field (UI) -> partial (CLI arg for library)
+        ongoing_value = request.get("ongoing", "true")
+        is_partial = ongoing_value in ("true", "True", True, "1", 1)
+
+        return RequestData(
+            url=request["url"],
+            season=request["season"],
+            index=int(request["index"]),
+            correction=int(request["correction"]),
+            title=request["title"],
+            path=config.application_config.default_download_dir,
+            partial=is_partial,
+            release_group=request.get("release_group", ""),
+            meta=request.get("meta", ""),
+        )
+
     @classmethod
     def add_release_logic(cls, request: Dict) -> Dict:
         """Add a new release."""
         try:
-            config = cls.initiate_config()
-
-            # Handle ongoing field (UI) -> partial (CLI arg for library)
-            ongoing_value = request.get("ongoing", "true")
-            is_partial = ongoing_value in ("true", "True", True, "1", 1)
-
-            request_data = RequestData(
-                url=request["url"],
-                season=request["season"],
-                index=int(request["index"]),
-                correction=int(request["correction"]),
-                title=request["title"],
-                path=config.application_config.default_download_dir,
-                partial=is_partial,
-                release_group=request.get("release_group", ""),
-                meta=request.get("meta", ""),
-            )
-
-            config.args = request_data
-            operation_result = add_release_by_url(config)
+            # The library updates titles.ini from the configuration it loaded
+            with ConfigService.TITLES_LOCK:
+                config = cls.initiate_config()
+                config.args = cls._release_request_data(config, request)
+                with track_upstream(cls.UPSTREAM, "add_release"):
+                    operation_result = add_release_by_url(config)
             return cls.serialize_operation_result(operation_result)
         except Exception as e:
             return {"error": str(e)}
 
+    @classmethod
+    def parse_release_specs(cls, payload: Any) -> List[Dict]:
+        """Validate a bulk release import payload.
+
+        Args:
+            payload: ``{"releases": [...]}`` or a bare list of release specs,
+                each with the fields of a single ``POST /api/releases``
+
+        Returns:
+            The release specs
+
+        Raises:
+            ValidationError: If the payload is malformed or too large
+        """
+        specs = payload.get("releases") if isinstance(payload, dict) else payload
+        if not isinstance(specs, list) or not specs:
+            raise ValidationError("Expected a non-empty list of releases")
+        if len(specs) > cls.BULK_IMPORT_MAX_ITEMS:
+            raise ValidationError(
+                f"A bulk import may contain at most {cls.BULK_IMPORT_MAX_ITEMS} releases"
+            )
+
+        for index, spec in enumerate(specs):
+            if not isinstance(spec, dict):
+                raise ValidationError(f"Release {index} must be an object")
+            missing = [
+                field
+                for field in cls.RELEASE_REQUIRED_FIELDS
+                if spec.get(field) in (None, "")
+            ]
+            if missing:
+                raise ValidationError(
+                    f"Release {index} is missing {', '.join(missing)}",
+                    details={"index": index, "missing": missing},
+                )
+        return specs
+
+    @classmethod
+    def add_releases_bulk(cls, specs: List[Dict]) -> Dict:
+        """Add many releases, with the database synced once at the end.
+
+        Up to BULK_IMPORT_WORKERS threads each build their own
+        configuration, with their own Toloka and torrent clients, so the
+        logins run in parallel. The library rewrites titles.ini from the
+        configuration it is given, so each release is then added under
+        ConfigService.TITLES_LOCK with the titles configuration re-read
+        just before, like a single add. Releases added or updated
+        meanwhile are therefore kept. One bulk import runs at a time
+        across all workers.
+
+        Args:
+            specs: Release specs returned by parse_release_specs
+
+        Returns:
+            Counts and one result per spec, in input order; failed items
+            carry an ``error`` message instead of the operation result
+
+        Raises:
+            ConflictError: If another bulk import is in progress
+        """
+        if not cls._bulk_import_lock.acquire(blocking=False):
+            raise ConflictError("A bulk import is already in progress")
+
+        def add(spec: Dict) -> Dict:
+            try:
+                config = cls.initiate_config()
+                with ConfigService.TITLES_LOCK:
+                    config.titles_config = cls._load_titles_config()
+                    config.args = cls._release_request_data(config, spec)
+                    with track_upstream(cls.UPSTREAM, "add_release"):
+                        operation_result = add_release_by_url(config)
+                return cls.serialize_operation_result(operation_result)
+            except Exception as e:
+                return {"error": str(e)}
+
+        try:
+            workers = max(1, min(cls.BULK_IMPORT_WORKERS, len(specs)))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="release-import"
+            ) as executor:
+                outcomes = list(executor.map(add, specs))
+        finally:
+            cls._bulk_import_lock.release()
+
+        results = [
+            {"index": index, "title": spec["title"], "url": spec["url"], **outcome}
+            for index, (spec, outcome) in enumerate(zip(specs, outcomes))
+        ]
+        failed = sum(1 for outcome in outcomes if "error" in outcome)
+        return {
+            "total": len(results),
+            "added": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
+
+    @classmethod
+    def _load_titles_config(cls) -> Any:
+        """Read the current titles configuration from titles.ini."""
+        _, titles_config, _ = load_configurations(
+            cls.CONFIG_PATHS["app"], cls.CONFIG_PATHS["titles"]
+        )
+        return titles_config
+
     @classmethod
     def update_release_logic(cls, request: Dict) -> Dict:
         """Update an existing release."""
         try:
-            config = cls.initiate_config()
             force_value = request.get("force", "false")
             is_force = force_value in ("true", "True", True, "1", 1)
             request_data = RequestData(codename=request["codename"], force=is_force)
-            config.args = request_data
-            operation_result = update_release_by_name(config)
+            with ConfigService.TITLES_LOCK:
+                config = cls.initiate_config()
+                config.args = request_data
+                with track_upstream(cls.UPSTREAM, "update_release"):
+                    operation_result = update_release_by_name(config)
             return cls.serialize_operation_result(operation_result)
         except Exception as e:
             return {"error": str(e)}
@@ -222,10 +423,11 @@ class TolokaService(BaseService):
     def update_all_releases_logic(cls) -> Dict:
         """Update all releases."""
         try:
-            config = cls.initiate_config()
-            request_data = RequestData()
-            config.args = request_data
-            operation_result = update_releases(config)
+            with ConfigService.TITLES_LOCK:
+                config = cls.initiate_config()
+                config.args = RequestData()
+                with track_upstream(cls.UPSTREAM, "update_all_releases"):
+                    operation_result = update_releases(config)
             return cls.serialize_operation_result(operation_result)
         except Exception as e:
             return {"error": str(e)}
@@ -256,24 +458,29 @@ class TolokaService(BaseService):
             else None,
         }
 
+    @staticmethod
+    def normalize_image_url(url: str) -> str:
+        """Make protocol-relative and scheme-less image URLs absolute."""
+        if url.startswith("//"):
+            return "https:" + url
+        if not url.startswith(("http://", "https://")):
+            return "https://" + url
+        return url
+
     @classmethod
     def proxy_image_logic(cls, url: str) -> Response:
         """Proxy image requests through the server."""
         if not url:
             return Response("No URL provided", status=400)
 
-        # Normalize the URL
-        if url.startswith("//"):
-            url = "https:" + url
-        elif not url.startswith(("http://", "https://")):
-            url = "https://" + url
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
-        }
+        url = cls.normalize_image_url(url)
 
         try:
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
+            with track_upstream("image", "/image") as call:
+                response = requests.get(
+                    url, headers=cls.IMAGE_PROXY_HEADERS, stream=True, timeout=30
+                )
+                call.record_response(response)
             response.raise_for_status()
             return Response(
                 response.iter_content(chunk_size=1024),
@@ -290,43 +497,179 @@ class TolokaService(BaseService):
 
 
 class StreamingService(BaseService):
-    """Service for handling streaming site operations."""
+    """Service for handling streaming site operations.
+
+    One stream2mediaserver ``MainLogic`` is created per process and reused,
+    so provider instances and their HTTP sessions are shared by all
+    requests. When MainLogic exposes its providers, searches fan out to
+    them in parallel and return whatever arrived within
+    ``STREAMING_PROVIDER_TIMEOUT`` seconds; otherwise ``search_releases``
+    searches them one after another. Release details are cached per
+    (provider, link) for ``STREAMING_DETAILS_CACHE_TTL`` seconds.
+    """
+
+    UPSTREAM = "streaming"
+
+    PROVIDER_TIMEOUT = float(os.environ.get("STREAMING_PROVIDER_TIMEOUT", 15))
+    DETAILS_CACHE = TTLCache(
+        "streaming_details",
+        ttl=float(os.environ.get("STREAMING_DETAILS_CACHE_TTL", 600)),
+    )
+
+    _main_logic = None
+    _lock = threading.Lock()
+    # Providers whose timed-out search is still running
+    _stuck: Set[str] = set()
+
+    @classmethod
+    def get_main_logic(cls) -> Any:
+        """Return the shared MainLogic (provider registry), creating it once."""
+        if cls._main_logic is None:
+            with cls._lock:
+                if cls._main_logic is None:
+                    cls._main_logic = MainLogic()
+        return cls._main_logic
+
+    @staticmethod
+    def get_providers(main_logic: Any) -> List[Tuple[str, Any]]:
+        """List the (name, provider) pairs of a ``providers`` mapping.
+
+        Only used if MainLogic has a ``providers`` mapping of provider name
+        to an object with ``search_title``. Returns an empty list when it
+        does not (the library does not document one); callers then fall
+        back to ``search_releases``.
+        """
+        providers = getattr(main_logic, "providers", None)
+        if not isinstance(providers, Mapping):
+            return []
+        return [
+            (str(name), provider)
+            for name, provider in providers.items()
+            if callable(getattr(provider, "search_title", None))
+        ]
+
+    @classmethod
+    def _search_provider(cls, name: str, provider: Any, query: str) -> Any:
+        with track_upstream(cls.UPSTREAM, f"search/{name}"):
+            return provider.search_title(query)
+
+    @classmethod
+    def _release_when_done(cls, name: str, future: Future) -> None:
+        """Skip provider name in new searches until future finishes."""
+        with cls._lock:
+            cls._stuck.add(name)
+
+        def release(_future):
+            with cls._lock:
+                cls._stuck.discard(name)
+
+        future.add_done_callback(release)
 
     @classmethod
-    def search_titles_from_streaming_site(cls, query: str) -> Dict:
-        """Search for titles on streaming sites."""
+    def search_titles_from_streaming_site(cls, query: str) -> Any:
+        """Search for titles on all streaming sites.
+
+        Without a providers mapping (see get_providers), MainLogic's
+        search_releases is called as is. Otherwise providers are queried in
+        parallel, on threads of this search.
+        Providers that fail or do not answer within PROVIDER_TIMEOUT are
+        logged and left out, so the result may be partial. A provider whose
+        timed-out search is still running is skipped until it returns, so
+        a hanging site holds at most one thread.
+        """
         if not query:
             return {}
-        main_logic = MainLogic()
-        return main_logic.search_releases(query)
+
+        main_logic = cls.get_main_logic()
+        providers = cls.get_providers(main_logic)
+        if not providers:
+            with track_upstream(cls.UPSTREAM, "search"):
+                return main_logic.search_releases(query)
+
+        with cls._lock:
+            stuck = [name for name, _ in providers if name in cls._stuck]
+        if stuck:
+            logger.warning(
+                f"Skipping streaming providers {', '.join(stuck)}: "
+                "an earlier search has not returned"
+            )
+        providers = [(name, p) for name, p in providers if name not in stuck]
+        if not providers:
+            return []
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(providers), thread_name_prefix="streaming-search"
+        )
+        try:
+            futures = [
+                (name, executor.submit(cls._search_provider, name, provider, query))
+                for name, provider in providers
+            ]
+            wait([future for _, future in futures], timeout=cls.PROVIDER_TIMEOUT)
+        finally:
+            # Threads of timed-out searches finish in the background
+            executor.shutdown(wait=False)
+
+        results = []
+        for name, future in futures:
+            if not future.done():
+                logger.warning(
+                    f"Streaming provider {name} timed out after "
+                    f"{cls.PROVIDER_TIMEOUT}s searching {query!r}"
+                )
+                cls._release_when_done(name, future)
+                continue
+            try:
+                found = future.result()
+            except Exception as e:
+                logger.warning(f"Streaming provider {name} search failed: {e}")
+                continue
+            if isinstance(found, (list, tuple)):
+                results.extend(found)
+            elif found:
+                results.append(found)
+        return results
 
     @classmethod
     def get_streaming_site_release_details(
         cls, provider_name: str, release_url: str
     ) -> Dict:
-        """Get detailed information about a streaming release."""
-        main_logic = MainLogic()
-        return main_logic.get_release_details(provider_name, release_url)
+        """Get detailed information about a streaming release (cached)."""
+
+        def load():
+            with track_upstream(cls.UPSTREAM, "release_details"):
+                return cls.get_main_logic().get_release_details(
+                    provider_name, release_url
+                )
+
+        return cls.DETAILS_CACHE.get_or_load(
+            (provider_name, release_url),
+            load,
+            should_cache=lambda details: (
+                bool(details)
+                and not (isinstance(details, dict) and details.get("error"))
+            ),
+        )
 
 
 class SearchService(BaseService):
     """Service for handling multi-source search operations."""
 
+    RESULTS_PER_SOURCE = 4
+
+    @staticmethod
+    def _safe_fetch(data: Dict, keys: List[str], default: Any = "") -> Any:
+        """Walk nested keys, returning default on any missing step."""
+        try:
+            for key in keys:
+                data = data[key]
+            return data if data is not None else default
+        except (KeyError, TypeError, IndexError):
+            return default
+
     @classmethod
     def multi_search(cls, query: str) -> List[Dict]:
         """Search across multiple sources (MAL, TMDB, local DB)."""
-        combined_data = []
-
-        # Safe fetching function
-        def safe_fetch(data: Dict, keys: List[str], default: Any = "") -> Any:
-            try:
-                for key in keys:
-                    data = data[key]
-                return data if data is not None else default
-            except (KeyError, TypeError, IndexError):
-                return default
-
-        # Fetch data from various sources
         try:
             mal_data = MALService.search_anime(query)
         except Exception:
@@ -342,8 +685,69 @@ class SearchService(BaseService):
         except Exception:
             localdb_data = []
 
+        tmdb_items = tmdb_data.get("results", [])[: cls.RESULTS_PER_SOURCE]
+        tmdb_details = []
+        for item in tmdb_items:
+            try:
+                details = TMDBService.get_media_detail(
+                    item["id"], item.get("media_type", "Unknown")
+                )
+            except Exception:
+                details = {}
+            tmdb_details.append(details)
+
+        return cls.combine_results(mal_data, tmdb_items, tmdb_details, localdb_data)
+
+    @classmethod
+    async def multi_search_async(cls, client, query: str) -> List[Dict]:
+        """Search across MAL, TMDB and the local DB concurrently.
+
+        Same result as ``multi_search``, but the upstream calls (including
+        the per-item TMDB detail lookups) run concurrently on ``client``,
+        an ``httpx.AsyncClient``.
+        """
+
+        async def _safe(awaitable, default):
+            try:
+                return await awaitable
+            except Exception:
+                return default
+
+        mal_data, tmdb_data, localdb_data = await asyncio.gather(
+            _safe(MALService.search_anime_async(client, query), {"data": []}),
+            _safe(TMDBService.search_media_async(client, query), {"results": []}),
+            _safe(asyncio.to_thread(DatabaseService.get_anime_by_name, query), []),
+        )
+
+        tmdb_items = tmdb_data.get("results", [])[: cls.RESULTS_PER_SOURCE]
+        tmdb_details = await asyncio.gather(
+            *(
+                _safe(
+                    TMDBService.get_media_detail_async(
+                        client, item["id"], item.get("media_type", "Unknown")
+                    ),
+                    {},
+                )
+                for item in tmdb_items
+            )
+        )
+
+        return cls.combine_results(mal_data, tmdb_items, tmdb_details, localdb_data)
+
+    @classmethod
+    def combine_results(
+        cls,
+        mal_data: Dict,
+        tmdb_items: List[Dict],
+        tmdb_details: List[Dict],
+        localdb_data: List[Dict],
+    ) -> List[Dict]:
+        """Normalize results from all sources into one list."""
+        safe_fetch = cls._safe_fetch
+        combined_data = []
+
         # Process MAL data
-        for item in mal_data.get("data", [])[:4]:
+        for item in mal_data.get("data", [])[: cls.RESULTS_PER_SOURCE]:
             alternatives = " | ".join(
                 [
                     safe_fetch(item, ["node", "alternative_titles", "en"]),
@@ -368,15 +772,10 @@ class SearchService(BaseService):
             )
 
         # Process TMDB data
-        for item in tmdb_data.get("results", [])[:4]:
+        for item, details in zip(tmdb_items, tmdb_details):
             item_id = item["id"]
             media_type = item.get("media_type", "Unknown")
 
-            try:
-                details = TMDBService.get_media_detail(item_id, media_type)
-            except Exception:
-                details = {}
-
             relevant_countries = ["JP", "US", "UA", "UK"]
             source_array = safe_fetch(
                 details, ["alternative_titles", "results"]
@@ -410,7 +809,7 @@ class SearchService(BaseService):
             )
 
         # Process localdb data
-        for item in localdb_data[:4]:
+        for item in localdb_data[: cls.RESULTS_PER_SOURCE]:
             combined_data.append(
                 {
                     "source": "localdb",
@@ -433,6 +832,8 @@ class SearchService(BaseService):
 class TorrentService(BaseService):
     """Service for handling torrent-related operations."""
 
+    UPSTREAM = "torrent_client"
+
     @classmethod
     def get_releases_torrent_status(cls) -> Dict:
         """Get status of all torrent releases."""
@@ -440,10 +841,27 @@ class TorrentService(BaseService):
         category = config.app_config[config.application_config.client]["category"]
         tags = config.app_config[config.application_config.client]["tag"]
 
-        return config.client.get_torrent_info(
-            status_filter="all",
-            category=category,
-            tags=tags,
-            sort="added_on",
-            reverse=True,
-        )
+        with track_upstream(cls.UPSTREAM, "torrent_info"):
+            return config.client.get_torrent_info(
+                status_filter="all",
+                category=category,
+                tags=tags,
+                sort="added_on",
+                reverse=True,
+            )
+
+    @classmethod
+    def get_torrent_status_by_hash(cls) -> Dict[str, Dict]:
+        """Get state/progress/name of all release torrents keyed by hash."""
+        torrents_data = cls.get_releases_torrent_status()
+
+        torrents_dict = {}
+        if hasattr(torrents_data, "data") and torrents_data.data:
+            for torrent in torrents_data.data:
+                if isinstance(torrent, dict) and torrent.get("hash"):
+                    torrents_dict[torrent["hash"]] = {
+                        "state": torrent.get("state"),
+                        "progress": torrent.get("progress"),
+                        "name": torrent.get("name"),
+                    }
+        return torrents_dict
@@ -1,11 +1,17 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import sessionmaker, joinedload
-from sqlalchemy import create_engine, or_, select
+from sqlalchemy import create_engine, or_, select, text
 from sqlalchemy.ext.automap import automap_base
 import requests
 import os
+import threading
 
 from app.services.base_service import BaseService
+from app.services.franchise_graph import FranchiseGraph
+from app.services.studio_view import StudioView
+from app.utils.errors import WarmingUpError
+from app.utils.http_cache import file_version
+from app.utils.ttl_cache import TTLCache
 
 
 class DatabaseService(BaseService):
@@ -22,12 +28,46 @@ class DatabaseService(BaseService):
     AnimeFundub = None
     Episode = None
     Session = None
+    engine = None
+
+    DATABASE_PATH = "data/anime_data.db"
+    DATABASE_URL = (
+        "https://github.com/maksii/Stream2MediaServer/raw/main/data/anime_data.db"
+    )
+    DOWNLOAD_TIMEOUT = 30
+
+    # Aggregated anime details keyed by (anime ID, catalogue version);
+    # ANIME_FULL_CACHE_TTL=0 disables the cache
+    FULL_CACHE_TTL = float(os.environ.get("ANIME_FULL_CACHE_TTL", 300))
+    FULL_CACHE = TTLCache("anime_full", ttl=FULL_CACHE_TTL, max_entries=512)
+
+    _init_lock = threading.RLock()
+    # Catalogue version the engine was opened on (see _reopen_if_replaced)
+    _engine_version: Optional[str] = None
+
+    # Relation graph and studio summaries, built together on first use
+    # after the catalogue is opened (see _current_views)
+    _views: Optional[Tuple[FranchiseGraph, StudioView]] = None
+    _views_lock = threading.Lock()
 
     @classmethod
-    def initialize_database(cls) -> None:
-        """Initialize database connection and map models."""
-        engine = create_engine("sqlite:///data/anime_data.db")
-        cls.Session = sessionmaker(bind=engine)
+    def data_version(cls) -> str:
+        """Version of the anime catalogue, changes when the file is replaced."""
+        return file_version(cls.DATABASE_PATH)
+
+    @classmethod
+    def initialize_database(cls) -> bool:
+        """Initialize database connection and map models.
+
+        Returns:
+            False if the catalogue file has not been downloaded yet
+        """
+        if not os.path.exists(cls.DATABASE_PATH):
+            return False
+        # Read before the first connection: a file replaced meanwhile makes
+        # the version stale and the catalogue is reopened once more
+        version = cls.data_version()
+        engine = create_engine(f"sqlite:///{cls.DATABASE_PATH}")
 
         # Reflect the existing database into a new model
         Base = automap_base()
@@ -44,10 +84,157 @@ class DatabaseService(BaseService):
         cls.AnimeFundub = Base.classes.anime_fundub
         cls.Episode = Base.classes.episode
 
+        # Published last: a non-None Session means the models are mapped
+        previous_engine = cls.engine
+        cls.engine = engine
+        cls._engine_version = version
+        cls.Session = sessionmaker(bind=engine)
+        if previous_engine is not None and previous_engine is not engine:
+            # Pooled connections of the old engine still read the old file
+            previous_engine.dispose()
+        # Views of the previous file are rebuilt on first use
+        cls._views = None
+        return True
+
+    @classmethod
+    def _reopen_if_replaced(cls) -> None:
+        """Reopen the catalogue if the file changed since it was opened.
+
+        update_database (possibly in another process) replaces the file with
+        os.replace; pooled SQLite connections keep reading the old, unlinked
+        file, so the engine is disposed and the database mapped again, which
+        also drops the views.
+        """
+        if cls.Session is None or cls._engine_version == cls.data_version():
+            return
+        with cls._init_lock:
+            if cls._engine_version != cls.data_version():
+                cls.initialize_database()
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Whether the catalogue is downloaded and mapped."""
+        return cls.Session is not None
+
+    @classmethod
+    def _session(cls):
+        """Open a catalogue session, mapping the database once it appears.
+
+        Raises:
+            WarmingUpError: If the catalogue is still being downloaded
+        """
+        if cls.Session is None:
+            # The file may have been downloaded by another process (e.g. the
+            # Gunicorn master) since this one started
+            with cls._init_lock:
+                if cls.Session is None and not cls.initialize_database():
+                    raise WarmingUpError(
+                        "The anime catalogue is still being downloaded"
+                    )
+        else:
+            cls._reopen_if_replaced()
+        return cls.Session()
+
+    @classmethod
+    def ping(cls) -> None:
+        """Run a trivial query against the catalogue (health probe).
+
+        Raises:
+            WarmingUpError: If the catalogue is still being downloaded
+        """
+        session = cls._session()
+        try:
+            session.execute(text("SELECT 1"))
+        finally:
+            session.close()
+
+    @classmethod
+    def build_views(cls) -> Tuple[FranchiseGraph, StudioView]:
+        """Load the relation graph and studio summaries from the catalogue.
+
+        Five whole-table queries; later lookups are served from memory.
+        The views carry the version of the catalogue they were read from.
+        """
+        session = cls._session()
+        version = cls._engine_version
+        try:
+            animes = (
+                session.query(cls.Anime)
+                .options(
+                    joinedload(cls.Anime.type).load_only(cls.Type.name),
+                    joinedload(cls.Anime.status).load_only(cls.Status.name),
+                    joinedload(cls.Anime.franchise),
+                )
+                .all()
+            )
+            edges = session.query(
+                cls.RelatedAnime.anime_id1,
+                cls.RelatedAnime.anime_id2,
+                cls.RelatedAnime.franchise_id,
+            ).all()
+            graph = FranchiseGraph(
+                {anime.id: cls.serialize(anime) for anime in animes}, edges, version
+            )
+            studio_view = StudioView(
+                cls.serialize(session.query(cls.Fundub).all()),
+                session.query(cls.FundubSynonym.fundub_id, cls.FundubSynonym.synonym),
+                session.query(cls.AnimeFundub.anime_id, cls.AnimeFundub.fundub_id),
+                graph,
+                version,
+            )
+        finally:
+            session.close()
+        cls._views = (graph, studio_view)
+        return cls._views
+
+    @classmethod
+    def _current_views(cls) -> Tuple[FranchiseGraph, StudioView]:
+        """Return the views, building them on first use or if the catalogue changed.
+
+        The catalogue may have been replaced by another process; its version
+        (file inode, mtime and size) is checked on every call and a replaced
+        file is reopened before the views are rebuilt from it.
+
+        Raises:
+            WarmingUpError: If the catalogue is still being downloaded
+        """
+        views = cls._views
+        if views is None or views[0].version != cls.data_version():
+            with cls._views_lock:
+                # Reopening a replaced catalogue drops the views
+                cls._reopen_if_replaced()
+                views = cls._views
+                if views is None or views[0].version != cls.data_version():
+                    views = cls.build_views()
+        return views
+
+    @classmethod
+    def get_graph(cls) -> FranchiseGraph:
+        """Return the relation graph of the current catalogue."""
+        return cls._current_views()[0]
+
+    @classmethod
+    def get_studio_view(cls) -> StudioView:
+        """Return the studio summaries of the current catalogue."""
+        return cls._current_views()[1]
+
+    @classmethod
+    def get_franchise(cls, anime_id: int) -> Optional[List[Dict]]:
+        """Get every anime of an anime's franchise, transitively.
+
+        Follows relations in any number of hops; ordered by season, then
+        release date.
+
+        Returns:
+            The franchise including the anime itself, or None if the anime
+            does not exist
+        """
+        return cls.get_graph().franchise(anime_id)
+
     @classmethod
     def get_anime_by_id(cls, anime_id: int) -> Dict:
         """Get anime by ID with related data."""
-        session = cls.Session()
+        session = cls._session()
         try:
             stmt = (
                 select(cls.Anime)
@@ -66,7 +253,7 @@ class DatabaseService(BaseService):
     @classmethod
     def get_anime_by_name(cls, partial_name: str) -> List[Dict]:
         """Search anime by partial name match."""
-        session = cls.Session()
+        session = cls._session()
         try:
             animes = (
                 session.query(cls.Anime)
@@ -85,37 +272,17 @@ class DatabaseService(BaseService):
     @classmethod
     def get_related_animes(cls, anime_id: int) -> List[Dict]:
         """Get related animes for a given anime ID."""
-        session = cls.Session()
-        try:
-            related_animes = (
-                session.query(cls.Anime)
-                .join(cls.RelatedAnime, cls.Anime.id == cls.RelatedAnime.anime_id2)
-                .filter(cls.RelatedAnime.anime_id1 == anime_id)
-                .options(
-                    joinedload(cls.Anime.type).load_only(cls.Type.name),
-                    joinedload(cls.Anime.status).load_only(cls.Status.name),
-                    joinedload(cls.Anime.franchise),
-                )
-                .all()
-            )
-            return cls.serialize(related_animes)
-        finally:
-            session.close()
+        return cls.get_graph().related(anime_id)
 
     @classmethod
     def list_all_studios(cls) -> List[Dict]:
-        """Get all studios."""
-        session = cls.Session()
-        try:
-            studios = session.query(cls.Fundub).all()
-            return cls.serialize(studios)
-        finally:
-            session.close()
+        """Get all studios with their catalogue summaries."""
+        return cls.get_studio_view().summaries()
 
     @classmethod
     def list_all_anime(cls) -> List[Dict]:
         """Get all anime with related data."""
-        session = cls.Session()
+        session = cls._session()
         try:
             animes = (
                 session.query(cls.Anime)
@@ -132,43 +299,18 @@ class DatabaseService(BaseService):
 
     @classmethod
     def search_studio_by_name(cls, partial_name: str) -> List[Dict]:
-        """Search studios by partial name match."""
-        session = cls.Session()
-        try:
-            synonym_subquery = (
-                session.query(cls.FundubSynonym.fundub_id)
-                .filter(cls.FundubSynonym.synonym.ilike(f"%{partial_name}%"))
-                .subquery()
-            )
-
-            studios = (
-                session.query(cls.Fundub)
-                .filter(
-                    or_(
-                        cls.Fundub.name.ilike(f"%{partial_name}%"),
-                        cls.Fundub.id.in_(synonym_subquery),
-                    )
-                )
-                .all()
-            )
-            return cls.serialize(studios)
-        finally:
-            session.close()
+        """Search studios by partial name or synonym match."""
+        return cls.get_studio_view().search(partial_name)
 
     @classmethod
     def search_studio_by_id(cls, studio_id: int) -> Optional[Dict]:
         """Get studio by ID."""
-        session = cls.Session()
-        try:
-            studio = session.get(cls.Fundub, studio_id)
-            return cls.serialize(studio) if studio else None
-        finally:
-            session.close()
+        return cls.get_studio_view().summary(studio_id)
 
     @classmethod
     def get_studios_by_anime_id(cls, anime_id: int) -> List[Dict]:
         """Get all studios for a given anime ID."""
-        session = cls.Session()
+        session = cls._session()
         try:
             studios = (
                 session.query(cls.Fundub)
@@ -184,42 +326,96 @@ class DatabaseService(BaseService):
     @classmethod
     def get_anime_by_studio_id(cls, studio_id: int) -> List[Dict]:
         """Get all anime for a given studio ID."""
-        session = cls.Session()
-        try:
-            animes = (
-                session.query(cls.Anime)
-                .join(cls.AnimeFundub, cls.Anime.id == cls.AnimeFundub.anime_id)
-                .filter(cls.AnimeFundub.fundub_id == studio_id)
-                .distinct()
-                .all()
-            )
-            return cls.serialize(animes)
-        finally:
-            session.close()
+        return cls.get_studio_view().titles(studio_id)
 
     @classmethod
     def get_episodes_by_anime_id(cls, anime_id: int) -> List[Dict]:
         """Get all episodes for a given anime ID."""
-        session = cls.Session()
+        session = cls._session()
         try:
             episodes = session.query(cls.Episode).filter_by(anime_id=anime_id).all()
             return cls.serialize(episodes)
         finally:
             session.close()
 
+    @classmethod
+    def get_anime_full(cls, anime_id: int) -> Optional[Dict]:
+        """Get an anime with its related titles, studios and episodes.
+
+        Serves the anime detail page in one call: the anime and its related
+        titles come from the relation graph, studios and episodes from two
+        queries in one session. Results are cached per anime ID and
+        catalogue version for FULL_CACHE_TTL seconds.
+
+        Args:
+            anime_id: Anime ID
+
+        Returns:
+            ``{"anime", "related", "studios", "episodes"}`` in the formats
+            of get_anime_by_id, get_related_animes, get_studios_by_anime_id
+            and get_episodes_by_anime_id, or None if the anime does not exist
+        """
+        if cls.FULL_CACHE_TTL <= 0:
+            return cls._load_anime_full(anime_id)
+        # Keyed by the version the data is read from, not the file's current
+        # version, so a result is never filed under a newer catalogue
+        return cls.FULL_CACHE.get_or_load(
+            (anime_id, cls.get_graph().version),
+            lambda: cls._load_anime_full(anime_id),
+            should_cache=lambda result: result is not None,
+        )
+
+    @classmethod
+    def _load_anime_full(cls, anime_id: int) -> Optional[Dict]:
+        graph = cls.get_graph()
+        anime = graph.anime(anime_id)
+        if anime is None:
+            return None
+
+        session = cls._session()
+        try:
+            studios = (
+                session.query(cls.Fundub)
+                .join(cls.AnimeFundub, cls.Fundub.id == cls.AnimeFundub.fundub_id)
+                .filter(cls.AnimeFundub.anime_id == anime_id)
+                .distinct()
+                .all()
+            )
+            episodes = session.query(cls.Episode).filter_by(anime_id=anime_id).all()
+
+            return {
+                "anime": anime,
+                "related": graph.related(anime_id),
+                "studios": cls.serialize(studios),
+                "episodes": cls.serialize(episodes),
+            }
+        finally:
+            session.close()
+
     @classmethod
     def update_database(cls) -> Dict[str, str]:
-        """Update the local database from GitHub."""
-        url = "https://github.com/maksii/Stream2MediaServer/raw/main/data/anime_data.db"
-        local_db_path = "data/anime_data.db"
+        """Update the local database from GitHub and reopen it.
+
+        The download goes to a temporary file that replaces the catalogue
+        only once complete, so readers never see a partial file. This
+        process then reopens the catalogue and rebuilds its views; other
+        processes do so on their next query (see _reopen_if_replaced).
+        """
+        local_db_path = cls.DATABASE_PATH
+        partial_path = f"{local_db_path}.part"
 
         try:
             os.makedirs(os.path.dirname(local_db_path), exist_ok=True)
-            response = requests.get(url)
-            response.raise_for_status()
-
-            with open(local_db_path, "wb") as f:
-                f.write(response.content)
+            with requests.get(
+                cls.DATABASE_URL, stream=True, timeout=cls.DOWNLOAD_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                with open(partial_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+            os.replace(partial_path, local_db_path)
+            with cls._init_lock:
+                cls.initialize_database()
 
             return {
                 "status": "success",
@@ -232,6 +428,9 @@ class DatabaseService(BaseService):
             }
         except Exception as e:
             return {"status": "error", "message": f"An error occurred: {str(e)}"}
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
 
 # Initialize database on module import
@@ -0,0 +1,96 @@
+"""In-memory per-studio summary of the anime catalogue."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.franchise_graph import FranchiseGraph
+
+# Catalogue status id of titles still airing (as in SearchService)
+ONGOING_STATUS_ID = 2
+
+
+class StudioView:
+    """Materialized studio summaries, built once from the whole catalogue.
+
+    Each summary holds the studio columns plus ``synonyms``,
+    ``title_count``, ``ongoing_count`` and ``latest_release`` (the newest
+    release date of its titles). Titles are the anime dicts of the
+    relation graph. Entries are shared between lookups and must not be
+    modified by callers.
+
+    Args:
+        studios: Serialized fundub rows
+        synonyms: (fundub_id, synonym) rows of fundub_synonym
+        links: (anime_id, fundub_id) rows of anime_fundub
+        graph: Relation graph providing the anime dicts
+        version: Catalogue version the view was built from
+    """
+
+    def __init__(
+        self,
+        studios: Iterable[Dict],
+        synonyms: Iterable[Tuple[int, str]],
+        links: Iterable[Tuple[int, int]],
+        graph: FranchiseGraph,
+        version: str,
+    ):
+        self.version = version
+
+        synonyms_by_studio: Dict[int, List[str]] = {}
+        for studio_id, synonym in synonyms:
+            if synonym:
+                synonyms_by_studio.setdefault(studio_id, []).append(synonym)
+
+        anime_ids: Dict[int, set] = {}
+        for anime_id, studio_id in links:
+            anime_ids.setdefault(studio_id, set()).add(anime_id)
+
+        self._summaries: Dict[int, Dict] = {}
+        self._titles: Dict[int, List[Dict]] = {}
+        # Lower-cased name and synonyms per studio, for search
+        self._search_terms: Dict[int, Tuple[str, ...]] = {}
+        for studio in sorted(studios, key=lambda row: row["id"]):
+            studio_id = studio["id"]
+            titles = [
+                anime
+                for anime in map(graph.anime, sorted(anime_ids.get(studio_id, ())))
+                if anime is not None
+            ]
+            release_dates = [a["releaseDate"] for a in titles if a.get("releaseDate")]
+            studio_synonyms = synonyms_by_studio.get(studio_id, [])
+            self._summaries[studio_id] = {
+                **studio,
+                "synonyms": studio_synonyms,
+                "title_count": len(titles),
+                "ongoing_count": sum(
+                    1 for anime in titles if anime.get("status_id") == ONGOING_STATUS_ID
+                ),
+                "latest_release": max(release_dates, default=None),
+            }
+            self._titles[studio_id] = titles
+            self._search_terms[studio_id] = tuple(
+                term.casefold() for term in [studio.get("name") or "", *studio_synonyms]
+            )
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def summaries(self) -> List[Dict]:
+        """All studio summaries, by ID."""
+        return list(self._summaries.values())
+
+    def summary(self, studio_id: int) -> Optional[Dict]:
+        """Summary of one studio, or None."""
+        return self._summaries.get(studio_id)
+
+    def search(self, partial_name: str) -> List[Dict]:
+        """Studios whose name or a synonym contains partial_name (any case)."""
+        needle = partial_name.casefold()
+        return [
+            self._summaries[studio_id]
+            for studio_id, terms in self._search_terms.items()
+            if any(needle in term for term in terms)
+        ]
+
+    def titles(self, studio_id: int) -> List[Dict]:
+        """Anime of a studio, by ID."""
+        return list(self._titles.get(studio_id, ()))
@@ -1,32 +1,83 @@
 """TMDB (The Movie Database) API service."""
 
-from typing import Dict
-import requests
+import os
+from typing import Any, Dict, Optional
 
 from app.services.base_service import BaseService
 
 
 class TMDBService(BaseService):
-    """Service for interacting with The Movie Database (TMDB) API."""
+    """Service for interacting with The Movie Database (TMDB) API.
 
-    API_BASE_URL = "https://api.themoviedb.org/3"
+    Each call has a blocking variant using ``requests`` and, where used by
+    the async serving path, an ``*_async`` variant taking an
+    ``httpx.AsyncClient``; both share the request building in the
+    ``_*_request`` helpers.
+    """
+
+    API_BASE_URL = os.environ.get("TMDB_API_BASE_URL", "https://api.themoviedb.org/3")
+    UPSTREAM = "tmdb"
+    KEY_MISSING_ERROR = {"error": "TMDB API key not found"}
 
     @classmethod
-    def search_media(cls, query: str, language: str = "uk-UK") -> Dict:
-        """Search for media (movies, TV shows, etc.) using TMDB API."""
+    def _search_media_request(
+        cls, query: str, language: str = "uk-UK"
+    ) -> Optional[Dict[str, Any]]:
+        """Build request arguments for a multi search, None without API key."""
         api_key = cls.get_api_key("tmdb_api")
         if not api_key:
-            return {"error": "TMDB API key not found"}
-
-        url = f"{cls.API_BASE_URL}/search/multi"
-        params = {
-            "api_key": api_key,
-            "query": query,
-            "include_adult": True,
-            "language": language,
+            return None
+
+        return {
+            "url": f"{cls.API_BASE_URL}/search/multi",
+            "params": {
+                "api_key": api_key,
+                "query": query,
+                "include_adult": True,
+                "language": language,
+            },
         }
 
-        response = requests.get(url, params=params, timeout=30)
+    @classmethod
+    def _media_detail_request(
+        cls, media_id: int, media_type: str = "tv", language: str = "uk-UK"
+    ) -> Optional[Dict[str, Any]]:
+        """Build request arguments for media details, None without API key."""
+        api_key = cls.get_api_key("tmdb_api")
+        if not api_key:
+            return None
+
+        return {
+            "url": f"{cls.API_BASE_URL}/{media_type}/{media_id}",
+            "params": {
+                "api_key": api_key,
+                "append_to_response": "external_ids,images,alternative_titles",
+                "language": language,
+            },
+        }
+
+    @classmethod
+    def _trending_request(
+        cls, media_type: str = "tv", language: str = "uk-UK"
+    ) -> Optional[Dict[str, Any]]:
+        """Build request arguments for trending content, None without API key."""
+        api_key = cls.get_api_key("tmdb_api")
+        if not api_key:
+            return None
+
+        return {
+            "url": f"{cls.API_BASE_URL}/trending/{media_type}/day",
+            "params": {"api_key": api_key, "language": language},
+        }
+
+    @classmethod
+    def search_media(cls, query: str, language: str = "uk-UK") -> Dict:
+        """Search for media (movies, TV shows, etc.) using TMDB API."""
+        request_args = cls._search_media_request(query, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = cls.http_get("/search/multi", request_args)
         return cls.handle_api_response(response, "TMDB API Error")
 
     @classmethod
@@ -34,18 +85,11 @@ class TMDBService(BaseService):
         cls, media_id: int, media_type: str = "tv", language: str = "uk-UK"
     ) -> Dict:
         """Get detailed information about a specific media item."""
-        api_key = cls.get_api_key("tmdb_api")
-        if not api_key:
-            return {"error": "TMDB API key not found"}
-
-        url = f"{cls.API_BASE_URL}/{media_type}/{media_id}"
-        params = {
-            "api_key": api_key,
-            "append_to_response": "external_ids,images,alternative_titles",
-            "language": language,
-        }
+        request_args = cls._media_detail_request(media_id, media_type, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
 
-        response = requests.get(url, params=params, timeout=30)
+        response = cls.http_get("/{type}/{id}", request_args)
         return cls.handle_api_response(response, "TMDB API Error")
 
     @classmethod
@@ -53,12 +97,13 @@ class TMDBService(BaseService):
         """Find TMDB content using external IDs (IMDB, TVDB)."""
         api_key = cls.get_api_key("tmdb_api")
         if not api_key:
-            return {"error": "TMDB API key not found"}
+            return dict(cls.KEY_MISSING_ERROR)
 
-        url = f"{cls.API_BASE_URL}/find/{external_id}"
-        params = {"api_key": api_key, "external_source": source}
-
-        response = requests.get(url, params=params, timeout=30)
+        request_args = {
+            "url": f"{cls.API_BASE_URL}/find/{external_id}",
+            "params": {"api_key": api_key, "external_source": source},
+        }
+        response = cls.http_get("/find/{id}", request_args)
         return cls.handle_api_response(response, "TMDB API Error")
 
     @classmethod
@@ -66,12 +111,47 @@ class TMDBService(BaseService):
         cls, media_type: str = "tv", language: str = "uk-UK"
     ) -> Dict:
         """Get trending content by media type."""
-        api_key = cls.get_api_key("tmdb_api")
-        if not api_key:
-            return {"error": "TMDB API key not found"}
+        request_args = cls._trending_request(media_type, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = cls.http_get("/trending/{type}/day", request_args)
+        return cls.handle_api_response(response, "TMDB API Error")
+
+    @classmethod
+    async def search_media_async(
+        cls, client, query: str, language: str = "uk-UK"
+    ) -> Dict:
+        """Search for media without blocking the event loop."""
+        request_args = cls._search_media_request(query, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = await cls.http_get_async(client, "/search/multi", request_args)
+        return cls.handle_api_response(response, "TMDB API Error")
+
+    @classmethod
+    async def get_media_detail_async(
+        cls, client, media_id: int, media_type: str = "tv", language: str = "uk-UK"
+    ) -> Dict:
+        """Get media details without blocking the event loop."""
+        request_args = cls._media_detail_request(media_id, media_type, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
 
-        url = f"{cls.API_BASE_URL}/trending/{media_type}/day"
-        params = {"api_key": api_key, "language": language}
+        response = await cls.http_get_async(client, "/{type}/{id}", request_args)
+        return cls.handle_api_response(response, "TMDB API Error")
 
-        response = requests.get(url, params=params, timeout=30)
+    @classmethod
+    async def get_trending_by_type_async(
+        cls, client, media_type: str = "tv", language: str = "uk-UK"
+    ) -> Dict:
+        """Get trending content without blocking the event loop."""
+        request_args = cls._trending_request(media_type, language)
+        if request_args is None:
+            return dict(cls.KEY_MISSING_ERROR)
+
+        response = await cls.http_get_async(
+            client, "/trending/{type}/day", request_args
+        )
         return cls.handle_api_response(response, "TMDB API Error")
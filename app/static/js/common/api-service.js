@@ -100,6 +100,17 @@ export class ApiService {
         return this.fetch(url, options);
     }
 
+    static async patch(url, data) {
+        const options = {
+            method: 'PATCH',
+            body: JSON.stringify(data),
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        };
+        return this.fetch(url, options);
+    }
+
     static async delete(url, data) {
         const options = {
             method: 'DELETE',
@@ -110,4 +121,13 @@ export class ApiService {
         };
         return this.fetch(url, options);
     }
-} 
\ No newline at end of file
+
+    /**
+     * Run several API GETs/POSTs in one round trip via /api/batch.
+     * @param {Array<{id?: string, method?: string, path: string, body?: any}>} requests
+     * @returns {Promise<Array<{id: string, status: number, body: any}>>} results in request order
+     */
+    static async batch(requests) {
+        return this.post('/api/batch', { requests });
+    }
+}
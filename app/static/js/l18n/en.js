@@ -7,6 +7,9 @@ const translations = {
             id:'ID',
             name:'Name',
             telegram:'telegram',
+            title_count:'Titles',
+            ongoing_count:'Ongoing',
+            latest_release:'Latest Release',
         },
         anime:
         {
@@ -85,6 +88,8 @@ const translations = {
         releaseAddSubmit: 'Submit',
         releaseAddButton:'Add',
         releaseUpdateAllButton:'Update All',
+        releaseMarkOngoingButton:'Mark Shown Ongoing',
+        releaseMarkCompletedButton:'Mark Shown Completed',
         releaseEditButton:'Edit',
         releaseDeleteButton:'Delete',
         releaseUpdateButton:'Update',
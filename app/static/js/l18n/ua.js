@@ -7,6 +7,9 @@ const translations = {
             id:'ID',
             name:'Назва',
             telegram:'телеграм',
+            title_count:'Тайтли',
+            ongoing_count:'Онґоїнґи',
+            latest_release:'Останній реліз',
         },
         anime:
         {
@@ -85,6 +88,8 @@ const translations = {
         releaseAddSubmit: 'Подати',
         releaseAddButton:'Додати',
         releaseUpdateAllButton:'Оновити все',
+        releaseMarkOngoingButton:'Позначити показані як онгоїнг',
+        releaseMarkCompletedButton:'Позначити показані як завершені',
         releaseEditButton:'Редагувати',
         releaseDeleteButton:'Видалити',
         releaseUpdateButton:'Оновити',
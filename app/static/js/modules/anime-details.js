@@ -8,6 +8,8 @@ export default class AnimeDetails {
         this.relatedAnimeTable = null;
         this.studiosTable = null;
         this.animeId = null;
+        // Table rows fetched together with the details, used for the first draw
+        this.prefetched = { related: null, studios: null };
         this.elements = {
             title: document.querySelector('#animeTitle'),
             description: document.querySelector('#animeDescription'),
@@ -33,7 +35,12 @@ export default class AnimeDetails {
 
     async loadAnimeDetails() {
         try {
-            const data = await ApiService.get(`../api/anime/${this.animeId}`);
+            // Details and both tables from one aggregate call
+            const full = await ApiService.get(`/api/anime/${this.animeId}/full`);
+            this.prefetched.related = full ? full.related : null;
+            this.prefetched.studios = full ? full.studios : null;
+
+            const data = full ? full.anime : null;
             if (!data) {
                 throw new Error('No data received from API');
             }
@@ -98,9 +105,27 @@ export default class AnimeDetails {
         this.initializeStudiosTable();
     }
 
+    /**
+     * DataTables ajax function serving prefetched rows on the first draw and
+     * fetching url on reloads (or when nothing was prefetched).
+     */
+    prefetchedAjax(url, key) {
+        return (data, callback) => {
+            const rows = this.prefetched[key];
+            if (Array.isArray(rows)) {
+                this.prefetched[key] = null;
+                callback({ data: rows });
+                return;
+            }
+            ApiService.get(url)
+                .then((json) => callback({ data: Array.isArray(json) ? json : [] }))
+                .catch(() => callback({ data: [] }));
+        };
+    }
+
     initializeRelatedAnimeTable() {
         const config = {
-            ajax: `../api/anime/${this.animeId}/related`,
+            ajax: this.prefetchedAjax(`../api/anime/${this.animeId}/related`, 'related'),
             columns: [
                 DataTableFactory.createLinkColumn('id', translations.tableHeaders.anime.id, '/anime/'),
                 { data: 'titleUa', title: translations.tableHeaders.anime.titleUa, visible: true },
@@ -121,7 +146,7 @@ export default class AnimeDetails {
 
     initializeStudiosTable() {
         const config = {
-            ajax: `../api/anime/${this.animeId}/studios`,
+            ajax: this.prefetchedAjax(`../api/anime/${this.animeId}/studios`, 'studios'),
             columns: [
                 DataTableFactory.createLinkColumn('id', translations.tableHeaders.studioDetails.id, '/studios/'),
                 { data: 'name', title: translations.tableHeaders.studioDetails.name, visible: true },
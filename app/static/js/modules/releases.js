@@ -5,16 +5,83 @@ import { ApiService } from '../common/api-service.js';
 import { UiManager } from '../common/ui-manager.js';
 import { Utils, translations } from '../common/utils.js';
 
+// Table refresh interval while live events are unavailable
+const POLL_INTERVAL_MS = 15000;
+// Delay before asking for a live event stream again
+const STREAM_RETRY_MS = 60000;
+
 export default class Releases {
     constructor() {
         this.table = null;
         this.tableBody = null;
+        this.eventSource = null;
+        this.pollTimer = null;
     }
 
     init() {
         this.initializeDataTable();
         this.addEventListeners();
         this.setupTableCallbacks();
+        this.subscribeToEvents();
+        window.addEventListener('beforeunload', () => this.eventSource?.close());
+    }
+
+    subscribeToEvents() {
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+        this.eventSource = new EventSource('/api/releases/events', { withCredentials: true });
+
+        this.eventSource.addEventListener('open', () => this.stopPolling());
+
+        this.eventSource.addEventListener('error', () => {
+            // EventSource reconnects by itself after a dropped connection,
+            // but gives up when the server refuses the stream (e.g. 503 once
+            // the worker serves its maximum of streams)
+            if (this.eventSource.readyState === EventSource.CLOSED) {
+                this.startPolling();
+                setTimeout(() => this.subscribeToEvents(), STREAM_RETRY_MS);
+            }
+        });
+
+        this.eventSource.addEventListener('snapshot', (event) => {
+            this.updateTorrentInfo(JSON.parse(event.data));
+        });
+
+        this.eventSource.addEventListener('torrent', (event) => {
+            const { hash, ...info } = JSON.parse(event.data);
+            this.updateTorrentInfo({ [hash]: info });
+        });
+
+        this.eventSource.addEventListener('job', (event) => {
+            const job = JSON.parse(event.data);
+            if (job.status === 'finished' || job.status === 'failed') {
+                this.table.ajax.reload(null, false);
+            }
+        });
+    }
+
+    startPolling() {
+        if (!this.pollTimer) {
+            this.pollTimer = setInterval(() => this.table.ajax.reload(null, false), POLL_INTERVAL_MS);
+        }
+    }
+
+    stopPolling() {
+        clearInterval(this.pollTimer);
+        this.pollTimer = null;
+    }
+
+    updateTorrentInfo(torrents) {
+        this.table.rows().every(function () {
+            const row = this.data();
+            if (row && torrents[row.hash]) {
+                row.torrent_info = torrents[row.hash];
+                this.invalidate();
+            }
+        });
+        this.table.draw(false);
     }
 
     setupTableCallbacks() {
@@ -99,6 +166,18 @@ export default class Releases {
                 className: 'btn btn-primary',
                 titleAttr: translations.buttons.releaseUpdateAllButton,
                 action: (e, dt, node) => this.updateAllReleases(node)
+            },
+            {
+                text: translations.buttons.releaseMarkOngoingButton,
+                className: 'btn btn-outline-secondary',
+                titleAttr: translations.buttons.releaseMarkOngoingButton,
+                action: (e, dt, node) => this.setOngoingForShown(node, true)
+            },
+            {
+                text: translations.buttons.releaseMarkCompletedButton,
+                className: 'btn btn-outline-secondary',
+                titleAttr: translations.buttons.releaseMarkCompletedButton,
+                action: (e, dt, node) => this.setOngoingForShown(node, false)
             }
         ];
     }
@@ -291,6 +370,27 @@ export default class Releases {
         }
     }
 
+    /**
+     * Set the ongoing flag of every release matching the current search
+     * and filters with one bulk PATCH.
+     */
+    async setOngoingForShown(node, ongoing) {
+        const codenames = this.table.rows({ search: 'applied' }).data().toArray()
+            .map(row => row.codename);
+        if (codenames.length === 0) {
+            return;
+        }
+        try {
+            UiManager.setButtonLoading(node[0]);
+            await ApiService.patch('/api/releases', { codenames, changes: { ongoing } });
+            this.table.ajax.reload(null, false);
+        } catch (error) {
+            console.error('Error updating releases:', error);
+        } finally {
+            UiManager.resetButton(node[0]);
+        }
+    }
+
     async updateAllReleases(node) {
         try {
             UiManager.setButtonLoading(node[0], translations.buttons.releaseUpdateAllButton);
@@ -21,11 +21,14 @@ export default class Studios {
                 { 
                     data: 'telegram',
                     title: translations.tableHeaders.studioDetails.telegram,
-                    render: (data) => `<a href="${data}">${data}</a>`,
+                    render: (data) => data ? `<a href="${data}">${data}</a>` : '',
                     visible: true 
-                }
+                },
+                { data: 'title_count', title: translations.tableHeaders.studioDetails.title_count, visible: true },
+                { data: 'ongoing_count', title: translations.tableHeaders.studioDetails.ongoing_count, visible: true },
+                { data: 'latest_release', title: translations.tableHeaders.studioDetails.latest_release, defaultContent: '', visible: true }
             ],
-            order: [[2, 'asc']],
+            order: [[3, 'desc']],
             layout: {
                 topStart: DataTableFactory.returnDefaultLayout()
             }
@@ -1,7 +1,11 @@
 # app/utils/__init__.py
 """Utility modules for the Toloka2Web application."""
 
-from .auth_utils import multi_auth_required, multi_auth_admin_required
+from .auth_utils import (
+    multi_auth_required,
+    multi_auth_admin_required,
+    get_current_identity,
+)
 from .errors import (
     APIError,
     ValidationError,
@@ -11,6 +15,7 @@ from .errors import (
     ConflictError,
     InternalError,
     ServiceUnavailableError,
+    WarmingUpError,
     handle_errors,
     register_error_handlers,
 )
@@ -21,12 +26,17 @@ from .responses import (
     paginated_response,
     error_response,
 )
+from .http_cache import configure_http_cache, versioned
+from .lazy_import import import_profile, lazy_attr, lazy_module
 from .logging_config import configure_logging, get_logger
+from .metrics import configure_metrics, record_cache
+from .ttl_cache import TTLCache, backoff_delay
 
 __all__ = [
     # Auth
     "multi_auth_required",
     "multi_auth_admin_required",
+    "get_current_identity",
     # Errors
     "APIError",
     "ValidationError",
@@ -36,6 +46,7 @@ __all__ = [
     "ConflictError",
     "InternalError",
     "ServiceUnavailableError",
+    "WarmingUpError",
     "handle_errors",
     "register_error_handlers",
     # Responses
@@ -44,7 +55,19 @@ __all__ = [
     "no_content_response",
     "paginated_response",
     "error_response",
+    # HTTP caching
+    "configure_http_cache",
+    "versioned",
+    "TTLCache",
+    "backoff_delay",
     # Logging
     "configure_logging",
     "get_logger",
+    # Metrics
+    "configure_metrics",
+    "record_cache",
+    # Deferred imports
+    "lazy_module",
+    "lazy_attr",
+    "import_profile",
 ]
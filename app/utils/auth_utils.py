@@ -1,14 +1,20 @@
-"""Authentication utilities for multi-method auth support."""
+"""Authentication utilities for multi-method auth support.
+
+The caller's identity is resolved once per request by ``get_current_identity``
+and stored on ``flask.g``. The auth decorators and any handler that needs
+to know who is calling read from it, so the JWT is decoded and checked for
+revocation, the session user is loaded and the API key is compared at most
+once per request.
+"""
 
 import secrets
 from functools import wraps
+from typing import Dict, Optional
 
-from flask import jsonify, request, current_app
+from flask import g, jsonify, make_response, request, current_app
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from flask_login import current_user
 
-from app.models.revoked_token import RevokedToken
-
 
 def _is_valid_api_key(provided_key: str) -> bool:
     """Check if the provided API key is valid using constant-time comparison.
@@ -29,40 +35,79 @@ def _is_valid_api_key(provided_key: str) -> bool:
     return secrets.compare_digest(provided_key, expected_key)
 
 
-def multi_auth_required(fn):
-    """Decorator that allows multiple authentication methods.
+def _resolve_identity() -> Optional[Dict]:
+    """Resolve the identity of the current request.
 
     Checks in order:
-    1. JWT token (if valid and not revoked)
+    1. JWT token (if valid and not revoked; revocation is checked by the
+       JWT blocklist loader during verification)
     2. Session authentication (Flask-Login)
-    3. API key (X-API-Key header)
+    3. API key (X-API-Key header, always has admin privileges)
+
+    Returns:
+        Identity dictionary with auth_type, id, username and roles,
+        or None if the request is not authenticated
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+        jwt = get_jwt()
+        if jwt:
+            return {
+                "auth_type": "jwt",
+                "id": jwt.get("sub"),
+                "username": jwt.get("username"),
+                "roles": jwt.get("roles"),
+            }
+    except Exception:
+        pass  # JWT not present or invalid, continue to next auth method
+
+    if current_user and current_user.is_authenticated:
+        return {
+            "auth_type": "session",
+            "id": current_user.id,
+            "username": current_user.username,
+            "roles": current_user.roles,
+        }
+
+    api_key = request.headers.get("X-API-Key")
+    if api_key and _is_valid_api_key(api_key):
+        return {"auth_type": "api_key", "roles": "admin"}
+
+    return None
+
+
+def get_current_identity() -> Optional[Dict]:
+    """Get the identity of the current request, resolving it on first use.
+
+    Returns:
+        Identity dictionary (see ``_resolve_identity``) or None if the
+        request is not authenticated
+    """
+    # The app context (and so g) can outlive a single request, e.g. when
+    # tests push one context around several requests; tie the cached
+    # identity to the request object it was resolved for.
+    current_request = request._get_current_object()
+    if g.get("auth_identity_request") is not current_request:
+        g.auth_identity = _resolve_identity()
+        g.auth_identity_request = current_request
+    return g.auth_identity
+
+
+def multi_auth_required(fn):
+    """Decorator that allows multiple authentication methods.
 
-    Returns 401 if none of the methods succeed.
+    Accepts a JWT token, a session or an API key (see
+    ``get_current_identity``). Returns 401 if none of the methods succeed.
+
+    Error responses are Response objects rather than (body, status) tuples
+    so that Flask-RESTX resources can return them unchanged.
     """
 
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        # First, check for JWT token
-        try:
-            verify_jwt_in_request(optional=True)
-            jwt = get_jwt()
-            if jwt:
-                jti = jwt.get("jti")
-                if jti and not RevokedToken.is_token_revoked(jti):
-                    return fn(*args, **kwargs)
-        except Exception:
-            pass  # JWT not present or invalid, continue to next auth method
-
-        # Then check for session auth
-        if current_user and current_user.is_authenticated:
-            return fn(*args, **kwargs)
-
-        # Finally check for API key (using constant-time comparison)
-        api_key = request.headers.get("X-API-Key")
-        if api_key and _is_valid_api_key(api_key):
-            return fn(*args, **kwargs)
-
-        return jsonify({"error": "Authentication required"}), 401
+        if get_current_identity() is None:
+            return make_response(jsonify({"error": "Authentication required"}), 401)
+        return fn(*args, **kwargs)
 
     return wrapper
 
@@ -70,41 +115,19 @@ def multi_auth_required(fn):
 def multi_auth_admin_required(fn):
     """Decorator that requires admin privileges via multiple auth methods.
 
-    Checks in order:
-    1. JWT token with admin role
-    2. Session authentication with admin role
-    3. API key (always has admin privileges)
+    JWT and session identities need the admin role; the API key always
+    has admin privileges.
 
     Returns 401 if not authenticated, 403 if authenticated but not admin.
     """
 
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        # First, check for JWT token
-        try:
-            verify_jwt_in_request(optional=True)
-            jwt = get_jwt()
-            if jwt:
-                jti = jwt.get("jti")
-                if jti and not RevokedToken.is_token_revoked(jti):
-                    if jwt.get("roles") == "admin":
-                        return fn(*args, **kwargs)
-                    return jsonify({"error": "Admin privileges required"}), 403
-        except Exception:
-            pass  # JWT not present or invalid, continue to next auth method
-
-        # Then check for session auth
-        if current_user and current_user.is_authenticated:
-            if current_user.roles == "admin":
-                return fn(*args, **kwargs)
-            return jsonify({"error": "Admin privileges required"}), 403
-
-        # Finally check for API key (using constant-time comparison)
-        # API key always has admin privileges
-        api_key = request.headers.get("X-API-Key")
-        if api_key and _is_valid_api_key(api_key):
-            return fn(*args, **kwargs)
-
-        return jsonify({"error": "Authentication required"}), 401
+        identity = get_current_identity()
+        if identity is None:
+            return make_response(jsonify({"error": "Authentication required"}), 401)
+        if identity["roles"] != "admin":
+            return make_response(jsonify({"error": "Admin privileges required"}), 403)
+        return fn(*args, **kwargs)
 
     return wrapper
@@ -10,7 +10,7 @@ This module provides:
 from functools import wraps
 from typing import Any, Dict, Optional
 
-from flask import jsonify, current_app
+from flask import jsonify, make_response, current_app
 
 
 class APIError(Exception):
@@ -53,10 +53,10 @@ class APIError(Exception):
         """Convert error to Flask JSON response.
 
         Returns:
-            Tuple of (response, status_code)
+            JSON response with the error's status code
         """
         include_details = current_app.debug if current_app else False
-        return jsonify(error=self.to_dict(include_details)), self.status
+        return make_response(jsonify(error=self.to_dict(include_details)), self.status)
 
 
 class ValidationError(APIError):
@@ -128,6 +128,23 @@ class ServiceUnavailableError(APIError):
         )
 
 
+class WarmingUpError(ServiceUnavailableError):
+    """Error for data that is still being downloaded after a first start."""
+
+    RETRY_AFTER = 10
+
+    def __init__(
+        self, message: str = "Data is still loading", details: Optional[Any] = None
+    ):
+        super().__init__(message=message, details=details)
+        self.code = "WARMING_UP"
+
+    def to_response(self):
+        response = super().to_response()
+        response.headers["Retry-After"] = str(self.RETRY_AFTER)
+        return response
+
+
 def handle_errors(fn):
     """Decorator that catches exceptions and returns consistent error responses.
 
@@ -0,0 +1,85 @@
+"""Exclusive lock shared by the threads of a process and by other processes.
+
+Files under data/ (titles.ini in particular) are written by request
+handlers of every Gunicorn worker. A threading lock only orders the
+threads of one worker, so FileLock additionally holds an ``fcntl.flock``
+on a sidecar lock file for as long as any thread of the process holds
+the lock. Where fcntl is unavailable (Windows) it only locks threads.
+"""
+
+import os
+import threading
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class FileLock:
+    """Reentrant lock backed by a thread lock and a flock on path.
+
+    Args:
+        path: Lock file, created when first acquired
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[IO] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquire the lock.
+
+        Args:
+            blocking: Wait for other threads and processes; otherwise
+                return False at once if the lock is held
+
+        Returns:
+            Whether the lock was acquired
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        if self._depth == 0:
+            try:
+                self._lock_file(blocking)
+            except BlockingIOError:
+                self._lock.release()
+                return False
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def _lock_file(self, blocking: bool) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, "a")
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BaseException:
+                lock_file.close()
+                raise
+        self._file = lock_file
+
+    def release(self) -> None:
+        """Release one acquisition; the file lock goes with the last one."""
+        self._depth -= 1
+        if self._depth == 0:
+            lock_file, self._file = self._file, None
+            # Closing the file releases the flock
+            lock_file.close()
+        self._lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,205 @@
+"""HTTP response compression and conditional GET support.
+
+configure_http_cache() registers an after_request hook that, for
+successful GET/HEAD responses with a compressible mimetype:
+
+1. Adds a strong ETag computed from the payload unless the view already
+   set one (e.g. from a data version, see versioned()).
+2. Answers with 304 Not Modified when If-None-Match matches the ETag.
+3. Compresses bodies of at least COMPRESS_MIN_SIZE bytes with brotli (when
+   the optional ``brotli`` package is installed) or gzip, according to the
+   client's Accept-Encoding. Compressed representations get an ETag with a
+   ``-br``/``-gzip`` suffix, which is stripped again when matching.
+
+Views whose payload depends only on data with a cheap version (a file
+mtime, a CacheVersion counter) can use versioned() to answer 304 before
+doing any work.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from flask import Response, current_app, request
+
+from app.utils.metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+
+def compute_etag(*parts: Any) -> str:
+    """Compute a stable ETag value from JSON-serializable parts.
+
+    Args:
+        *parts: Values identifying the representation (versions, payloads)
+
+    Returns:
+        Hex digest usable as a strong ETag
+    """
+    data = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def file_version(path: str) -> str:
+    """Return a cheap version string for a file (inode, mtime and size).
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Version string, empty if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _matching_etag(etag: str) -> Optional[str]:
+    """Return the If-None-Match entry matching etag or a compressed variant."""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return etag
+    for suffix in ("", *ETAG_SUFFIXES.values()):
+        if if_none_match.contains_weak(etag + suffix):
+            return etag + suffix
+    return None
+
+
+def not_modified_response(etag: str) -> Optional[Response]:
+    """Build a 304 response if the client already has this representation.
+
+    Args:
+        etag: ETag of the current (uncompressed) representation
+
+    Returns:
+        304 response, or None if the client's copy is stale or absent
+    """
+    matched = _matching_etag(etag)
+    if request.if_none_match:
+        record_cache("http_conditional", hit=matched is not None)
+    if matched is None:
+        return None
+    response = Response(status=304)
+    response.set_etag(matched)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def versioned(version_func: Callable[[], Any]):
+    """Decorator answering 304 from a data version without running the view.
+
+    The ETag is derived from version_func() and the request path and query
+    string, so it changes whenever the underlying data or the request does.
+
+    Usage:
+        @versioned(DatabaseService.data_version)
+        def list_anime():
+            ...
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return fn(*args, **kwargs)
+
+            etag = compute_etag(version_func(), request.full_path)
+            cached = not_modified_response(etag)
+            if cached is not None:
+                return cached
+
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _choose_encoding() -> Optional[str]:
+    """Pick the best content coding the client accepts."""
+    accept = request.accept_encodings
+    candidates = []
+    if brotli is not None and accept.quality("br") > 0:
+        candidates.append((accept.quality("br"), 1, "br"))
+    if accept.quality("gzip") > 0:
+        candidates.append((accept.quality("gzip"), 0, "gzip"))
+    if not candidates:
+        return None
+    return max(candidates)[2]
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _finalize_response(response: Response) -> Response:
+    """Add ETag, answer If-None-Match and compress eligible responses."""
+    if (
+        request.method not in ("GET", "HEAD")
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+
+    etag, _ = response.get_etag()
+    if etag is None:
+        etag = hashlib.sha256(data).hexdigest()[:32]
+        response.set_etag(etag)
+
+        # Views that set their own ETag (versioned()) already checked it
+        cached = not_modified_response(etag)
+        if cached is not None:
+            return cached
+
+    if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag + ETAG_SUFFIXES[encoding])
+    return response
+
+
+def configure_http_cache(app) -> None:
+    """Register response compression and conditional GET handling.
+
+    Args:
+        app: Flask application instance
+    """
+    app.config.setdefault(
+        "COMPRESS_MIN_SIZE", int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    )
+    app.after_request(_finalize_response)
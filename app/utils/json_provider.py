@@ -0,0 +1,163 @@
+"""Fast JSON provider with typed encoders.
+
+Flask's ``jsonify``, ``app.json`` and the ASGI app all serialize through
+OrjsonProvider. It uses orjson when installed (stdlib ``json`` otherwise)
+and converts values neither library knows through a registry of encoders
+keyed by type:
+
+- datetimes, dates and times: ISO 8601 strings
+- enums: their value; sets and other iterables: lists
+- dataclasses: dicts of their fields
+- mappings and sequences that are not dict/list subclasses orjson accepts
+  (e.g. torrent client result containers): dicts and lists
+- any other object, such as the models returned by toloka2MediaServer and
+  stream2mediaserver: a dict of its public (non-underscore) attributes
+
+Additional types can be registered with register_encoder.
+"""
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+Encoder = Callable[[Any], Any]
+
+_ENCODERS: Dict[type, Encoder] = {}
+# Encoder resolved per concrete type (None: no registered encoder)
+_resolved: Dict[type, Optional[Encoder]] = {}
+
+
+def register_encoder(cls: type, encoder: Encoder) -> None:
+    """Serialize instances of cls (and subclasses) with encoder.
+
+    Args:
+        cls: Type to encode
+        encoder: Called with the object; returns a JSON-compatible value
+            (which may itself contain objects needing an encoder)
+    """
+    _ENCODERS[cls] = encoder
+    _resolved.clear()
+
+
+def _find_encoder(cls: type) -> Optional[Encoder]:
+    """Most specific registered encoder for cls, following its MRO."""
+    if cls not in _resolved:
+        _resolved[cls] = next(
+            (_ENCODERS[base] for base in cls.__mro__ if base in _ENCODERS), None
+        )
+    return _resolved[cls]
+
+
+def _encode_object(obj: Any) -> Dict[str, Any]:
+    """Public attributes of an arbitrary object."""
+    try:
+        attributes = vars(obj)
+    except TypeError:
+        slots = getattr(type(obj), "__slots__", ())
+        attributes = {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+    return {
+        name: value
+        for name, value in attributes.items()
+        if not name.startswith("_") and not callable(value)
+    }
+
+
+def default(obj: Any) -> Any:
+    """Convert obj to a value the JSON library can serialize.
+
+    Raises:
+        TypeError: If obj cannot be converted
+    """
+    encoder = _find_encoder(type(obj))
+    if encoder is not None:
+        return encoder(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {
+            field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)
+        }
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    if hasattr(obj, "__dict__") or hasattr(type(obj), "__slots__"):
+        return _encode_object(obj)
+    if hasattr(obj, "__iter__") and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+register_encoder(datetime.date, lambda value: value.isoformat())
+register_encoder(datetime.time, lambda value: value.isoformat())
+register_encoder(enum.Enum, lambda value: value.value)
+register_encoder(decimal.Decimal, str)
+register_encoder(uuid.UUID, str)
+register_encoder(bytes, lambda value: value.decode("utf-8", "replace"))
+register_encoder(set, list)
+register_encoder(frozenset, list)
+register_encoder(tuple, list)
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+    """Serialize obj to a JSON string (usable outside an app context).
+
+    Args:
+        obj: Value to serialize
+        sort_keys: Sort object keys
+        indent: Pretty-print with this indentation (orjson only supports 2)
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits or mixed key types with sort_keys;
+            # the stdlib encoder handles those (or raises a TypeError)
+            pass
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, indent=indent, ensure_ascii=False
+    )
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider serializing with orjson and the typed encoders.
+
+    Keeps DefaultJSONProvider's response handling (``sort_keys``,
+    pretty-printing in debug mode, mimetype); non-ASCII characters are
+    written as UTF-8 rather than escaped.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(
+            obj,
+            sort_keys=kwargs.get("sort_keys", self.sort_keys),
+            indent=kwargs.get("indent"),
+        )
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
@@ -0,0 +1,106 @@
+"""Deferred imports for heavy, rarely used dependencies.
+
+The streaming providers (stream2mediaserver), the torrent client and
+tracker libraries behind toloka2MediaServer and a few serialization
+helpers take a noticeable share of process start-up, yet many workers
+never touch them. lazy_module and lazy_attr stand in for a module or one
+of its attributes and import it on first use, so that cost moves from
+start-up to the first request that needs it.
+
+The first import of each deferred module is timed; import_profile()
+returns those timings (see also ``python -X importtime``).
+"""
+
+import importlib
+import threading
+import time
+import types
+from typing import Any, Dict
+
+_lock = threading.RLock()
+_load_times: Dict[str, float] = {}
+
+
+def _import(name: str) -> types.ModuleType:
+    """Import a module, recording how long its first import took."""
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _load_times.setdefault(name, time.perf_counter() - start)
+        return module
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy importing the real module on first attribute access.
+
+    Args:
+        name: Dotted name of the module to import
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = self.__dict__["_lazy_module"] = _import(self.__name__)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "deferred"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LazyAttr:
+    """Callable proxy for an attribute of a module that is imported on first use.
+
+    Calling the proxy calls the attribute; any other attribute access is
+    forwarded to it.
+
+    Args:
+        module: Dotted name of the module defining the attribute
+        attr: Attribute name
+    """
+
+    def __init__(self, module: str, attr: str):
+        self._module = module
+        self._attr = attr
+        self._target: Any = None
+
+    def resolve(self) -> Any:
+        """Import the module if needed and return the attribute."""
+        if self._target is None:
+            self._target = getattr(_import(self._module), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f"<lazy {self._module}.{self._attr}>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a proxy for module ``name`` that imports it on first use."""
+    return LazyModule(name)
+
+
+def lazy_attr(module: str, attr: str) -> LazyAttr:
+    """Return a proxy for ``module.attr`` that imports module on first use."""
+    return LazyAttr(module, attr)
+
+
+def import_profile() -> Dict[str, float]:
+    """Seconds taken by the first import of each deferred module so far."""
+    with _lock:
+        return dict(_load_times)
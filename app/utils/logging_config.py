@@ -1,49 +1,285 @@
 """Logging configuration for the application.
 
-This module provides structured logging setup that can be configured
-for different environments (development vs production).
+Records are not written by the thread that logs them. The root logger has
+a single QueueHandler that captures the request context (method, URL,
+client address), renders the message and enqueues the record; one
+QueueListener thread per process formats it and writes it to the output
+handlers. A slow stdout or log file therefore never blocks a request.
+
+Settings (app config keys, defaulting to environment variables of the
+same name):
+
+- ``LOG_FORMAT``: ``text`` (default) or ``json`` for one JSON object per line
+- ``LOG_FILE``: also write to this file (stdout only by default)
+- ``LOG_MAX_BYTES``: rotate LOG_FILE when it reaches this size
+- ``LOG_ROTATE_WHEN``: rotate LOG_FILE at this interval instead, e.g.
+  ``midnight`` or ``H`` (see TimedRotatingFileHandler)
+- ``LOG_BACKUP_COUNT``: rotated files kept (default 5)
+- ``LOG_SAMPLING``: keep only a fraction of DEBUG/INFO records of some
+  loggers, e.g. ``app.routes=0.1,urllib3=0``; warnings are always kept
+
+Handlers are installed once per process; calling configure_logging again
+with the same settings only adjusts the level.
+
+Several processes (Gunicorn workers forked from the preloading master)
+can append to one LOG_FILE, but not rotate it: each would rename the
+file from under the others and keep writing to the renamed one. When
+rotation is configured, a forked process therefore writes to its own
+file with its PID inserted before the extension (``app.log`` becomes
+``app.1234.log``) and rotates only that; the master keeps LOG_FILE.
+Files of workers that were replaced (restart, ``WEB_MAX_REQUESTS``) are
+left in place. Without rotation all processes share LOG_FILE.
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from flask import has_request_context, request
+
+REQUEST_FIELDS = ("method", "url", "remote_addr")
+
+# Per-process pipeline state, see _install
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_settings: Optional[Tuple] = None
+_pid: Optional[int] = None
+# Settings of the installed pipeline, for the file handler of forked children
+_file_settings: Dict = {}
 
 
 class RequestFormatter(logging.Formatter):
-    """Custom formatter that includes request context when available."""
+    """Text formatter for records carrying request context."""
+
+    def format(self, record):
+        for field in REQUEST_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, "-")
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter writing each record as one JSON object per line."""
 
     def format(self, record):
-        # Try to add request context if available
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for field in REQUEST_FIELDS:
+            value = getattr(record, field, "-")
+            if value != "-":
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records per logger name prefix.
+
+    Args:
+        rates: Logger name prefix -> fraction of records kept (0-1); the
+            longest matching prefix wins
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that prepares records in the logging thread.
+
+    Request context and the rendered message (including any traceback)
+    are captured before the record leaves the thread, since neither is
+    available to the listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if has_request_context():
+            record.method = request.method
+            record.url = request.url
+            record.remote_addr = request.remote_addr
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """Parse ``name=rate,name=rate`` into a rate per logger name."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
         try:
-            from flask import request, has_request_context
-
-            if has_request_context():
-                record.url = request.url
-                record.method = request.method
-                record.remote_addr = request.remote_addr
-            else:
-                record.url = "-"
-                record.method = "-"
-                record.remote_addr = "-"
-        except Exception:
-            record.url = "-"
-            record.method = "-"
-            record.remote_addr = "-"
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
 
-        return super().format(record)
+
+def _build_handlers(
+    formatter: logging.Formatter, settings: Dict
+) -> List[logging.Handler]:
+    """Create the output handlers the listener thread writes to."""
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+
+    if settings["LOG_FILE"]:
+        handlers.append(_file_handler(settings["LOG_FILE"], settings))
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _rotates(settings: Dict) -> bool:
+    return bool(settings["LOG_ROTATE_WHEN"]) or int(settings["LOG_MAX_BYTES"]) > 0
+
+
+def _file_handler(log_file: str, settings: Dict) -> logging.Handler:
+    """Create the (rotating) handler writing to log_file."""
+    os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+    backup_count = int(settings["LOG_BACKUP_COUNT"])
+    if settings["LOG_ROTATE_WHEN"]:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file,
+            when=settings["LOG_ROTATE_WHEN"],
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=int(settings["LOG_MAX_BYTES"]),
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+
+
+def process_log_file(log_file: str, pid: int) -> str:
+    """Path a forked process rotates instead of log_file (PID inserted)."""
+    root, ext = os.path.splitext(log_file)
+    return f"{root}.{pid}{ext}"
+
+
+def _install(formatter: logging.Formatter, settings: Dict) -> None:
+    """Replace the root handlers with the queue pipeline (under _lock)."""
+    global _listener, _queue_handler, _file_settings
+
+    shutdown_logging()
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_handler = ContextQueueHandler(log_queue)
+    rates = parse_sampling(settings["LOG_SAMPLING"])
+    if rates:
+        _queue_handler.addFilter(SamplingFilter(rates))
+    root_logger.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *_build_handlers(formatter, settings), respect_handler_level=True
+    )
+    _file_settings = dict(settings)
+    _listener.start()
+
+
+def _child_handlers(handlers: Tuple[logging.Handler, ...]) -> List[logging.Handler]:
+    """Swap an inherited rotating file handler for one on this process's file."""
+    if not _file_settings.get("LOG_FILE") or not _rotates(_file_settings):
+        return list(handlers)
+    result = []
+    for handler in handlers:
+        if isinstance(handler, logging.handlers.BaseRotatingHandler):
+            # The parent's stream is flushed after every record; closing
+            # the inherited copy writes nothing
+            handler.close()
+            child_handler = _file_handler(
+                process_log_file(_file_settings["LOG_FILE"], os.getpid()),
+                _file_settings,
+            )
+            child_handler.setFormatter(handler.formatter)
+            child_handler.setLevel(handler.level)
+            handler = child_handler
+        result.append(handler)
+    return result
+
+
+def _restart_in_child() -> None:
+    """Give a forked process its own queue, writer thread and rotated file.
+
+    The parent's listener thread does not exist after fork, and its queue
+    (and lock) may be in any state, so the child starts afresh.
+    """
+    global _listener, _pid
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(
+        log_queue, *_child_handlers(_listener.handlers), respect_handler_level=True
+    )
+    _listener.start()
+    _pid = os.getpid()
+
+
+def shutdown_logging() -> None:
+    """Stop the writer thread after it has written all queued records."""
+    global _listener
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_in_child)
 
 
 def configure_logging(app, level: Optional[str] = None):
     """Configure application logging.
 
     Sets up logging with appropriate format based on debug mode:
-    - Debug mode: Human-readable format with colors
-    - Production mode: Structured format suitable for log aggregation
+    - Debug mode: Human-readable format
+    - Production mode: Structured format suitable for log aggregation,
+      or JSON lines with LOG_FORMAT=json
 
     Args:
         app: Flask application instance
         level: Optional logging level override (DEBUG, INFO, WARNING, ERROR)
     """
+    global _settings, _pid
+
     # Determine log level
     if level:
         log_level = getattr(logging, level.upper(), logging.INFO)
@@ -52,20 +288,22 @@ def configure_logging(app, level: Optional[str] = None):
     else:
         log_level = logging.INFO
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-
-    # Remove existing handlers to avoid duplicates
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
+    defaults = {
+        "LOG_FORMAT": "text",
+        "LOG_FILE": "",
+        "LOG_MAX_BYTES": 0,
+        "LOG_ROTATE_WHEN": "",
+        "LOG_BACKUP_COUNT": 5,
+        "LOG_SAMPLING": "",
+    }
+    for key, default in defaults.items():
+        app.config.setdefault(key, os.environ.get(key, default))
+    settings = {key: app.config[key] for key in defaults}
 
     # Set format based on environment
-    if app.debug:
+    if str(settings["LOG_FORMAT"]).lower() == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    elif app.debug:
         # Human-readable format for development
         formatter = RequestFormatter(
             "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
@@ -77,8 +315,15 @@ def configure_logging(app, level: Optional[str] = None):
             "%(method)s %(url)s | %(remote_addr)s | %(message)s"
         )
 
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    # Install handlers once per process, or again when the settings changed
+    key = (type(formatter), formatter._fmt, tuple(sorted(settings.items())))
+    with _lock:
+        if _listener is None or _pid != os.getpid() or _settings != key:
+            _install(formatter, settings)
+            _settings = key
+            _pid = os.getpid()
+
+    logging.getLogger().setLevel(log_level)
 
     # Set Flask app logger
     app.logger.setLevel(log_level)
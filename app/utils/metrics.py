@@ -0,0 +1,672 @@
+"""In-process metrics with Prometheus text exposition.
+
+configure_metrics() records, for every request handled by the Flask app:
+
+- ``toloka2web_http_requests_total``: requests by blueprint, endpoint,
+  method and status
+- ``toloka2web_http_request_duration_seconds``: latency histogram by
+  blueprint, endpoint and method
+- ``toloka2web_http_response_size_bytes``: response size histogram
+- ``toloka2web_http_requests_in_flight``: requests currently being handled
+- ``toloka2web_db_queries_per_request``: SQL statements executed per request,
+  across all SQLAlchemy engines
+
+Caches report lookups with record_cache(), exported as
+``toloka2web_cache_requests_total`` with a ``result`` label of ``hit`` or
+``miss``.
+
+Calls to upstream services (MAL, TMDB, Toloka, the torrent client,
+streaming providers) are wrapped in track_upstream(), which records
+``toloka2web_upstream_requests_total`` (by status code, ``ok``,
+``timeout`` or ``error``), ``toloka2web_upstream_request_duration_seconds``,
+``toloka2web_upstream_response_size_bytes`` and
+``toloka2web_upstream_errors_total`` per upstream and endpoint template.
+upstream_summary() condenses them into JSON for the admin API.
+
+Endpoint labels are Flask endpoint names (e.g. ``anime_api.list_anime``),
+so the number of series stays bounded regardless of URL parameters.
+
+Metrics live in the memory of each process. When the registry has a
+directory (``METRICS_DIR``, or a temporary one created by the production
+server), every process writes a snapshot of its metrics there at most once
+per ``FLUSH_INTERVAL`` seconds and on exit, and a scrape adds up the
+snapshots of all processes: counters and histograms of workers that have
+exited are kept, their gauges are dropped.
+"""
+
+import atexit
+import bisect
+import copy
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import requests as requests_lib
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+# Seconds between two snapshots of the same process
+FLUSH_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for a named metric family with fixed label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self) -> None:
+        """Drop all recorded series."""
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> List[list]:
+        """Return the series as JSON-serializable [labels, value] pairs."""
+        with self._lock:
+            return [
+                [list(key), copy.deepcopy(value)] for key, value in self._values.items()
+            ]
+
+    def merge(self, series: List[list]) -> None:
+        """Add series from another process's snapshot to this metric."""
+        with self._lock:
+            for key, value in series:
+                key = tuple(key)
+                self._values[key] = self._merge_value(self._values.get(key), value)
+
+    def _merge_value(self, current, value):
+        return (current or 0) + value
+
+    def copy(self) -> "_Metric":
+        """Return an independent copy of the metric and its series."""
+        metric = copy.copy(self)
+        metric._lock = threading.Lock()
+        with self._lock:
+            metric._values = copy.deepcopy(self._values)
+        return metric
+
+    def render(self) -> List[str]:
+        """Render the metric family in Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key: LabelValues, value) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _merge_value(self, current, value):
+        if current is None:
+            return value
+        counts = [mine + theirs for mine, theirs in zip(current[0], value[0])]
+        return [counts, current[1] + value[1]]
+
+    def samples(self) -> Dict[LabelValues, Dict[str, float]]:
+        """Return count and sum per label set."""
+        with self._lock:
+            return {
+                key: {"count": sum(state[0]), "sum": state[1]}
+                for key, state in self._values.items()
+            }
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within buckets.
+
+        Uses the same approximation as Prometheus' histogram_quantile().
+
+        Args:
+            q: Quantile between 0 and 1
+            **labels: Label values of the series
+
+        Returns:
+            Estimated value, or None if nothing was observed
+        """
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            counts = list(state[0]) if state else None
+        if not counts or not sum(counts):
+            return None
+
+        rank = q * sum(counts)
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def _render_series(self, key: LabelValues, value) -> List[str]:
+        counts, total = value
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(names, key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together.
+
+    Attributes:
+        directory: Directory shared by all processes for metric snapshots,
+            None to report only this process
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self.directory: Optional[str] = None
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._pending: Optional[threading.Timer] = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> _Metric:
+        return self._metrics[name]
+
+    def set_directory(self, directory: Optional[str]) -> None:
+        """Share metrics between processes through a directory.
+
+        Called once before the workers are forked; snapshots of a previous
+        run are removed.
+
+        Args:
+            directory: Snapshot directory, None to stop sharing
+        """
+        self.directory = directory
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(directory, name))
+
+    def flush(self, force: bool = False) -> None:
+        """Write this process's snapshot, at most once per FLUSH_INTERVAL.
+
+        A call within FLUSH_INTERVAL of the last snapshot schedules one at
+        the end of the interval, so changes are never left unwritten.
+
+        Args:
+            force: Write even if the last snapshot is recent
+        """
+        if self.directory is None:
+            return
+        with self._flush_lock:
+            wait = self._last_flush + FLUSH_INTERVAL - time.monotonic()
+            if not force and wait > 0:
+                if self._pending is None:
+                    self._pending = threading.Timer(wait, self.flush, (True,))
+                    self._pending.daemon = True
+                    self._pending.start()
+                return
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending = None
+            self._last_flush = time.monotonic()
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        try:
+            snapshot = {
+                name: metric.snapshot() for name, metric in self._metrics.items()
+            }
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            temporary = f"{path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def collect(self) -> "MetricsRegistry":
+        """Return the metrics of all processes sharing the directory.
+
+        This process contributes its live values, the others their last
+        snapshot. Gauges of processes that have exited are left out.
+
+        Returns:
+            Registry holding this process's metrics when no directory is set,
+            otherwise a new registry with the summed series
+        """
+        if self.directory is None:
+            return self
+
+        collected = MetricsRegistry()
+        for metric in self._metrics.values():
+            collected.register(metric.copy())
+        try:
+            names = os.listdir(self.directory)
+        except OSError as e:
+            logger.warning(f"Could not read metrics snapshots: {e}")
+            names = []
+        for name in names:
+            pid, extension = os.path.splitext(name)
+            if extension != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _process_alive(int(pid))
+            for metric_name, series in snapshot.items():
+                metric = collected._metrics.get(metric_name)
+                if metric is None or (isinstance(metric, Gauge) and not alive):
+                    continue
+                metric.merge(series)
+        return collected
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def clear(self) -> None:
+        """Reset all metrics (used by tests)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines = []
+        for metric in self.collect()._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+def _reset_flush_in_child() -> None:
+    # The parent's flush timer does not exist in the child
+    registry._flush_lock = threading.Lock()
+    registry._pending = None
+    registry._last_flush = 0.0
+
+
+registry = MetricsRegistry()
+atexit.register(lambda: registry.flush(force=True))
+os.register_at_fork(after_in_child=_reset_flush_in_child)
+
+REQUESTS = registry.counter(
+    "toloka2web_http_requests_total",
+    "HTTP requests handled",
+    ("blueprint", "endpoint", "method", "status"),
+)
+REQUEST_DURATION = registry.histogram(
+    "toloka2web_http_request_duration_seconds",
+    "HTTP request latency in seconds",
+    ("blueprint", "endpoint", "method"),
+)
+RESPONSE_SIZE = registry.histogram(
+    "toloka2web_http_response_size_bytes",
+    "HTTP response body size in bytes",
+    ("blueprint", "endpoint"),
+    SIZE_BUCKETS,
+)
+IN_FLIGHT = registry.gauge(
+    "toloka2web_http_requests_in_flight", "HTTP requests currently being handled"
+)
+DB_QUERIES = registry.histogram(
+    "toloka2web_db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ("blueprint", "endpoint"),
+    QUERY_BUCKETS,
+)
+CACHE_REQUESTS = registry.counter(
+    "toloka2web_cache_requests_total",
+    "Cache lookups by cache and result",
+    ("cache", "result"),
+)
+
+UPSTREAM_REQUESTS = registry.counter(
+    "toloka2web_upstream_requests_total",
+    "Calls to upstream services by outcome",
+    ("upstream", "endpoint", "status"),
+)
+UPSTREAM_DURATION = registry.histogram(
+    "toloka2web_upstream_request_duration_seconds",
+    "Upstream call latency in seconds",
+    ("upstream", "endpoint"),
+)
+UPSTREAM_RESPONSE_SIZE = registry.histogram(
+    "toloka2web_upstream_response_size_bytes",
+    "Upstream response body size in bytes",
+    ("upstream", "endpoint"),
+    SIZE_BUCKETS,
+)
+UPSTREAM_ERRORS = registry.counter(
+    "toloka2web_upstream_errors_total",
+    "Failed upstream calls by kind (timeout, exception, http)",
+    ("upstream", "endpoint", "kind"),
+)
+
+TIMEOUT_ERRORS = (TimeoutError, requests_lib.Timeout)
+
+
+def _timeout_errors() -> Tuple[type, ...]:
+    """Timeout exception types, including httpx's once it has been imported.
+
+    httpx is only needed by the async clients; an httpx timeout cannot be
+    raised before the module is loaded, so it is not imported here.
+    """
+    httpx = sys.modules.get("httpx")
+    if httpx is None:
+        return TIMEOUT_ERRORS
+    return TIMEOUT_ERRORS + (httpx.TimeoutException,)
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup.
+
+    Args:
+        cache: Name of the cache
+        hit: Whether the lookup was served from the cache
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class UpstreamCall:
+    """Outcome of one upstream call, filled in by the caller.
+
+    Attributes:
+        status: HTTP status code, if the call returned an HTTP response
+        size: Response body size in bytes, if known
+    """
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.size: Optional[int] = None
+
+    def record_response(self, response, size: Optional[int] = None) -> None:
+        """Record status and size from a requests or httpx response.
+
+        Args:
+            response: HTTP response
+            size: Body size; defaults to Content-Length, or the length of
+                the already-read body
+        """
+        self.status = response.status_code
+        if size is None:
+            length = response.headers.get("Content-Length")
+            if length and length.isdigit():
+                size = int(length)
+            elif getattr(response, "_content", None) not in (None, False):
+                size = len(response.content)
+        self.size = size
+
+
+@contextmanager
+def track_upstream(upstream: str, endpoint: str) -> Iterator[UpstreamCall]:
+    """Time a call to an upstream service and record its outcome.
+
+    Exceptions are recorded (as ``timeout`` or ``error``) and re-raised.
+
+    Usage:
+        with track_upstream("mal", "/anime/{id}") as call:
+            response = requests.get(url, timeout=30)
+            call.record_response(response)
+
+    Args:
+        upstream: Upstream service name (e.g. ``mal``, ``torrent_client``)
+        endpoint: Endpoint template without identifiers
+    """
+    call = UpstreamCall()
+    labels = {"upstream": upstream, "endpoint": endpoint}
+    start = time.perf_counter()
+    try:
+        yield call
+    except _timeout_errors():
+        UPSTREAM_REQUESTS.inc(status="timeout", **labels)
+        UPSTREAM_ERRORS.inc(kind="timeout", **labels)
+        raise
+    except Exception:
+        UPSTREAM_REQUESTS.inc(status="error", **labels)
+        UPSTREAM_ERRORS.inc(kind="exception", **labels)
+        raise
+    else:
+        status = str(call.status) if call.status is not None else "ok"
+        UPSTREAM_REQUESTS.inc(status=status, **labels)
+        if call.status is not None and call.status >= 400:
+            UPSTREAM_ERRORS.inc(kind="http", **labels)
+        if call.size is not None:
+            UPSTREAM_RESPONSE_SIZE.observe(call.size, **labels)
+    finally:
+        UPSTREAM_DURATION.observe(time.perf_counter() - start, **labels)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def upstream_summary() -> List[Dict]:
+    """Summarize upstream metrics per upstream and endpoint.
+
+    Returns:
+        List of dictionaries with call counts by status, error counts by
+        kind, latency statistics in milliseconds and bytes received
+    """
+    collected = registry.collect()
+    duration = collected.get(UPSTREAM_DURATION.name)
+    response_size = collected.get(UPSTREAM_RESPONSE_SIZE.name)
+    summary: Dict[LabelValues, Dict] = {}
+    for (upstream, endpoint), stats in duration.samples().items():
+        labels = {"upstream": upstream, "endpoint": endpoint}
+        summary[(upstream, endpoint)] = {
+            **labels,
+            "calls": stats["count"],
+            "statuses": {},
+            "errors": {},
+            "latency_ms": {
+                "avg": _ms(stats["sum"] / stats["count"]) if stats["count"] else None,
+                "p50": _ms(duration.quantile(0.5, **labels)),
+                "p95": _ms(duration.quantile(0.95, **labels)),
+                "p99": _ms(duration.quantile(0.99, **labels)),
+            },
+            "bytes": response_size.samples()
+            .get((upstream, endpoint), {})
+            .get("sum", 0),
+        }
+
+    requests_total = collected.get(UPSTREAM_REQUESTS.name)
+    for (upstream, endpoint, status), count in requests_total.samples().items():
+        if (upstream, endpoint) in summary:
+            summary[(upstream, endpoint)]["statuses"][status] = count
+    for (upstream, endpoint, kind), count in (
+        collected.get(UPSTREAM_ERRORS.name).samples().items()
+    ):
+        if (upstream, endpoint) in summary:
+            summary[(upstream, endpoint)]["errors"][kind] = count
+
+    return [summary[key] for key in sorted(summary)]
+
+
+def _route_labels() -> Dict[str, str]:
+    return {
+        "blueprint": request.blueprint or "app",
+        "endpoint": request.endpoint or "unmatched",
+    }
+
+
+def _start_request() -> None:
+    g.metrics_start = time.perf_counter()
+    g.metrics_db_queries = 0
+    IN_FLIGHT.inc()
+
+
+def _record_request(response):
+    start = g.get("metrics_start")
+    if start is None:
+        return response
+
+    labels = _route_labels()
+    REQUESTS.inc(method=request.method, status=str(response.status_code), **labels)
+    REQUEST_DURATION.observe(
+        time.perf_counter() - start, method=request.method, **labels
+    )
+    if response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, **labels)
+    DB_QUERIES.observe(g.get("metrics_db_queries", 0), **labels)
+    return response
+
+
+def _finish_request(exc) -> None:
+    if g.pop("metrics_start", None) is not None:
+        IN_FLIGHT.dec()
+        registry.flush()
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    if has_request_context() and "metrics_db_queries" in g:
+        g.metrics_db_queries += 1
+
+
+def configure_metrics(app) -> None:
+    """Register request instrumentation hooks.
+
+    Metrics are shared between processes through ``METRICS_DIR`` when it
+    is set.
+
+    Args:
+        app: Flask application instance
+    """
+    directory = os.environ.get("METRICS_DIR")
+    if directory:
+        registry.set_directory(directory)
+
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    app.teardown_request(_finish_request)
@@ -0,0 +1,253 @@
+"""Opt-in sampling profiler for individual requests.
+
+An admin can profile a single request by adding ``?profile=<format>`` or an
+``X-Profile: <format>`` header, where format is ``speedscope`` (default for
+``1``/``true``) or ``collapsed``. While the request runs, a background thread
+samples the handling thread's Python stack every ``PROFILE_INTERVAL``
+seconds. The result is written to ``PROFILE_DIR`` (``data/profiles`` by
+default) and the response carries an ``X-Profile-URL`` header pointing at
+``/api/profiles/<name>`` for download:
+
+- ``speedscope``: JSON for https://www.speedscope.app
+- ``collapsed``: one ``frame;frame;frame count`` line per stack, the input
+  format of flamegraph.pl and most flamegraph viewers
+
+Requests without the switch only pay for one header/argument lookup.
+The switch is ignored for anyone but admins: the request is served as
+usual, without a profile.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app, g, request
+
+from app.utils.auth_utils import get_current_identity
+
+PROFILE_FORMATS = {
+    "1": "speedscope",
+    "true": "speedscope",
+    "speedscope": "speedscope",
+    "collapsed": "collapsed",
+}
+FILE_SUFFIXES = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}
+
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """Periodically sample the Python stack of one thread.
+
+    Each sample is weighted by the time measured since the previous one.
+    Wakeups are late under load (and never sooner than the GIL switch
+    interval), so ``samples * interval`` would understate where the time
+    went.
+
+    Args:
+        thread_id: Identifier of the thread to sample
+        interval: Seconds between samples
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        # Seconds attributed to each stack
+        self.times: Counter = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack: List[Frame] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[tuple(stack)] += 1
+            self.times[tuple(stack)] += elapsed
+
+    def to_collapsed(self) -> str:
+        """Render samples as collapsed stacks (root first)."""
+        lines = []
+        for stack, count in self.samples.most_common():
+            frames = ";".join(
+                f"{name} ({os.path.basename(filename)}:{line})"
+                for name, filename, line in stack
+            )
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> Dict:
+        """Render samples in the speedscope sampled profile format."""
+        frame_index: Dict[Frame, int] = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, seconds in self.times.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append(
+                        {"name": frame[0], "file": frame[1], "line": frame[2]}
+                    )
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(seconds)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "toloka2web",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+def profile_dir() -> str:
+    """Absolute path of the directory holding stored profiles."""
+    return os.path.abspath(current_app.config["PROFILE_DIR"])
+
+
+def list_profiles() -> List[Dict]:
+    """List stored profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append(
+                {
+                    "name": name,
+                    "size": stat.st_size,
+                    "created": datetime.fromtimestamp(
+                        stat.st_mtime, tz=timezone.utc
+                    ).isoformat(),
+                }
+            )
+    return sorted(entries, key=lambda entry: entry["created"], reverse=True)
+
+
+def _save_profile(profiler: SamplingProfiler, profile_format: str) -> str:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    endpoint = (request.endpoint or "unmatched").replace(".", "-")
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    name = f"{timestamp}-{endpoint}{FILE_SUFFIXES[profile_format]}"
+    title = f"{request.method} {request.full_path.rstrip('?')}"
+
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as profile_file:
+        if profile_format == "collapsed":
+            profile_file.write(profiler.to_collapsed())
+        else:
+            json.dump(profiler.to_speedscope(title), profile_file)
+
+    # Keep only the newest PROFILE_KEEP profiles
+    for entry in list_profiles()[current_app.config["PROFILE_KEEP"] :]:
+        os.remove(os.path.join(directory, entry["name"]))
+    return name
+
+
+def _requested_format() -> Optional[str]:
+    value = request.headers.get("X-Profile") or request.args.get("profile")
+    if not value or value.lower() in ("0", "false"):
+        return None
+    return PROFILE_FORMATS.get(value.lower(), "speedscope")
+
+
+def _start_profiling():
+    profile_format = _requested_format()
+    if profile_format is None:
+        return None
+
+    identity = get_current_identity()
+    if identity is None or identity["roles"] != "admin":
+        return None
+
+    profiler = SamplingProfiler(
+        threading.get_ident(), current_app.config["PROFILE_INTERVAL"]
+    )
+    g.profiler = (profiler, profile_format)
+    profiler.start()
+    return None
+
+
+def _finish_profiling(response):
+    entry = g.pop("profiler", None)
+    if entry is None:
+        return response
+
+    profiler, profile_format = entry
+    profiler.stop()
+    name = _save_profile(profiler, profile_format)
+    response.headers["X-Profile-URL"] = f"/api/profiles/{name}"
+    current_app.logger.info(
+        f"Profiled {request.method} {request.path} in {profiler.duration:.3f}s "
+        f"({sum(profiler.samples.values())} samples): {name}"
+    )
+    return response
+
+
+def _discard_profiling(exc) -> None:
+    # Stop the sampler if after_request did not run (unhandled exception)
+    entry = g.pop("profiler", None)
+    if entry is not None:
+        entry[0].stop()
+
+
+def configure_profiler(app) -> None:
+    """Register the opt-in request profiler.
+
+    Args:
+        app: Flask application instance
+    """
+    app.config.setdefault("PROFILE_DIR", os.environ.get("PROFILE_DIR", "data/profiles"))
+    app.config.setdefault("PROFILE_INTERVAL", 0.001)
+    app.config.setdefault("PROFILE_KEEP", 50)
+    app.before_request(_start_profiling)
+    app.after_request(_finish_profiling)
+    app.teardown_request(_discard_profiling)
@@ -0,0 +1,126 @@
+"""In-process TTL cache with single-flight loading, and retry backoff.
+
+TTLCache keeps results of expensive upstream calls for a short time and
+coalesces concurrent loads of the same key: the first caller (the leader)
+runs the loader while later callers wait for its result instead of
+issuing their own call. Failed loads are not cached and their exception
+is raised in every waiting caller.
+
+Like the other in-memory caches, entries are per process; each Gunicorn
+worker keeps its own copy.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.utils.metrics import record_cache
+
+
+class _Flight:
+    """A load in progress that other callers can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """Thread-safe TTL cache with single-flight loading.
+
+    Args:
+        name: Cache name used in cache metrics
+        ttl: Seconds an entry stays fresh
+        max_entries: Entries kept before the oldest are evicted
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for key, loading it at most once at a time.
+
+        Args:
+            key: Cache key
+            loader: Called without arguments to produce the value on a miss
+            should_cache: Predicate deciding whether a loaded value is stored
+                (e.g. to skip error payloads); all values by default
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                record_cache(self.name, hit=True)
+                return entry[1]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            # Coalesced with an identical load already in flight
+            record_cache(self.name, hit=True)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        record_cache(self.name, hit=False)
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and (
+                    should_cache is None or should_cache(flight.value)
+                ):
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or all entries when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number, starting at 0
+        base: Delay ceiling of the first retry in seconds
+        cap: Maximum delay ceiling in seconds
+
+    Returns:
+        Seconds to wait, uniformly drawn from [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -7,6 +7,8 @@ This is the recommended way to run the application:
 
 For module execution, use:
     python -m app
+
+Set SERVER_MODE=production to serve with Gunicorn (see app/server.py).
 """
 
 import os
@@ -19,15 +21,12 @@ def main():
 
     # Import and create the app
     from app import create_app
+    from app.server import serve
 
     app = create_app()
 
-    # Get host and port from config (set from environment variables)
-    host = app.config.get("HOST", "0.0.0.0")
-    port = app.config.get("PORT", 5000)
-
-    # Run the application
-    app.run(host=host, port=port)
+    # Serve in the mode selected by SERVER_MODE (development or production)
+    serve(app)
 
 
 if __name__ == "__main__":
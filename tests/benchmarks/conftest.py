@@ -0,0 +1,64 @@
+"""Benchmark suite for the hot paths, with stubbed upstreams.
+
+Benchmarks are skipped by the regular test run and only collected with
+``--benchmark-only`` (requires pytest-benchmark). Run them from the
+repository root so the bundled ``data/anime_data.db`` catalogue is used.
+
+Record a baseline:
+
+    python -m pytest tests/benchmarks --benchmark-only \\
+        --benchmark-storage=tests/benchmarks/baselines --benchmark-autosave
+
+Compare against the latest baseline, failing on a >25% mean regression:
+
+    python -m pytest tests/benchmarks --benchmark-only \\
+        --benchmark-storage=tests/benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import types
+
+import pytest
+
+
+def pytest_ignore_collect(collection_path, config):
+    if not config.getoption("benchmark_only", default=False):
+        return True
+    return None
+
+
+@pytest.fixture()
+def catalogue(app):
+    """DatabaseService bound to the bundled anime catalogue."""
+    from app.services.services_db import DatabaseService
+
+    if DatabaseService.Session is None:
+        pytest.skip("anime catalogue is not available")
+    return DatabaseService
+
+
+@pytest.fixture()
+def many_torrents():
+    """Titles and matching torrent client entries for 3000 releases."""
+    titles = {
+        f"release-{i}": {
+            "episode_index": str(i % 24),
+            "season_number": "01",
+            "torrent_name": f"Title {i}",
+            "hash": f"{i:040x}",
+        }
+        for i in range(3000)
+    }
+    torrents = types.SimpleNamespace(
+        data=[
+            {
+                "hash": f"{i:040x}",
+                "state": "uploading",
+                "progress": 1.0,
+                "name": f"Title {i}",
+                "size": 1 << 30,
+            }
+            for i in range(0, 6000, 2)
+        ]
+    )
+    return titles, torrents
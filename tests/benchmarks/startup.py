@@ -0,0 +1,137 @@
+"""Cold start measurement: import, create_app and the first request.
+
+Runs in a fresh interpreter so nothing is already imported. The app is
+created with a test configuration in a temporary working directory (no
+first-run downloads); toloka2MediaServer and stream2mediaserver are
+stubbed as in the test suite when they are not installed.
+
+    python -m tests.benchmarks.startup            # one JSON line of timings
+    python -m tests.benchmarks.startup --profile 25
+
+``--profile N`` re-runs the start under ``python -X importtime`` and
+prints the N imports with the largest cumulative time instead.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that should only be imported on first use (see app.utils.lazy_import)
+DEFERRED = (
+    "toloka2MediaServer.main_logic",
+    "toloka2MediaServer.clients.dynamic",
+    "stream2mediaserver.main_logic",
+    "httpx",
+)
+
+
+def cold_start() -> dict:
+    """Import and create the app, serve /healthz; return timings in seconds."""
+    import resource
+
+    sys.path[:0] = [ROOT, os.path.join(ROOT, "tests")]
+    import conftest  # noqa: F401  (stubs missing optional dependencies)
+
+    # Stubs are registered in sys.modules up front; only report real imports
+    stubbed = {name for name in DEFERRED if name in sys.modules}
+
+    workdir = tempfile.mkdtemp(prefix="toloka2web-startup-")
+    os.makedirs(os.path.join(workdir, "data"))
+    catalogue = os.path.join(ROOT, "data", "anime_data.db")
+    if os.path.exists(catalogue):
+        os.symlink(catalogue, os.path.join(workdir, "data", "anime_data.db"))
+    os.chdir(workdir)
+
+    start = time.perf_counter()
+    from app.app import create_app
+
+    imported = time.perf_counter()
+    app = create_app(
+        {
+            "TESTING": True,
+            "SECRET_KEY": "startup",
+            "JWT_SECRET_KEY": "startup-benchmark-jwt-secret-key-0123",
+            "API_KEY": "startup",
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir}/toloka2web.db",
+            "WTF_CSRF_ENABLED": False,
+            "CORS_ORIGINS": ["*"],
+        }
+    )
+    created = time.perf_counter()
+    response = app.test_client().get("/healthz")
+    served = time.perf_counter()
+
+    from app.utils.lazy_import import import_profile
+
+    loaded = set(import_profile())
+    return {
+        "import": imported - start,
+        "create_app": created - imported,
+        "first_request": served - created,
+        "total": served - start,
+        "status": response.status_code,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "eagerly_imported": sorted(
+            name
+            for name in DEFERRED
+            if name in sys.modules and name not in stubbed and name not in loaded
+        ),
+    }
+
+
+def run_cold_start() -> dict:
+    """Measure one cold start in a new interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-m", "tests.benchmarks.startup"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # Log lines may be written to stdout too; the timings are the JSON line
+    line = next(
+        line for line in reversed(output.splitlines()) if line.startswith('{"import"')
+    )
+    return json.loads(line)
+
+
+def import_profile(top: int) -> list:
+    """Largest cumulative import times (microseconds) of a cold start."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "tests.benchmarks.startup"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    cumulative_by_name = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        cumulative_by_name[name] = max(int(cumulative), cumulative_by_name.get(name, 0))
+    rows = sorted(((us, name) for name, us in cumulative_by_name.items()), reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", type=int, metavar="N", default=0)
+    args = parser.parse_args()
+
+    if args.profile:
+        for cumulative, name in import_profile(args.profile):
+            print(f"{cumulative / 1000:9.1f} ms  {name}")
+        return
+    print(json.dumps(cold_start()))
+
+
+if __name__ == "__main__":
+    main()
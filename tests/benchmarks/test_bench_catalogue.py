@@ -0,0 +1,63 @@
+from app.services.base_service import BaseService
+
+
+def test_serialize_full_anime_list(benchmark, catalogue):
+    session = catalogue.Session()
+    try:
+        animes = session.query(catalogue.Anime).all()
+        result = benchmark(BaseService.serialize, animes)
+    finally:
+        session.close()
+    assert len(result) == len(animes)
+
+
+def test_list_all_anime(benchmark, catalogue):
+    result = benchmark(catalogue.list_all_anime)
+    assert result
+
+
+def test_search_anime_by_name(benchmark, catalogue):
+    result = benchmark(catalogue.get_anime_by_name, "ра")
+    assert isinstance(result, list)
+
+
+def test_related_anime_join(benchmark, catalogue):
+    benchmark(catalogue.get_related_animes, 1)
+
+
+def test_studio_search_with_synonyms(benchmark, catalogue):
+    result = benchmark(catalogue.search_studio_by_name, "a")
+    assert isinstance(result, list)
+
+
+def test_anime_by_studio_join(benchmark, catalogue):
+    benchmark(catalogue.get_anime_by_studio_id, 1)
+
+
+def test_anime_detail_separate_calls(benchmark, catalogue):
+    """The four catalogue calls the detail page used to make."""
+
+    def load():
+        return (
+            catalogue.get_anime_by_id(330),
+            catalogue.get_related_animes(330),
+            catalogue.get_studios_by_anime_id(330),
+            catalogue.get_episodes_by_anime_id(330),
+        )
+
+    benchmark(load)
+
+
+def test_anime_full_uncached(benchmark, catalogue):
+    result = benchmark(catalogue._load_anime_full, 330)
+    assert result["anime"]["id"] == 330
+
+
+def test_franchise_lookup(benchmark, catalogue):
+    result = benchmark(catalogue.get_franchise, 41)
+    assert len(result) > 1
+
+
+def test_list_studios_with_summaries(benchmark, catalogue):
+    result = benchmark(catalogue.list_all_studios)
+    assert all("title_count" in studio for studio in result)
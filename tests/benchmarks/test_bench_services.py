@@ -0,0 +1,150 @@
+import asyncio
+import time
+import types
+
+import httpx
+import pytest
+
+from app.models.base import db
+from app.models.releases import Releases
+from app.services.config_service import ConfigService
+from app.services.mal_service import MALService
+from app.services.services import SearchService, TolokaService, TorrentService
+from app.services.services_db import DatabaseService
+from app.services.tmdb_service import TMDBService
+from app.utils import json_provider
+
+UPSTREAM_LATENCY = 0.005
+
+# Keep references to the real sync functions; the app fixture replaces them
+read_releases_ini = ConfigService.read_releases_ini_and_sync_to_db
+write_releases_ini = ConfigService.load_releases_from_db_and_write_to_ini
+
+
+def _write_titles_ini(path, count):
+    lines = []
+    for i in range(count):
+        lines += [
+            f"[release-{i}]",
+            f"episode_index = {i % 24}",
+            "season_number = 01",
+            f"torrent_name = Title {i}",
+            "download_dir = /downloads",
+            "publish_date = 2024-01-01 12:00",
+            "release_group = Group",
+            "meta = [WEB]",
+            f"hash = {i:040x}",
+            "adjusted_episode_number = 0",
+            f"guid = t{i}",
+            "is_partial_season = True",
+            "",
+        ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_releases_ini_to_db_sync(benchmark, app, tmp_path):
+    titles = tmp_path / "titles.ini"
+    _write_titles_ini(titles, 2000)
+
+    benchmark(read_releases_ini.__func__, ConfigService, str(titles))
+    assert Releases.query.count() == 2000
+
+
+def test_releases_db_to_ini_sync(benchmark, app, tmp_path):
+    titles = tmp_path / "titles.ini"
+    _write_titles_ini(titles, 2000)
+    read_releases_ini.__func__(ConfigService, str(titles))
+    db.session.expire_all()
+
+    out = tmp_path / "out.ini"
+    benchmark(write_releases_ini.__func__, ConfigService, str(out))
+    assert out.read_text(encoding="utf-8").count("[release-") == 2000
+
+
+def _fake_upstreams(monkeypatch):
+    def search_anime(query):
+        time.sleep(UPSTREAM_LATENCY)
+        return {
+            "data": [{"node": {"id": i, "title": f"{query} {i}"}} for i in range(10)]
+        }
+
+    def search_media(query):
+        time.sleep(UPSTREAM_LATENCY)
+        return {
+            "results": [
+                {"id": i, "media_type": "tv", "name": f"{query} {i}"} for i in range(10)
+            ]
+        }
+
+    def get_media_detail(media_id, media_type="tv"):
+        time.sleep(UPSTREAM_LATENCY)
+        return {"id": media_id, "name": f"Media {media_id}", "external_ids": {}}
+
+    monkeypatch.setattr(MALService, "search_anime", search_anime)
+    monkeypatch.setattr(TMDBService, "search_media", search_media)
+    monkeypatch.setattr(TMDBService, "get_media_detail", get_media_detail)
+    monkeypatch.setattr(DatabaseService, "get_anime_by_name", lambda query: [])
+
+
+def test_multi_search_with_slow_upstreams(benchmark, app, monkeypatch):
+    _fake_upstreams(monkeypatch)
+    result = benchmark(SearchService.multi_search, "frieren")
+    assert result
+
+
+def test_multi_search_async_with_slow_upstreams(benchmark, app, monkeypatch):
+    monkeypatch.setattr(MALService, "get_api_key", classmethod(lambda cls, key: "k"))
+    monkeypatch.setattr(DatabaseService, "get_anime_by_name", lambda query: [])
+
+    async def upstream(request):
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        if "myanimelist" in request.url.host:
+            return httpx.Response(
+                200, json={"data": [{"node": {"id": i}} for i in range(10)]}
+            )
+        if request.url.path.endswith("/search/multi"):
+            return httpx.Response(
+                200,
+                json={"results": [{"id": i, "media_type": "tv"} for i in range(10)]},
+            )
+        return httpx.Response(200, json={"id": 1, "external_ids": {}})
+
+    async def search():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+            return await SearchService.multi_search_async(client, "frieren")
+
+    result = benchmark(lambda: asyncio.run(search()))
+    assert result
+
+
+def test_titles_with_torrent_status(benchmark, app, monkeypatch, many_torrents):
+    titles, torrents = many_torrents
+    monkeypatch.setattr(
+        TolokaService,
+        "get_titles_logic",
+        classmethod(lambda cls: {name: dict(data) for name, data in titles.items()}),
+    )
+    monkeypatch.setattr(
+        TorrentService, "get_releases_torrent_status", classmethod(lambda cls: torrents)
+    )
+
+    result = benchmark(TolokaService.get_titles_with_torrent_status)
+    assert sum("torrent_info" in data for data in result.values()) == 1500
+
+
+def _torrent_info_response(torrents):
+    """Torrent client result: an object holding the list of torrents."""
+    return types.SimpleNamespace(data=torrents.data, status="ok")
+
+
+def test_encode_torrent_list(benchmark, many_torrents):
+    _, torrents = many_torrents
+    result = benchmark(json_provider.dumps, _torrent_info_response(torrents))
+    assert result.startswith('{"data":')
+
+
+def test_encode_torrent_list_jsonpickle(benchmark, many_torrents):
+    """Previous encoder of /api/releases/torrents, for comparison."""
+    jsonpickle = pytest.importorskip("jsonpickle")
+    _, torrents = many_torrents
+    benchmark(jsonpickle.encode, _torrent_info_response(torrents), unpicklable=False)
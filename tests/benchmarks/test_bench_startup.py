@@ -0,0 +1,14 @@
+from tests.benchmarks.startup import run_cold_start
+
+
+def test_bench_cold_start(benchmark):
+    """Fresh interpreter: import, create_app and the first served request."""
+    results = []
+    benchmark.pedantic(lambda: results.append(run_cold_start()), rounds=5, iterations=1)
+
+    assert all(result["status"] == 200 for result in results)
+    # Rarely used subsystems are imported on first use, not at start-up
+    assert results[-1]["eagerly_imported"] == []
+    benchmark.extra_info["max_rss_mb"] = max(r["max_rss_mb"] for r in results)
+    benchmark.extra_info["import_s"] = min(r["import"] for r in results)
+    benchmark.extra_info["create_app_s"] = min(r["create_app"] for r in results)
@@ -121,6 +121,7 @@ def app(tmp_path, monkeypatch):
     from app.app import create_app
     from app.models.base import db
     from app.services.config_service import ConfigService
+    from app.services.health_service import HealthService
     from app.services.services_db import DatabaseService
 
     monkeypatch.setattr(ConfigService, "sync_settings", lambda *args, **kwargs: None)
@@ -133,6 +134,9 @@ def app(tmp_path, monkeypatch):
     monkeypatch.setattr(
         DatabaseService, "initialize_database", lambda *args, **kwargs: None
     )
+    # Tests run health probes explicitly instead of in a background thread
+    monkeypatch.setattr(HealthService, "start", lambda *args, **kwargs: None)
+    monkeypatch.setattr(HealthService, "_results", {})
 
     database_path = tmp_path / "toloka2web_test.db"
     app = create_app(
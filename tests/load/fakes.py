@@ -0,0 +1,362 @@
+"""Local stand-ins for the upstream services used in load tests.
+
+Each fake is a small threaded HTTP server answering the subset of the
+upstream API the application calls:
+
+- FakeMAL: MyAnimeList v2 (``/anime``, ``/anime/<id>``)
+- FakeTMDB: TMDB v3 (``/search/multi``, ``/<type>/<id>``, ``/trending``,
+  ``/find``)
+- FakeToloka: toloka.to login, tracker search, topic and download pages,
+  plus poster images for the image proxy
+- FakeQBittorrent: the qBittorrent WebUI API v2 (login, version,
+  ``torrents/info`` and write endpoints)
+
+Behaviour is controlled by UpstreamProfile: added latency (base plus
+uniform jitter), the fraction of requests answered with 500 and the
+payload size (items per list response, bytes per image).
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class UpstreamProfile:
+    """Behaviour of a fake upstream.
+
+    Attributes:
+        latency: Base delay added to every response, in seconds
+        jitter: Maximum extra random delay, in seconds
+        error_rate: Fraction (0-1) of requests answered with HTTP 500
+        items: Number of items in list responses
+        payload_bytes: Size of binary responses (images, torrent files)
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    items: int = 10
+    payload_bytes: int = 20_000
+
+
+# (status, content type, body, extra headers)
+Reply = Tuple[int, str, bytes, Dict[str, str]]
+
+
+def json_reply(data, status: int = 200) -> Reply:
+    return status, "application/json", json.dumps(data).encode("utf-8"), {}
+
+
+def text_reply(text: str, status: int = 200, content_type="text/plain") -> Reply:
+    return status, content_type, text.encode("utf-8"), {}
+
+
+class FakeServer:
+    """Threaded HTTP server dispatching to regex routes.
+
+    Subclasses fill ROUTES with ``(method, path regex, handler name)``.
+
+    Args:
+        profile: Latency, error and payload settings
+        host: Address to bind to
+        port: Port to bind to, 0 picks a free port
+    """
+
+    NAME = "fake"
+    ROUTES: List[Tuple[str, str, str]] = []
+
+    def __init__(
+        self, profile: Optional[UpstreamProfile] = None, host="127.0.0.1", port=0
+    ):
+        self.profile = profile or UpstreamProfile()
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._routes = [
+            (method, re.compile(pattern + "$"), getattr(self, handler))
+            for method, pattern, handler in self.ROUTES
+        ]
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=self.NAME, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "errors": self.errors}
+
+    def handle(self, method: str, path: str, body: bytes) -> Reply:
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+        if body and method == "POST":
+            query.update(parse_qs(body.decode("utf-8", "replace")))
+
+        profile = self.profile
+        time.sleep(profile.latency + random.uniform(0, profile.jitter))
+
+        injected_error = random.random() < profile.error_rate
+        with self._lock:
+            self.requests += 1
+            self.errors += injected_error
+        if injected_error:
+            return json_reply({"error": "injected failure"}, status=500)
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                return handler(match, query, body)
+        return json_reply({"error": "not found"}, status=404)
+
+    def _handler_class(self):
+        fake = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, content_type, payload, headers = fake.handle(
+                    method, self.path, body
+                )
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return RequestHandler
+
+
+class FakeMAL(FakeServer):
+    """MyAnimeList API v2 stand-in."""
+
+    NAME = "fake-mal"
+    ROUTES = [
+        ("GET", r"/anime", "search"),
+        ("GET", r"/anime/(?P<id>\d+)", "detail"),
+    ]
+
+    def _anime(self, anime_id: int) -> Dict:
+        return {
+            "id": anime_id,
+            "title": f"Anime {anime_id}",
+            "main_picture": {"medium": f"https://cdn.example/{anime_id}.jpg"},
+            "alternative_titles": {"en": f"Anime {anime_id}", "synonyms": []},
+            "media_type": "tv",
+            "status": "finished_airing",
+            "start_date": "2023-10-01",
+        }
+
+    def search(self, match, query, body):
+        seed = sum(map(ord, query.get("q", [""])[0]))
+        return json_reply(
+            {
+                "data": [
+                    {"node": self._anime(seed + i)} for i in range(self.profile.items)
+                ]
+            }
+        )
+
+    def detail(self, match, query, body):
+        anime = self._anime(int(match["id"]))
+        anime.update(
+            synopsis="Lorem ipsum " * 40,
+            num_episodes=24,
+            related_anime=[
+                {"node": self._anime(int(match["id"]) + i), "relation_type": "sequel"}
+                for i in range(1, 4)
+            ],
+        )
+        return json_reply(anime)
+
+
+class FakeTMDB(FakeServer):
+    """TMDB API v3 stand-in."""
+
+    NAME = "fake-tmdb"
+    ROUTES = [
+        ("GET", r"/search/multi", "search"),
+        ("GET", r"/trending/(?P<type>\w+)/day", "trending"),
+        ("GET", r"/find/(?P<id>[^/]+)", "find"),
+        ("GET", r"/(?P<type>tv|movie)/(?P<id>\d+)", "detail"),
+    ]
+
+    def _media(self, media_id: int, media_type: str = "tv") -> Dict:
+        return {
+            "id": media_id,
+            "media_type": media_type,
+            "name": f"Media {media_id}",
+            "original_name": f"Media {media_id}",
+            "overview": "Lorem ipsum " * 20,
+            "poster_path": f"/{media_id}.jpg",
+            "first_air_date": "2023-10-01",
+        }
+
+    def _page(self, seed: int) -> Dict:
+        return {
+            "page": 1,
+            "results": [self._media(seed + i) for i in range(self.profile.items)],
+            "total_results": self.profile.items,
+        }
+
+    def search(self, match, query, body):
+        return json_reply(self._page(sum(map(ord, query.get("query", [""])[0]))))
+
+    def trending(self, match, query, body):
+        return json_reply(self._page(1000))
+
+    def find(self, match, query, body):
+        return json_reply({"tv_results": [self._media(1)], "movie_results": []})
+
+    def detail(self, match, query, body):
+        media = self._media(int(match["id"]), match["type"])
+        media["external_ids"] = {"imdb_id": f"tt{match['id']}"}
+        return json_reply(media)
+
+
+class FakeToloka(FakeServer):
+    """toloka.to stand-in: login, search, topic, download and images."""
+
+    NAME = "fake-toloka"
+    ROUTES = [
+        ("GET", r"/login\.php", "login_page"),
+        ("POST", r"/login\.php", "login"),
+        ("GET", r"/tracker\.php", "search"),
+        ("GET", r"/t(?P<id>\d+)", "topic"),
+        ("GET", r"/download\.php", "download"),
+        ("GET", r"/pics/(?P<name>.+)", "image"),
+    ]
+
+    def login_page(self, match, query, body):
+        return text_reply("<html><body>login</body></html>", content_type="text/html")
+
+    def login(self, match, query, body):
+        status, content_type, payload, _ = text_reply(
+            "<html><body>ok</body></html>", content_type="text/html"
+        )
+        return status, content_type, payload, {"Set-Cookie": "toloka_sid=fake; Path=/"}
+
+    def search(self, match, query, body):
+        term = query.get("nm", [""])[0]
+        rows = "".join(
+            f'<tr class="prow{i % 2 + 1}"><td><a href="t{i}" class="topictitle">'
+            f"{term} {i}</a></td><td>1.2 GB</td><td>{i}</td><td>{i // 2}</td>"
+            f'<td><a href="download.php?id={i}">dl</a></td></tr>'
+            for i in range(1, self.profile.items + 1)
+        )
+        return text_reply(
+            f'<html><body><table class="forumline">{rows}</table></body></html>',
+            content_type="text/html",
+        )
+
+    def topic(self, match, query, body):
+        return text_reply(
+            f'<html><body><h1 class="maintitle">Topic {match["id"]}</h1>'
+            f'<img class="postImg" src="/pics/{match["id"]}.jpg">'
+            f'<a href="download.php?id={match["id"]}">dl</a></body></html>',
+            content_type="text/html",
+        )
+
+    def download(self, match, query, body):
+        return (
+            200,
+            "application/x-bittorrent",
+            b"d8:announce0:4:infod4:name4:fakeee",
+            {},
+        )
+
+    def image(self, match, query, body):
+        return 200, "image/jpeg", b"\xff\xd8" + b"\0" * self.profile.payload_bytes, {}
+
+
+class FakeQBittorrent(FakeServer):
+    """qBittorrent WebUI API v2 stand-in."""
+
+    NAME = "fake-qbittorrent"
+    ROUTES = [
+        ("POST", r"/api/v2/auth/login", "login"),
+        ("GET", r"/api/v2/app/version", "version"),
+        ("GET", r"/api/v2/app/webapiVersion", "webapi_version"),
+        ("GET", r"/api/v2/torrents/info", "torrents"),
+        ("POST", r"/api/v2/torrents/info", "torrents"),
+        ("POST", r"/api/v2/torrents/(?P<action>\w+)", "ok"),
+        ("GET", r"/api/v2/torrents/(?P<action>files|properties)", "torrent_detail"),
+    ]
+
+    def login(self, match, query, body):
+        status, content_type, payload, _ = text_reply("Ok.")
+        return status, content_type, payload, {"Set-Cookie": "SID=fake; Path=/"}
+
+    def version(self, match, query, body):
+        return text_reply("v4.6.0")
+
+    def webapi_version(self, match, query, body):
+        return text_reply("2.9.3")
+
+    def torrents(self, match, query, body):
+        category = query.get("category", [""])[0]
+        tag = query.get("tag", [""])[0]
+        return json_reply(
+            [
+                {
+                    "hash": f"{i:040x}",
+                    "name": f"Title {i}",
+                    "state": "uploading" if i % 3 else "downloading",
+                    "progress": 1.0 if i % 3 else 0.42,
+                    "size": 1 << 30,
+                    "category": category,
+                    "tags": tag,
+                    "content_path": f"/downloads/Title {i}",
+                }
+                for i in range(self.profile.items)
+            ]
+        )
+
+    def ok(self, match, query, body):
+        return text_reply("Ok.")
+
+    def torrent_detail(self, match, query, body):
+        if match["action"] == "files":
+            return json_reply(
+                [{"name": f"Title/E{i:02}.mkv", "size": 1 << 28} for i in range(12)]
+            )
+        return json_reply({"save_path": "/downloads", "total_size": 1 << 30})
@@ -0,0 +1,440 @@
+"""Load-testing harness running the application against local fake upstreams.
+
+Starts FakeMAL, FakeTMDB, FakeToloka and FakeQBittorrent (see fakes.py),
+points the application at them and drives a weighted traffic mix from
+concurrent clients, then reports throughput and latency percentiles per
+endpoint.
+
+By default the application is served in-process from a throwaway working
+directory (its own ``data/app.ini``, ``data/titles.ini`` and user database,
+the bundled anime catalogue):
+
+    python -m tests.load.harness --mix mixed --concurrency 32 --duration 30
+
+``--server asgi`` serves the ASGI gateway with Uvicorn instead of the
+threaded Werkzeug server. To load-test a separately started deployment
+(e.g. ``SERVER_MODE=production``), use ``--target`` and configure it with
+the printed fake URLs (``MAL_API_BASE_URL``, ``TMDB_API_BASE_URL`` and the
+generated app.ini); Toloka is only redirected to its fake in-process:
+
+    python -m tests.load.harness --target http://127.0.0.1:5000 --api-key KEY
+
+Upstream behaviour is set with ``--latency``, ``--jitter``,
+``--error-rate`` and ``--items``/``--image-bytes``; ``--json`` writes the
+report to a file for comparing runs.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from tests.load.fakes import (
+    FakeMAL,
+    FakeQBittorrent,
+    FakeTMDB,
+    FakeToloka,
+    UpstreamProfile,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOLOKA_URL = "https://toloka.to"
+QUERIES = ["frieren", "naruto", "bleach", "one piece", "spy family", "mushoku"]
+
+# name -> [(weight, label, path template)]
+MIXES: Dict[str, List[Tuple[int, str, str]]] = {
+    "browse": [
+        (30, "anime_list", "/api/anime"),
+        (25, "anime_detail", "/api/anime/{anime_id}"),
+        (15, "anime_search", "/api/anime?query={query}"),
+        (10, "studios", "/api/studio"),
+        (20, "releases", "/api/releases"),
+    ],
+    "search": [
+        (40, "search", "/api/search?query={query}"),
+        (20, "mal_search", "/api/mal/search?query={query}"),
+        (20, "tmdb_search", "/api/tmdb/search?query={query}"),
+        (20, "toloka_search", "/api/toloka?query={query}"),
+    ],
+    "mixed": [
+        (20, "anime_detail", "/api/anime/{anime_id}"),
+        (10, "anime_search", "/api/anime?query={query}"),
+        (15, "releases", "/api/releases"),
+        (20, "search", "/api/search?query={query}"),
+        (5, "mal_detail", "/api/mal/detail/{anime_id}"),
+        (5, "tmdb_trending", "/api/tmdb/trending"),
+        (10, "toloka_search", "/api/toloka?query={query}"),
+        (15, "image", "/image/?url={image}"),
+    ],
+}
+
+
+@dataclass
+class Sample:
+    label: str
+    status: int
+    latency: float
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _summary(samples: List[Sample], elapsed: float) -> Dict:
+    latencies = [sample.latency * 1000 for sample in samples]
+    errors = sum(1 for sample in samples if sample.status >= 500 or sample.status == 0)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0.0), 2),
+    }
+
+
+def build_report(samples: List[Sample], elapsed: float) -> Dict:
+    """Aggregate samples into overall and per-endpoint statistics."""
+    by_label: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_label[sample.label].append(sample)
+    return {
+        "elapsed": round(elapsed, 3),
+        "total": _summary(samples, elapsed),
+        "endpoints": {
+            label: _summary(label_samples, elapsed)
+            for label, label_samples in sorted(by_label.items())
+        },
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Render a report as a text table."""
+    header = f"{'endpoint':<16}{'reqs':>8}{'errors':>8}{'req/s':>10}"
+    header += f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    rows = [header, "-" * len(header)]
+    for label, stats in [*report["endpoints"].items(), ("TOTAL", report["total"])]:
+        rows.append(
+            f"{label:<16}{stats['requests']:>8}{stats['errors']:>8}"
+            f"{stats['throughput']:>10}{stats['p50_ms']:>10}{stats['p90_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+    return "\n".join(rows)
+
+
+def run_load(
+    base_url: str,
+    mix: List[Tuple[int, str, str]],
+    concurrency: int = 16,
+    duration: float = 10.0,
+    max_requests: Optional[int] = None,
+    headers: Optional[Dict[str, str]] = None,
+    image_base: str = "",
+    timeout: float = 60.0,
+) -> Dict:
+    """Drive a traffic mix from concurrent clients and build a report.
+
+    Args:
+        base_url: Application URL
+        mix: Weighted (weight, label, path template) entries
+        concurrency: Number of concurrent clients
+        duration: Seconds to run for
+        max_requests: Stop after this many requests in total
+        headers: Headers sent with every request (authentication)
+        image_base: Base URL of images for the image proxy
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Report as built by build_report()
+    """
+    weights = [entry[0] for entry in mix]
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    issued = [0]
+
+    def next_request() -> bool:
+        with lock:
+            if max_requests is not None and issued[0] >= max_requests:
+                return False
+            issued[0] += 1
+        return time.monotonic() < deadline
+
+    def client() -> None:
+        session = requests.Session()
+        session.headers.update(headers or {})
+        local: List[Sample] = []
+        while next_request():
+            _, label, template = random.choices(mix, weights)[0]
+            anime_id = random.randint(1, 1500)
+            path = template.format(
+                query=random.choice(QUERIES),
+                anime_id=anime_id,
+                image=f"{image_base}/pics/{anime_id}.jpg",
+            )
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + path, timeout=timeout)
+                status = response.status_code
+            except requests.RequestException:
+                status = 0
+            local.append(Sample(label, status, time.perf_counter() - started))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return build_report(samples, time.perf_counter() - started)
+
+
+def redirect_toloka(fake_url: str):
+    """Send this process's HTTP requests for toloka.to to fake_url instead.
+
+    The Toloka client has no address option and logs in while it is
+    created, so requests.Session is patched for the in-process app.
+
+    Returns:
+        Callable restoring requests.Session
+    """
+    request = requests.Session.request
+
+    def redirected(self, method, url, *args, **kwargs):
+        if isinstance(url, str) and url.startswith(TOLOKA_URL):
+            url = fake_url + url[len(TOLOKA_URL) :]
+        return request(self, method, url, *args, **kwargs)
+
+    requests.Session.request = redirected
+    return lambda: setattr(requests.Session, "request", request)
+
+
+def write_app_ini(path: str, qbittorrent: FakeQBittorrent) -> None:
+    """Write an app.ini pointing qBittorrent at its fake."""
+    host, port = qbittorrent.url.rsplit(":", 1)
+    with open(path, "w", encoding="utf-8") as ini_file:
+        ini_file.write(
+            "[Toloka]\n"
+            "username = loadtest\n"
+            "password = loadtest\n"
+            "client = qbit\n"
+            "default_download_dir = /downloads\n"
+            "default_meta = \n\n"
+            "[qbit]\n"
+            f"host = {host}\n"
+            f"port = {port}\n"
+            "username = admin\n"
+            "password = adminadmin\n"
+            "category = toloka\n"
+            "tag = toloka\n"
+        )
+
+
+def write_titles_ini(path: str, count: int) -> None:
+    """Write count releases whose hashes match FakeQBittorrent's torrents."""
+    with open(path, "w", encoding="utf-8") as ini_file:
+        for i in range(count):
+            ini_file.write(
+                f"[release-{i}]\n"
+                f"episode_index = {i % 24}\n"
+                "season_number = 01\n"
+                f"torrent_name = Title {i}\n"
+                "download_dir = /downloads\n"
+                "publish_date = 2024-01-01 12:00\n"
+                "release_group = Group\n"
+                "meta = [WEB]\n"
+                f"hash = {i:040x}\n"
+                "adjusted_episode_number = 0\n"
+                f"guid = t{i}\n"
+                "ongoing = True\n\n"
+            )
+
+
+def prepare_workdir(workdir: str, qbittorrent, releases: int) -> None:
+    """Create data/ with configuration for the fakes and the anime catalogue."""
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    write_app_ini(os.path.join(data_dir, "app.ini"), qbittorrent)
+    write_titles_ini(os.path.join(data_dir, "titles.ini"), releases)
+    shutil.copy(
+        os.path.join(ROOT, "data", "anime_data.db"),
+        os.path.join(data_dir, "anime_data.db"),
+    )
+
+
+def serve_in_process(workdir: str, server: str, port: int, api_key: str):
+    """Create the application in workdir and serve it on a background thread.
+
+    Returns:
+        Callable stopping the server
+    """
+    # Relative data/ paths (catalogue, INI files) resolve against workdir;
+    # must happen before the app package is imported
+    os.chdir(workdir)
+    from app.app import create_app
+
+    flask_app = create_app(
+        {
+            "SECRET_KEY": "loadtest",
+            "JWT_SECRET_KEY": "loadtest-jwt-secret-key-at-least-32-bytes",
+            "API_KEY": api_key,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir}/data/toloka2web.db",
+            "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+            "CORS_ORIGINS": ["*"],
+        }
+    )
+    with flask_app.app_context():
+        from app.models.application_settings import ApplicationSettings
+        from app.services.config_service import ConfigService
+
+        # The fakes accept any key, but the services skip calls without one
+        for key in ("mal_api", "tmdb_api"):
+            setting = ApplicationSettings.query.filter_by(key=key).first()
+            ConfigService.update_setting(setting.id, setting.section, key, "loadtest")
+
+    if server == "asgi":
+        import uvicorn
+
+        from app.asgi import create_asgi_app
+
+        uvicorn_server = uvicorn.Server(
+            uvicorn.Config(
+                create_asgi_app(flask_app),
+                host="127.0.0.1",
+                port=port,
+                log_level="warning",
+            )
+        )
+        thread = threading.Thread(target=uvicorn_server.run, daemon=True)
+        thread.start()
+        while not uvicorn_server.started:
+            time.sleep(0.05)
+
+        def stop():
+            uvicorn_server.should_exit = True
+            thread.join()
+
+        return stop
+
+    from werkzeug.serving import make_server
+
+    wsgi_server = make_server("127.0.0.1", port, flask_app, threaded=True)
+    thread = threading.Thread(target=wsgi_server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        wsgi_server.shutdown()
+        thread.join()
+
+    return stop
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--requests", type=int, help="stop after N requests")
+    parser.add_argument("--server", choices=["werkzeug", "asgi"], default="werkzeug")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--target", help="load-test an already running app")
+    parser.add_argument("--api-key", default="loadtest-api-key")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--image-bytes", type=int, default=20_000)
+    parser.add_argument("--torrents", type=int, default=500)
+    parser.add_argument("--json", help="write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    profile = UpstreamProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        items=args.items,
+        payload_bytes=args.image_bytes,
+    )
+    qbittorrent_profile = UpstreamProfile(
+        latency=args.latency, jitter=args.jitter, items=args.torrents
+    )
+    fakes = {
+        "mal": FakeMAL(profile).start(),
+        "tmdb": FakeTMDB(profile).start(),
+        "toloka": FakeToloka(profile).start(),
+        "qbittorrent": FakeQBittorrent(qbittorrent_profile).start(),
+    }
+    workdir = tempfile.mkdtemp(prefix="toloka2web-load-")
+    prepare_workdir(workdir, fakes["qbittorrent"], args.torrents)
+    os.environ["MAL_API_BASE_URL"] = fakes["mal"].url
+    os.environ["TMDB_API_BASE_URL"] = fakes["tmdb"].url
+
+    print(f"MAL_API_BASE_URL={fakes['mal'].url}")
+    print(f"TMDB_API_BASE_URL={fakes['tmdb'].url}")
+    print(f"app.ini / titles.ini: {os.path.join(workdir, 'data')}")
+
+    stop = None
+    restore_toloka = None
+    base_url = args.target
+    try:
+        if base_url is None:
+            restore_toloka = redirect_toloka(fakes["toloka"].url)
+            stop = serve_in_process(workdir, args.server, args.port, args.api_key)
+            base_url = f"http://127.0.0.1:{args.port}"
+
+        report = run_load(
+            base_url.rstrip("/"),
+            MIXES[args.mix],
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_requests=args.requests,
+            headers={"X-API-Key": args.api_key},
+            image_base=fakes["toloka"].url,
+        )
+    finally:
+        if stop is not None:
+            stop()
+        if restore_toloka is not None:
+            restore_toloka()
+        for fake in fakes.values():
+            fake.stop()
+
+    report["config"] = {
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "server": "external" if args.target else args.server,
+        "upstream": vars(profile),
+    }
+    report["upstreams"] = {name: fake.stats() for name, fake in fakes.items()}
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+    if args.target is None:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -502,3 +502,56 @@ def test_search_auth_check_and_image_endpoints(
     image_response = client.get("/api/image?url=https://example.com")
     assert image_response.status_code == 200
     assert image_response.get_data() == b"image-bytes"
+
+
+def test_batch_endpoint_runs_sub_requests_with_shared_auth(app, client, monkeypatch):
+    _create_user(app, "batch-user", "password123", roles="user")
+    _login_session(client, "batch-user", "password123")
+
+    monkeypatch.setattr(
+        "app.services.services_db.DatabaseService.get_anime_by_id",
+        lambda anime_id: {"id": anime_id, "title": "Demo"},
+    )
+    monkeypatch.setattr(
+        "app.services.services_db.DatabaseService.get_related_animes",
+        lambda _anime_id: [{"id": 2, "title": "Related"}],
+    )
+    monkeypatch.setattr(
+        "app.services.services_db.DatabaseService.get_studios_by_anime_id",
+        lambda _anime_id: [{"id": 10, "name": "Studio"}],
+    )
+
+    response = client.post(
+        "/api/batch",
+        json={
+            "requests": [
+                {"id": "anime", "path": "/api/anime/1"},
+                {"id": "related", "path": "/api/anime/1/related"},
+                {"id": "studios", "path": "/api/anime/1/studios"},
+                {"id": "users", "path": "/api/users"},
+                {"id": "missing", "path": "/api/does-not-exist"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.get_json()}
+    assert list(results) == ["anime", "related", "studios", "users", "missing"]
+    assert results["anime"]["body"] == {"id": 1, "title": "Demo"}
+    assert results["related"]["body"][0]["id"] == 2
+    assert results["studios"]["body"][0]["name"] == "Studio"
+    assert results["users"]["status"] == 403
+    assert results["missing"]["status"] == 404
+
+
+def test_batch_endpoint_validation(client, api_key_headers):
+    assert client.post("/api/batch", json={"requests": []}).status_code == 401
+
+    for payload in (
+        {"requests": []},
+        {"requests": [{"path": "/login"}]},
+        {"requests": [{"path": "/api/batch"}]},
+        {"requests": [{"path": "/api/anime"}] * 21},
+    ):
+        response = client.post("/api/batch", json=payload, headers=api_key_headers)
+        assert response.status_code == 400
@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from app.asgi import PooledWsgiToAsgi, create_asgi_app
+from app.models.application_settings import ApplicationSettings
+from app.services.config_service import ConfigService
+from app.utils.metrics import REQUESTS, registry
+
+API_KEY_HEADERS = {"X-API-Key": "test-api-key"}
+
+
+def _set(key, value):
+    setting = ApplicationSettings.query.filter_by(key=key).first()
+    ConfigService.update_setting(setting.id, setting.section, key, value)
+
+
+def _request(gateway, path, upstream, headers=None):
+    """Issue one GET against the gateway with upstream HTTP served by `upstream`."""
+
+    async def _run():
+        gateway.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        transport = httpx.ASGITransport(app=gateway)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            try:
+                return await client.get(path, headers=headers)
+            finally:
+                await gateway.aclose()
+
+    return asyncio.run(_run())
+
+
+def test_mal_search_served_by_async_handler(app):
+    _set("mal_api", "mal-key")
+    seen = []
+
+    def upstream(request):
+        seen.append(request)
+        return httpx.Response(200, json={"data": [{"node": {"id": 1}}]})
+
+    response = _request(
+        create_asgi_app(app), "/api/mal/search?query=frieren", upstream, API_KEY_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"data": [{"node": {"id": 1}}]}
+    assert seen[0].headers["X-MAL-CLIENT-ID"] == "mal-key"
+    assert seen[0].url.params["q"] == "frieren"
+
+
+def test_async_handlers_require_auth_and_query(app):
+    def upstream(request):
+        raise AssertionError("upstream must not be called")
+
+    gateway = create_asgi_app(app)
+    response = _request(gateway, "/api/mal/search?query=x", upstream)
+    assert response.status_code == 401
+    assert response.json() == {"error": "Authentication required"}
+
+    response = _request(gateway, "/api/tmdb/search", upstream, API_KEY_HEADERS)
+    assert response.status_code == 400
+    assert response.json() == {"error": "Query parameter is required"}
+
+
+def test_multi_search_fans_out_concurrently(app, monkeypatch):
+    _set("mal_api", "mal-key")
+    _set("tmdb_api", "tmdb-key")
+    monkeypatch.setattr(
+        "app.services.services.DatabaseService.get_anime_by_name", lambda query: []
+    )
+    in_flight = {"now": 0, "max": 0}
+
+    async def upstream(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+        if "myanimelist" in request.url.host:
+            return httpx.Response(200, json={"data": []})
+        if request.url.path.endswith("/search/multi"):
+            return httpx.Response(200, json={"results": []})
+        return httpx.Response(404)
+
+    response = _request(
+        create_asgi_app(app), "/api/search?query=frieren", upstream, API_KEY_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert in_flight["max"] == 2
+
+
+def test_image_proxy_streams_upstream_body(app):
+    def upstream(request):
+        assert request.url.host == "toloka.to"
+        return httpx.Response(
+            200, content=b"\x89PNG-data", headers={"Content-Type": "image/png"}
+        )
+
+    response = _request(
+        create_asgi_app(app), "/image/?url=https://toloka.to/pic.png", upstream
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == b"\x89PNG-data"
+
+
+def test_other_routes_fall_through_to_flask(app):
+    def upstream(request):
+        raise AssertionError("upstream must not be called")
+
+    response = _request(create_asgi_app(app), "/api/profile", upstream, API_KEY_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["auth_type"] == "api_key"
+
+
+def test_native_routes_run_flask_response_hooks(app):
+    _set("mal_api", "mal-key")
+    registry.clear()
+    items = [{"node": {"id": i, "title": f"Title {i}"}} for i in range(100)]
+
+    def upstream(request):
+        return httpx.Response(200, json={"data": items})
+
+    response = _request(
+        create_asgi_app(app),
+        "/api/mal/search?query=frieren",
+        upstream,
+        {**API_KEY_HEADERS, "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert response.json() == {"data": items}
+    # Counted under the endpoint of the matching Flask route
+    assert [
+        endpoint
+        for (_, endpoint, _, status), count in REQUESTS.samples().items()
+        if status == "200"
+    ] == ["api.mal_mal_search"]
+
+
+def test_native_and_flask_routes_share_auth(app, client, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.services.SearchService.multi_search", lambda query: {}
+    )
+
+    def upstream(request):
+        return httpx.Response(200, json={"data": [], "results": []})
+
+    for path in ("/api/search?query=x", "/api/mal/search?query=x"):
+        for headers in ({}, API_KEY_HEADERS):
+            native = _request(create_asgi_app(app), path, upstream, headers)
+            assert native.status_code == client.get(path, headers=headers).status_code
+
+
+class _Stream:
+    """WSGI response iterable yielding until closed."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+        self.threads = set()
+
+    def __iter__(self):
+        while not self.closed.is_set():
+            self.threads.add(threading.current_thread().name)
+            yield b"data: ping\n\n"
+            time.sleep(0.01)
+
+    def close(self):
+        self.closed.set()
+
+
+def test_wsgi_stream_runs_on_its_pool_and_is_closed_on_disconnect():
+    stream = _Stream()
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/event-stream")])
+        return stream
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-stream")
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/releases/events",
+        "http_version": "1.1",
+        "query_string": b"",
+        "headers": [],
+    }
+    chunks = []
+
+    async def _run():
+        messages = asyncio.Queue()
+        await messages.put({"type": "http.request", "body": b""})
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                chunks.append(message["body"])
+                if len(chunks) == 3:
+                    await messages.put({"type": "http.disconnect"})
+
+        await asyncio.wait_for(
+            PooledWsgiToAsgi(wsgi_app, executor)(scope, messages.get, send), 5
+        )
+
+    try:
+        asyncio.run(_run())
+    finally:
+        executor.shutdown()
+
+    assert stream.closed.is_set()
+    assert len(chunks) >= 3
+    assert {name.split("_")[0] for name in stream.threads} == {"test-stream"}
@@ -139,3 +139,74 @@ def test_api_auth_me_with_jwt(client, existing_user):
     assert response.status_code == 200
     payload = response.get_json()
     assert payload["username"] == "tester"
+
+
+def test_logout_revokes_token_for_all_auth_paths(client, existing_user):
+    token = _get_access_token(client, "tester", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    assert client.get("/api/profile", headers=headers).status_code == 401
+
+
+def test_revocation_cache_picks_up_tokens_revoked_by_other_workers(app, monkeypatch):
+    from app.models.revoked_token import RevokedToken
+
+    RevokedToken.load_cache()
+    assert not RevokedToken.is_token_revoked("other-worker-jti")
+
+    # Simulate another process writing directly to the shared database
+    db.session.add(RevokedToken(jti="other-worker-jti"))
+    db.session.commit()
+    assert not RevokedToken.is_token_revoked("other-worker-jti")
+
+    monkeypatch.setattr(RevokedToken, "SYNC_INTERVAL", 0)
+    assert RevokedToken.is_token_revoked("other-worker-jti")
+
+
+def test_removed_tokens_reload_the_revocation_cache_of_other_workers(app, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.revoked_token import RevokedToken
+
+    monkeypatch.setattr(RevokedToken, "SYNC_INTERVAL", 0)
+    old = datetime.now(timezone.utc) - timedelta(days=40)
+    db.session.add(RevokedToken(jti="kept-jti"))
+    db.session.add(RevokedToken(jti="expired-jti", revoked_at=old))
+    db.session.commit()
+    assert RevokedToken.is_token_revoked("expired-jti")
+
+    # Another worker removes the newest row; SQLite hands out its id again
+    assert RevokedToken.cleanup_expired_tokens(max_age_days=30) == 1
+    monkeypatch.setattr(RevokedToken, "_cached_jtis", {"kept-jti", "expired-jti"})
+    monkeypatch.setattr(RevokedToken, "_cached_max_id", 2)
+    monkeypatch.setattr(RevokedToken, "_cache_version", 0)
+    db.session.add(RevokedToken(jti="reused-id-jti"))
+    db.session.commit()
+
+    assert RevokedToken.is_token_revoked("reused-id-jti")
+    assert not RevokedToken.is_token_revoked("expired-jti")
+
+
+def test_identity_resolved_once_per_request(client, existing_user, monkeypatch):
+    from app.utils import auth_utils
+
+    calls = []
+    original = auth_utils._resolve_identity
+
+    def _counting_resolve():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(auth_utils, "_resolve_identity", _counting_resolve)
+    token = _get_access_token(client, "tester", "password123")
+
+    response = client.get("/api/profile", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.get_json()["auth_type"] == "jwt"
+    assert len(calls) == 1
+
+    response = client.get("/api/profile", headers={"X-API-Key": "test-api-key"})
+    assert response.get_json() == {"auth_type": "api_key", "roles": "admin"}
+    assert len(calls) == 2
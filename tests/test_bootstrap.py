@@ -0,0 +1,131 @@
+import os
+import threading
+import types
+
+from app.models.application_settings import ApplicationSettings
+from app.services import bootstrap_service
+from app.services.bootstrap_service import BootstrapService
+from app.services.health_service import HealthService
+from app.services.services_db import DatabaseService
+
+
+def _isolate_assets(monkeypatch, tmp_path):
+    assets = {
+        "anime_data.db": str(tmp_path / "anime_data.db"),
+        "app.ini": str(tmp_path / "app.ini"),
+        "titles.ini": str(tmp_path / "titles.ini"),
+    }
+    (tmp_path / "titles.ini").write_text("", encoding="utf-8")
+    monkeypatch.setattr(BootstrapService, "ASSETS", assets)
+    monkeypatch.setattr(BootstrapService, "_present", set())
+    monkeypatch.setattr(BootstrapService, "_downloading", set())
+    monkeypatch.setattr(BootstrapService, "_errors", {})
+    monkeypatch.setattr(BootstrapService, "_thread", None)
+    monkeypatch.setattr(BootstrapService, "_pid", None)
+    return assets
+
+
+def _start_blocked_download(app, monkeypatch, assets):
+    """Start a bootstrap whose downloads wait for the returned event."""
+    release = threading.Event()
+
+    def _fake_get(url, timeout):
+        release.wait(5)
+        raise RuntimeError("offline")
+
+    def _fake_update_database():
+        release.wait(5)
+        return {"status": "error", "message": "offline"}
+
+    monkeypatch.setattr(bootstrap_service.requests, "get", _fake_get)
+    monkeypatch.setattr(DatabaseService, "update_database", _fake_update_database)
+    monkeypatch.setattr(
+        bootstrap_service.ConfigService, "init_settings_if_empty", lambda: None
+    )
+    assert BootstrapService.start(app) == ["app.ini", "anime_data.db"]
+    return release
+
+
+def test_catalogue_reports_warming_up_until_downloaded(
+    app, client, monkeypatch, tmp_path
+):
+    _isolate_assets(monkeypatch, tmp_path)
+    monkeypatch.setattr(DatabaseService, "Session", None)
+    monkeypatch.setattr(
+        DatabaseService, "DATABASE_PATH", str(tmp_path / "anime_data.db")
+    )
+    headers = {"X-API-Key": "test-api-key"}
+
+    response = client.get("/api/anime", headers=headers)
+    assert response.status_code == 503
+    assert response.get_json()["error"]["code"] == "WARMING_UP"
+    assert response.headers["Retry-After"]
+
+    HealthService.run_probes(app)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    payload = response.get_json()
+    assert payload["status"] == "warming_up"
+    assert payload["dependencies"]["anime_data_db"]["status"] == "warming_up"
+    assert payload["assets"]["anime_data.db"]["state"] == "missing"
+    assert payload["assets"]["titles.ini"]["present"] is True
+
+    assert client.get("/healthz").status_code == 200
+
+
+def test_start_downloads_in_background(app, monkeypatch, tmp_path):
+    assets = _isolate_assets(monkeypatch, tmp_path)
+    release = threading.Event()
+
+    def _fake_get(url, timeout):
+        release.wait(5)
+        return types.SimpleNamespace(
+            content=b"[Toloka]\nusername = demo\n", raise_for_status=lambda: None
+        )
+
+    def _fake_update_database():
+        with open(assets["anime_data.db"], "wb") as f:
+            f.write(b"")
+        return {"status": "success", "message": "ok"}
+
+    monkeypatch.setattr(bootstrap_service.requests, "get", _fake_get)
+    monkeypatch.setattr(DatabaseService, "update_database", _fake_update_database)
+    monkeypatch.setattr(DatabaseService, "initialize_database", lambda: True)
+    seeded = []
+    monkeypatch.setattr(
+        bootstrap_service.ConfigService,
+        "init_settings_if_empty",
+        lambda: seeded.append(ApplicationSettings.query.count() >= 0),
+    )
+
+    assert BootstrapService.start(app) == ["app.ini", "anime_data.db"]
+    status = BootstrapService.status()
+    assert not status["ready"]
+    assert status["assets"]["app.ini"]["state"] == "downloading"
+
+    release.set()
+    BootstrapService._thread.join(5)
+
+    assert BootstrapService.status()["ready"]
+    assert seeded == [True]
+
+
+def test_forked_worker_ignores_the_masters_download_state(app, monkeypatch, tmp_path):
+    assets = _isolate_assets(monkeypatch, tmp_path)
+    release = _start_blocked_download(app, monkeypatch, assets)
+    master_pid = os.getpid()
+    try:
+        assert BootstrapService.status()["assets"]["app.ini"]["state"] == "downloading"
+
+        # In a worker forked now, the master's download thread does not exist
+        monkeypatch.setattr(bootstrap_service.os, "getpid", lambda: master_pid + 1)
+        assert BootstrapService.status()["assets"]["app.ini"]["state"] == "missing"
+
+        # Files the master moves into place are picked up from the disk
+        for name in ("app.ini", "anime_data.db"):
+            with open(assets[name], "wb"):
+                pass
+        assert BootstrapService.status()["ready"]
+    finally:
+        release.set()
+        BootstrapService._thread.join(5)
@@ -0,0 +1,211 @@
+import threading
+import time
+import types
+
+from sqlalchemy import event
+
+from app.models.application_settings import ApplicationSettings
+from app.models.base import db
+from app.services.base_service import BaseService
+from app.services.config_service import ConfigService
+from app.services.services import TolokaService
+
+
+def _count_queries(engine):
+    statements = []
+
+    def _before_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    return statements, lambda: event.remove(
+        engine, "before_cursor_execute", _before_execute
+    )
+
+
+def _set(key, value):
+    setting = ApplicationSettings.query.filter_by(key=key).first()
+    ConfigService.update_setting(setting.id, setting.section, key, value)
+
+
+def test_settings_cache_serves_reads_without_queries(app):
+    _set("mal_api", "mal-key")
+    assert BaseService.get_api_key("mal_api") == "mal-key"
+
+    statements, stop = _count_queries(db.engine)
+    try:
+        for _ in range(10):
+            assert BaseService.get_api_key("mal_api") == "mal-key"
+            assert BaseService.get_api_key("tmdb_api") == ""
+            assert BaseService.get_api_key("missing_api") is None
+    finally:
+        stop()
+    assert statements == []
+
+
+def test_settings_cache_invalidated_on_write(app):
+    ConfigService.add_new_setting("Toloka", "default_meta", "[WEB]")
+    assert ConfigService.get_release_defaults() == {"default_meta": "[WEB]"}
+
+    setting = ApplicationSettings.query.filter_by(key="default_meta").first()
+    ConfigService.update_setting(setting.id, "Toloka", "default_meta", "[BD]")
+    assert ConfigService.get_release_defaults() == {"default_meta": "[BD]"}
+
+    ConfigService.delete_setting(setting.id)
+    assert ConfigService.get_release_defaults() == {"default_meta": ""}
+
+
+def test_settings_cache_follows_version_bumped_by_other_worker(app, monkeypatch):
+    from app.models.cache_version import CacheVersion
+
+    _set("open_registration", "False")
+    assert ApplicationSettings.get_bool("open_registration") is False
+
+    # Another process updates the row and bumps the shared version counter
+    setting = ApplicationSettings.query.filter_by(key="open_registration").first()
+    setting.value = "True"
+    db.session.commit()
+    CacheVersion.bump(ApplicationSettings.__tablename__)
+
+    monkeypatch.setattr(ApplicationSettings, "SYNC_INTERVAL", 0)
+    assert ApplicationSettings.get_bool("open_registration") is True
+
+
+API_KEY_HEADERS = {"X-API-Key": "test-api-key"}
+
+
+def test_versioned_endpoint_answers_304_without_running_view(
+    client, monkeypatch, tmp_path
+):
+    from app.services.services_db import DatabaseService
+
+    catalogue = tmp_path / "anime_data.db"
+    catalogue.write_bytes(b"v1")
+    monkeypatch.setattr(DatabaseService, "DATABASE_PATH", str(catalogue))
+    calls = []
+    monkeypatch.setattr(
+        DatabaseService,
+        "list_all_anime",
+        lambda: calls.append(1) or [{"id": 1, "title": "Demo"}],
+    )
+
+    first = client.get("/api/anime", headers=API_KEY_HEADERS)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get(
+        "/api/anime", headers={**API_KEY_HEADERS, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert len(calls) == 1
+
+    # Replacing the catalogue file changes the version and the ETag
+    catalogue.write_bytes(b"v2-updated")
+    refreshed = client.get(
+        "/api/anime", headers={**API_KEY_HEADERS, "If-None-Match": etag}
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_large_json_responses_are_gzipped_with_matching_etag(client, monkeypatch):
+    import gzip
+
+    titles = {f"release-{i}": {"title": "Release " * 20} for i in range(50)}
+    monkeypatch.setattr(
+        "app.services.services.TolokaService.get_titles_with_torrent_status",
+        lambda: titles,
+    )
+
+    headers = {**API_KEY_HEADERS, "Accept-Encoding": "gzip"}
+    response = client.get("/api/releases", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"')
+    assert len(gzip.decompress(response.data)) > len(response.data)
+
+    cached = client.get("/api/releases", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    plain = client.get("/api/releases", headers=API_KEY_HEADERS)
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_json() == titles
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get(
+        "/api/profile", headers={**API_KEY_HEADERS, "Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"]
+
+
+def test_toloka_search_cached_and_coalesced(app, monkeypatch):
+    TolokaService.SEARCH_CACHE.invalidate()
+    calls = []
+    release = threading.Event()
+
+    def search_torrents(config):
+        calls.append(config.args)
+        release.wait(5)
+        return types.SimpleNamespace(response={"results": [config.args]})
+
+    monkeypatch.setattr("app.services.services.search_torrents", search_torrents)
+    monkeypatch.setattr(
+        TolokaService,
+        "initiate_config",
+        classmethod(lambda cls: types.SimpleNamespace()),
+    )
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda q=q: results.append(TolokaService.get_torrents_logic(q))
+        )
+        for q in ("Frieren", " frieren ", "FRIEREN")
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"results": [calls[0]]}] * 3
+
+    # Served from cache afterwards
+    assert TolokaService.get_torrents_logic("frieren") == {"results": [calls[0]]}
+    assert len(calls) == 1
+    TolokaService.SEARCH_CACHE.invalidate()
+
+
+def test_toloka_search_retry_backs_off_and_errors_are_not_cached(app, monkeypatch):
+    TolokaService.SEARCH_CACHE.invalidate()
+    responses = iter([{"retry_suggested": True}, {"retry_suggested": True}])
+    sleeps = []
+
+    monkeypatch.setattr(
+        "app.services.services.search_torrents",
+        lambda config: types.SimpleNamespace(
+            response=next(responses, {"results": ["ok"]})
+        ),
+    )
+    monkeypatch.setattr(
+        TolokaService,
+        "initiate_config",
+        classmethod(lambda cls: types.SimpleNamespace()),
+    )
+    monkeypatch.setattr("app.services.services.time.sleep", sleeps.append)
+
+    result = TolokaService.get_torrents_logic("frieren")
+    assert result["error"] is True
+    assert len(sleeps) == 1
+    assert 0 <= sleeps[0] <= TolokaService.SEARCH_RETRY_BASE_DELAY
+
+    assert TolokaService.get_torrents_logic("frieren") == {"results": ["ok"]}
+    TolokaService.SEARCH_CACHE.invalidate()
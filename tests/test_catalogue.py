@@ -0,0 +1,300 @@
+import os
+import sqlite3
+
+import pytest
+
+from app.services.services_db import DatabaseService
+
+# The app fixture disables catalogue loading; keep the real initializer
+initialize_database = DatabaseService.initialize_database
+
+MAPPED = (
+    "Anime",
+    "Type",
+    "Status",
+    "Franchise",
+    "RelatedAnime",
+    "Fundub",
+    "FundubSynonym",
+    "AnimeFundub",
+    "Episode",
+    "Session",
+    "engine",
+    "DATABASE_PATH",
+    "_engine_version",
+    "_views",
+)
+
+SCHEMA = """
+CREATE TABLE status (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE type (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE franchise (id INTEGER PRIMARY KEY, weight INTEGER);
+CREATE TABLE anime (
+    id INTEGER PRIMARY KEY, titleUa TEXT, titleEn TEXT, description TEXT,
+    releaseDate TEXT, episodeTime TEXT, moonId TEXT, episodesAired INTEGER,
+    ashdiId TEXT, malId TEXT, season INTEGER,
+    type_id INTEGER REFERENCES type(id),
+    status_id INTEGER REFERENCES status(id),
+    franchise_id INTEGER REFERENCES franchise(id)
+);
+CREATE TABLE related_anime (
+    anime_id1 INTEGER REFERENCES anime(id),
+    anime_id2 INTEGER REFERENCES anime(id),
+    franchise_id INTEGER REFERENCES franchise(id),
+    PRIMARY KEY (anime_id1, anime_id2)
+);
+CREATE TABLE fundub (id INTEGER PRIMARY KEY, name TEXT, telegram TEXT);
+CREATE TABLE fundub_synonym (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, fundub_id INTEGER, synonym TEXT
+);
+CREATE TABLE anime_fundub (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, anime_id INTEGER, fundub_id INTEGER
+);
+CREATE TABLE episode (
+    id INTEGER PRIMARY KEY, episode INTEGER, subtitles BOOLEAN, player INTEGER,
+    anime_id INTEGER REFERENCES anime(id), videoUrl TEXT
+);
+
+INSERT INTO status VALUES (1, 'Завершений'), (2, 'Онґоїнґ');
+INSERT INTO type VALUES (1, 'TV'), (2, 'Movie');
+INSERT INTO franchise VALUES (1, 3), (2, 1);
+INSERT INTO anime
+    (id, titleUa, titleEn, releaseDate, season, type_id, status_id, franchise_id)
+VALUES
+    (1, 'Перший', 'First', '2020', 1, 1, 1, 1),
+    (2, 'Другий', 'Second', '2022', 2, 1, 2, 1),
+    (3, 'Фільм', 'Movie', '2021', NULL, 2, 1, 1),
+    (4, 'Окремий', 'Standalone', '2023', 1, 1, 2, 2);
+INSERT INTO related_anime VALUES (1, 2, 1), (1, 3, 1), (2, 1, 1), (3, 1, 1);
+INSERT INTO fundub VALUES (1, 'Studio A', 'https://t.me/a'), (2, 'Studio B', NULL);
+INSERT INTO fundub_synonym (fundub_id, synonym) VALUES (1, 'A-team');
+INSERT INTO anime_fundub (anime_id, fundub_id) VALUES (1, 1), (1, 2), (1, 2), (4, 2);
+INSERT INTO episode VALUES
+    (1, 1, 0, 1, 1, 'https://video/1'), (2, 2, 0, 1, 1, 'https://video/2');
+"""
+
+
+@pytest.fixture()
+def catalogue(tmp_path, monkeypatch):
+    """DatabaseService mapped to a small catalogue with a franchise of three."""
+    path = tmp_path / "anime_data.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.close()
+
+    for name in MAPPED:
+        monkeypatch.setattr(DatabaseService, name, getattr(DatabaseService, name))
+    monkeypatch.setattr(DatabaseService, "DATABASE_PATH", str(path))
+    # Also used to reopen a replaced catalogue
+    monkeypatch.setattr(DatabaseService, "initialize_database", initialize_database)
+    DatabaseService.FULL_CACHE.invalidate()
+    assert initialize_database()
+    yield DatabaseService
+    DatabaseService.FULL_CACHE.invalidate()
+    DatabaseService.engine.dispose()
+
+
+def test_views_are_built_on_first_use(catalogue):
+    assert catalogue._views is None
+    graph = catalogue.get_graph()
+    assert catalogue._views[0] is graph
+    assert catalogue.get_graph() is graph
+
+
+def test_anime_full_matches_separate_queries(catalogue):
+    full = catalogue.get_anime_full(1)
+
+    assert full["anime"] == catalogue.get_anime_by_id(1)
+    assert full["anime"]["type"]["name"] == "TV"
+    assert sorted(a["id"] for a in full["related"]) == [2, 3]
+    assert sorted(full["related"], key=lambda a: a["id"]) == sorted(
+        catalogue.get_related_animes(1), key=lambda a: a["id"]
+    )
+    assert full["studios"] == catalogue.get_studios_by_anime_id(1)
+    assert [e["episode"] for e in full["episodes"]] == [1, 2]
+    assert catalogue.get_anime_full(404) is None
+
+
+def test_anime_full_is_cached_per_catalogue_version(catalogue, monkeypatch):
+    loads = []
+    load = catalogue._load_anime_full.__func__
+    monkeypatch.setattr(
+        DatabaseService,
+        "_load_anime_full",
+        classmethod(
+            lambda cls, anime_id: loads.append(anime_id) or load(cls, anime_id)
+        ),
+    )
+
+    assert catalogue.get_anime_full(4) == catalogue.get_anime_full(4)
+    assert loads == [4]
+
+    monkeypatch.setattr(DatabaseService, "data_version", lambda: "replaced")
+    catalogue.get_anime_full(4)
+    assert loads == [4, 4]
+
+
+def test_anime_full_endpoint(client, catalogue):
+    headers = {"X-API-Key": "test-api-key"}
+
+    response = client.get("/api/anime/2/full", headers=headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["anime"]["titleEn"] == "Second"
+    assert [a["id"] for a in body["related"]] == [1]
+    assert body["studios"] == [] and body["episodes"] == []
+    assert response.headers["ETag"]
+
+    assert client.get("/api/anime/404/full", headers=headers).status_code == 404
+    assert client.get("/api/anime/2/full").status_code == 401
+
+
+def test_franchise_is_transitive_and_ordered(catalogue):
+    # 3 is only related to 1, yet belongs to the franchise of 2
+    franchise = catalogue.get_franchise(2)
+    assert [anime["id"] for anime in franchise] == [1, 2, 3]
+    assert catalogue.get_franchise(3) == franchise
+    assert [anime["id"] for anime in catalogue.get_franchise(4)] == [4]
+    assert catalogue.get_franchise(404) is None
+    assert [anime["id"] for anime in catalogue.get_related_animes(2)] == [1]
+
+
+def test_graph_rebuilt_when_catalogue_changes(catalogue):
+    graph = catalogue.get_graph()
+    assert catalogue.get_graph() is graph
+
+    connection = sqlite3.connect(catalogue.DATABASE_PATH)
+    connection.execute("INSERT INTO related_anime VALUES (3, 4, NULL)")
+    connection.commit()
+    connection.close()
+    # Same size and mtime resolution could hide the change; force a new version
+    os.utime(catalogue.DATABASE_PATH, ns=(0, 0))
+
+    assert catalogue.get_graph() is not graph
+    assert sorted(anime["id"] for anime in catalogue.get_franchise(4)) == [1, 2, 3, 4]
+
+
+def _replacement_catalogue(directory):
+    """Catalogue file like SCHEMA with anime 4 renamed and related to 1."""
+    path = directory / "anime_data.db.new"
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.execute("UPDATE anime SET titleEn = 'Renamed' WHERE id = 4")
+    connection.execute("INSERT INTO related_anime VALUES (1, 4, NULL)")
+    connection.execute("INSERT INTO anime_fundub (anime_id, fundub_id) VALUES (2, 1)")
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _assert_serves_replacement(catalogue):
+    assert catalogue.get_anime_by_id(4)["titleEn"] == "Renamed"
+    assert catalogue.get_anime_full(4)["anime"]["titleEn"] == "Renamed"
+    assert sorted(anime["id"] for anime in catalogue.get_franchise(4)) == [1, 2, 3, 4]
+    assert catalogue.search_studio_by_id(1)["title_count"] == 2
+    assert [a["id"] for a in catalogue.get_anime_by_studio_id(1)] == [1, 2]
+
+
+def test_replaced_catalogue_is_reopened(catalogue, tmp_path):
+    # Warm the pool, the views and the aggregate cache on the old file
+    assert catalogue.get_anime_by_id(4)["titleEn"] == "Standalone"
+    assert catalogue.get_anime_full(4)["anime"]["titleEn"] == "Standalone"
+    old_engine = catalogue.engine
+
+    # Another process (e.g. a worker running update_database) swaps the file
+    os.replace(_replacement_catalogue(tmp_path), catalogue.DATABASE_PATH)
+
+    _assert_serves_replacement(catalogue)
+    assert catalogue.engine is not old_engine
+    assert catalogue.get_graph().version == catalogue.data_version()
+
+
+def test_update_database_reopens_catalogue(catalogue, tmp_path, monkeypatch):
+    content = _replacement_catalogue(tmp_path).read_bytes()
+    assert catalogue.get_anime_by_id(4)["titleEn"] == "Standalone"
+
+    class _Download:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            return [content]
+
+    monkeypatch.setattr(
+        "app.services.services_db.requests.get", lambda *args, **kwargs: _Download()
+    )
+    assert catalogue.update_database()["status"] == "success"
+    # Reopened by update_database itself, not on the next version check
+    assert catalogue._engine_version == catalogue.data_version()
+    _assert_serves_replacement(catalogue)
+
+
+def test_franchise_endpoint(client, catalogue):
+    headers = {"X-API-Key": "test-api-key"}
+
+    response = client.get("/api/anime/1/franchise", headers=headers)
+    assert response.status_code == 200
+    assert [anime["titleEn"] for anime in response.get_json()] == [
+        "First",
+        "Second",
+        "Movie",
+    ]
+    assert client.get("/api/anime/404/franchise", headers=headers).status_code == 404
+
+
+def test_studio_summaries(catalogue):
+    studios = {studio["id"]: studio for studio in catalogue.list_all_studios()}
+
+    assert studios[1]["name"] == "Studio A"
+    assert studios[1]["synonyms"] == ["A-team"]
+    assert (studios[1]["title_count"], studios[1]["ongoing_count"]) == (1, 0)
+    # Duplicate anime_fundub rows count once
+    assert (studios[2]["title_count"], studios[2]["ongoing_count"]) == (2, 1)
+    assert studios[2]["latest_release"] == "2023"
+    assert [a["id"] for a in catalogue.get_anime_by_studio_id(2)] == [1, 4]
+    assert catalogue.search_studio_by_id(2) == studios[2]
+    assert catalogue.search_studio_by_id(404) is None
+    assert [s["id"] for s in catalogue.search_studio_by_name("a-TEAM")] == [1]
+    assert [s["id"] for s in catalogue.search_studio_by_name("studio")] == [1, 2]
+
+
+def test_studio_ongoing_count_uses_status_id(catalogue):
+    connection = sqlite3.connect(catalogue.DATABASE_PATH)
+    connection.execute("UPDATE status SET name = 'Ongoing' WHERE id = 2")
+    connection.commit()
+    connection.close()
+
+    _, studio_view = catalogue.build_views()
+    assert studio_view.summary(2)["ongoing_count"] == 1
+
+
+def test_studio_endpoints(client, catalogue):
+    headers = {"X-API-Key": "test-api-key"}
+
+    listing = client.get("/api/studio", headers=headers).get_json()
+    assert [(s["name"], s["title_count"]) for s in listing] == [
+        ("Studio A", 1),
+        ("Studio B", 2),
+    ]
+    detail = client.get("/api/studio/2", headers=headers).get_json()
+    assert detail["ongoing_count"] == 1
+    titles = client.get("/api/studio/2/anime", headers=headers).get_json()
+    assert [a["titleEn"] for a in titles] == ["First", "Standalone"]
+
+
+def test_studio_endpoints_follow_replaced_catalogue(client, catalogue, tmp_path):
+    headers = {"X-API-Key": "test-api-key"}
+    assert client.get("/api/studio/1", headers=headers).get_json()["title_count"] == 1
+
+    os.replace(_replacement_catalogue(tmp_path), catalogue.DATABASE_PATH)
+
+    detail = client.get("/api/studio/1", headers=headers).get_json()
+    assert detail["title_count"] == 2
+    titles = client.get("/api/studio/1/anime", headers=headers).get_json()
+    assert [a["titleEn"] for a in titles] == ["First", "Second"]
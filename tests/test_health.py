@@ -0,0 +1,127 @@
+import os
+import threading
+
+from app.services import bootstrap_service
+from app.services.bootstrap_service import BootstrapService
+from app.services.health_service import HealthService
+from app.services.services import TolokaService
+from app.services.services_db import DatabaseService
+
+
+def test_healthz_is_always_ok(client):
+    response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ok"
+
+
+def test_readyz_is_starting_before_first_probe(client):
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    payload = response.get_json()
+    assert payload["status"] == "starting"
+    assert payload["dependencies"]["toloka"] == {"status": "pending"}
+
+
+def _all_assets_present(monkeypatch):
+    monkeypatch.setattr(BootstrapService, "_present", set(BootstrapService.ASSETS))
+
+
+def test_readyz_serves_cached_probe_results(app, client, monkeypatch):
+    _all_assets_present(monkeypatch)
+    calls = []
+    monkeypatch.setattr(DatabaseService, "ping", lambda: calls.append("catalogue"))
+    monkeypatch.setattr(
+        TolokaService, "probe_torrent_client", lambda: calls.append("torrent")
+    )
+
+    def _toloka_down():
+        calls.append("toloka")
+        raise ConnectionError("login failed")
+
+    monkeypatch.setattr(TolokaService, "probe_toloka", _toloka_down)
+
+    HealthService.run_probes(app)
+    assert sorted(calls) == ["catalogue", "toloka", "torrent"]
+
+    response = client.get("/readyz")
+    response_again = client.get("/readyz")
+
+    # Upstream failures degrade but keep the instance in rotation
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["status"] == "degraded"
+    assert payload["dependencies"]["toloka2web_db"]["status"] == "ok"
+    assert payload["dependencies"]["toloka"]["error"] == "login failed"
+    assert response_again.status_code == 200
+    # Requests only read cached results
+    assert len(calls) == 3
+
+
+def test_critical_probe_failure_is_unavailable(app, client, monkeypatch):
+    _all_assets_present(monkeypatch)
+
+    def _broken():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(DatabaseService, "ping", _broken)
+    monkeypatch.setattr(TolokaService, "probe_torrent_client", lambda: None)
+    monkeypatch.setattr(TolokaService, "probe_toloka", lambda: None)
+
+    HealthService.run_probes(app)
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "unavailable"
+
+
+def test_forked_worker_becomes_ready_after_first_boot_download(
+    app, client, monkeypatch, tmp_path
+):
+    assets = {name: str(tmp_path / name) for name in BootstrapService.ASSETS}
+    (tmp_path / "titles.ini").write_text("", encoding="utf-8")
+    monkeypatch.setattr(BootstrapService, "ASSETS", assets)
+    for name, value in (("_present", set()), ("_downloading", set()), ("_errors", {})):
+        monkeypatch.setattr(BootstrapService, name, value)
+    monkeypatch.setattr(BootstrapService, "_thread", None)
+    monkeypatch.setattr(BootstrapService, "_pid", None)
+
+    # First boot: the master starts the downloads (preload_app), then forks
+    release = threading.Event()
+    monkeypatch.setattr(
+        bootstrap_service.requests,
+        "get",
+        lambda url, timeout: release.wait(5) and None,
+    )
+    monkeypatch.setattr(
+        DatabaseService,
+        "update_database",
+        lambda: release.wait(5) and {"status": "error", "message": "offline"},
+    )
+    monkeypatch.setattr(
+        bootstrap_service.ConfigService, "init_settings_if_empty", lambda: None
+    )
+    BootstrapService.start(app)
+    master_pid = os.getpid()
+    monkeypatch.setattr(bootstrap_service.os, "getpid", lambda: master_pid + 1)
+
+    monkeypatch.setattr(DatabaseService, "ping", lambda: None)
+    monkeypatch.setattr(TolokaService, "probe_torrent_client", lambda: None)
+    monkeypatch.setattr(TolokaService, "probe_toloka", lambda: None)
+    try:
+        HealthService.run_probes(app)
+        assert client.get("/readyz").get_json()["status"] == "warming_up"
+
+        # The master's download thread moves the files into place
+        for name in ("app.ini", "anime_data.db"):
+            with open(assets[name], "wb"):
+                pass
+        HealthService.run_probes(app)
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "ready"
+    finally:
+        release.set()
+        BootstrapService._thread.join(5)
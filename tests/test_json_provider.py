@@ -0,0 +1,77 @@
+import dataclasses
+import datetime
+import enum
+import json
+import types
+
+from app.utils.json_provider import OrjsonProvider, dumps, register_encoder
+
+
+class Status(enum.Enum):
+    SEEDING = "seeding"
+
+
+@dataclasses.dataclass
+class Episode:
+    number: int
+    aired: datetime.date
+
+
+class Torrent:
+    def __init__(self):
+        self.name = "Title"
+        self.status = Status.SEEDING
+        self.episodes = [Episode(1, datetime.date(2024, 1, 7))]
+        self.tags = {"anime"}
+        self._client = object()
+
+
+def test_dumps_encodes_library_objects():
+    data = json.loads(
+        dumps(
+            {
+                "torrents": [Torrent()],
+                "added": datetime.datetime(2024, 1, 7, 12, 30),
+                1: ("a", "b"),
+            }
+        )
+    )
+
+    assert data == {
+        "torrents": [
+            {
+                "name": "Title",
+                "status": "seeding",
+                "episodes": [{"number": 1, "aired": "2024-01-07"}],
+                "tags": ["anime"],
+            }
+        ],
+        "added": "2024-01-07T12:30:00",
+        "1": ["a", "b"],
+    }
+
+
+def test_registered_encoder_takes_precedence():
+    class Magnet:
+        def __init__(self, info_hash):
+            self.info_hash = info_hash
+
+    register_encoder(Magnet, lambda magnet: f"magnet:?xt=urn:btih:{magnet.info_hash}")
+
+    assert json.loads(dumps([Magnet("abc")])) == ["magnet:?xt=urn:btih:abc"]
+
+
+def test_jsonify_and_stream_endpoints_use_provider(app, client, monkeypatch):
+    assert isinstance(app.json, OrjsonProvider)
+
+    monkeypatch.setattr(
+        "app.services.services.StreamingService.search_titles_from_streaming_site",
+        lambda query: [types.SimpleNamespace(title=query, provider="demo")],
+    )
+    response = client.get(
+        "/api/stream?query=frieren", headers={"X-API-Key": "test-api-key"}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_json() == [{"provider": "demo", "title": "frieren"}]
@@ -0,0 +1,37 @@
+import sys
+
+from app.utils.lazy_import import import_profile, lazy_attr, lazy_module
+
+
+def _write_module(tmp_path, monkeypatch, name):
+    (tmp_path / f"{name}.py").write_text(
+        "LOADS = []\nLOADS.append(1)\n\ndef double(x):\n    return 2 * x\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def test_lazy_module_imports_on_first_attribute_access(tmp_path, monkeypatch):
+    _write_module(tmp_path, monkeypatch, "lazy_probe_module")
+
+    module = lazy_module("lazy_probe_module")
+    assert "lazy_probe_module" not in sys.modules
+    assert "deferred" in repr(module)
+
+    assert module.double(3) == 6
+    assert module.LOADS == [1]
+    assert "lazy_probe_module" in sys.modules
+    assert "lazy_probe_module" in import_profile()
+
+
+def test_lazy_attr_resolves_once_when_called(tmp_path, monkeypatch):
+    _write_module(tmp_path, monkeypatch, "lazy_probe_attr")
+
+    double = lazy_attr("lazy_probe_attr", "double")
+    assert "lazy_probe_attr" not in sys.modules
+
+    assert double(4) == 8
+    assert double(5) == 10
+    assert double.__name__ == "double"
+    assert sys.modules["lazy_probe_attr"].LOADS == [1]
@@ -0,0 +1,67 @@
+import requests
+
+from tests.load.fakes import FakeMAL, FakeQBittorrent, FakeToloka, UpstreamProfile
+from tests.load.harness import (
+    build_report,
+    percentile,
+    redirect_toloka,
+    run_load,
+    Sample,
+)
+
+_session_request = requests.Session.request
+
+
+def test_fake_upstreams_apply_profile():
+    profile = UpstreamProfile(latency=0, jitter=0, items=3)
+    with FakeMAL(profile) as mal, FakeQBittorrent(UpstreamProfile(items=5)) as qbit:
+        response = requests.get(f"{mal.url}/anime", params={"q": "x"}, timeout=5)
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == 3
+
+        login = requests.post(f"{qbit.url}/api/v2/auth/login", timeout=5)
+        assert login.text == "Ok."
+        assert "SID" in login.cookies
+        torrents = requests.get(f"{qbit.url}/api/v2/torrents/info", timeout=5)
+        assert len(torrents.json()) == 5
+
+        mal.profile.error_rate = 1.0
+        response = requests.get(f"{mal.url}/anime/1", timeout=5)
+        assert response.status_code == 500
+        assert mal.stats() == {"requests": 2, "errors": 1}
+
+
+def test_run_load_reports_percentiles():
+    profile = UpstreamProfile(latency=0, jitter=0)
+    with FakeMAL(profile) as mal:
+        report = run_load(
+            mal.url,
+            [(1, "search", "/anime?q={query}"), (1, "detail", "/anime/{anime_id}")],
+            concurrency=4,
+            duration=5,
+            max_requests=40,
+        )
+
+    assert report["total"]["requests"] == 40
+    assert report["total"]["errors"] == 0
+    assert set(report["endpoints"]) == {"search", "detail"}
+    assert report["total"]["p50_ms"] <= report["total"]["p99_ms"]
+
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([5, 1, 3, 2, 4], 99) == 5
+    samples = [Sample("a", 200, 0.01), Sample("a", 503, 0.02)]
+    assert build_report(samples, 1.0)["endpoints"]["a"]["errors"] == 1
+
+
+def test_redirect_toloka_sends_toloka_requests_to_the_fake():
+    toloka = FakeToloka(UpstreamProfile(latency=0)).start()
+    restore = redirect_toloka(toloka.url)
+    try:
+        response = requests.post("https://toloka.to/login.php", timeout=5)
+    finally:
+        restore()
+        toloka.stop()
+
+    assert response.status_code == 200
+    assert response.cookies.get("toloka_sid") == "fake"
+    assert requests.Session.request is _session_request
@@ -0,0 +1,86 @@
+import json
+import logging
+
+from app.utils import logging_config
+from app.utils.logging_config import SamplingFilter, configure_logging, parse_sampling
+
+
+def test_handlers_are_installed_once(app):
+    listener = logging_config._listener
+
+    configure_logging(app)
+    configure_logging(app)
+
+    queue_handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, logging_config.ContextQueueHandler)
+    ]
+    assert logging_config._listener is listener
+    assert len(queue_handlers) == 1
+
+
+def test_json_lines_written_by_listener_with_request_context(app, tmp_path):
+    log_file = tmp_path / "logs" / "app.log"
+    app.config.update(LOG_FORMAT="json", LOG_FILE=str(log_file), LOG_MAX_BYTES=10_000)
+    configure_logging(app)
+
+    logger = logging.getLogger("app.test")
+    with app.test_request_context("/api/anime?query=demo"):
+        logger.info("hello %s", "world")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    logging_config.shutdown_logging()
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    hello, failed = (e for e in entries if e["logger"] == "app.test")
+    assert hello["message"] == "hello world"
+    assert hello["method"] == "GET"
+    assert hello["url"].endswith("/api/anime?query=demo")
+    assert "ValueError: boom" in failed["exception"]
+
+
+def test_sampling_keeps_warnings_and_longest_prefix_wins():
+    sampling = SamplingFilter(parse_sampling("app=0, app.routes.anime=1, bad=x"))
+
+    def record(name, level=logging.INFO):
+        return logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+
+    assert not sampling.filter(record("app.services"))
+    assert sampling.filter(record("app.services", logging.WARNING))
+    assert sampling.filter(record("app.routes.anime"))
+    assert sampling.filter(record("application"))
+
+
+def test_forked_worker_rotates_its_own_log_file(app, tmp_path, monkeypatch):
+    log_file = tmp_path / "app.log"
+    app.config.update(LOG_FILE=str(log_file), LOG_MAX_BYTES=10_000)
+    configure_logging(app)
+    # A forked child has no listener thread; stop the parent's here
+    logging_config._listener.stop()
+
+    monkeypatch.setattr(logging_config.os, "getpid", lambda: 4242)
+    logging_config._restart_in_child()
+    logging.getLogger("app.test").warning("from the worker")
+    logging_config.shutdown_logging()
+
+    worker_file = tmp_path / "app.4242.log"
+    assert "from the worker" in worker_file.read_text()
+    assert "from the worker" not in log_file.read_text()
+
+
+def test_forked_worker_shares_log_file_without_rotation(app, tmp_path, monkeypatch):
+    log_file = tmp_path / "app.log"
+    app.config.update(LOG_FILE=str(log_file), LOG_MAX_BYTES=0, LOG_ROTATE_WHEN="")
+    configure_logging(app)
+    logging_config._listener.stop()
+
+    monkeypatch.setattr(logging_config.os, "getpid", lambda: 4242)
+    logging_config._restart_in_child()
+    logging.getLogger("app.test").warning("from the worker")
+    logging_config.shutdown_logging()
+
+    assert "from the worker" in log_file.read_text()
+    assert not (tmp_path / "app.4242.log").exists()
@@ -0,0 +1,226 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+from app.services.mal_service import MALService
+from app.services.services import TorrentService
+from app.utils.metrics import registry, track_upstream
+from app.utils.profiler import SamplingProfiler
+
+API_KEY_HEADERS = {"X-API-Key": "test-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_metrics():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def test_metrics_endpoint_reports_requests_and_cache_ratio(app, client):
+    first = client.get("/api/profile", headers=API_KEY_HEADERS)
+    client.get(
+        "/api/profile",
+        headers={**API_KEY_HEADERS, "If-None-Match": first.headers["ETag"]},
+    )
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers=API_KEY_HEADERS)
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+
+    body = response.get_data(as_text=True)
+    route = 'blueprint="user",endpoint="user.get_profile"'
+    assert (
+        f'toloka2web_http_requests_total{{{route},method="GET",status="200"}} 1' in body
+    )
+    assert (
+        f'toloka2web_http_requests_total{{{route},method="GET",status="304"}} 1' in body
+    )
+    assert (
+        f'toloka2web_http_request_duration_seconds_bucket{{{route},method="GET",le="+Inf"}} 2'
+        in body
+    )
+    assert f"toloka2web_db_queries_per_request_count{{{route}}} 2" in body
+    assert (
+        'toloka2web_cache_requests_total{cache="http_conditional",result="hit"} 1'
+        in body
+    )
+    assert "toloka2web_http_requests_in_flight 1" in body
+
+
+def test_metrics_are_summed_across_worker_processes(app, client, tmp_path):
+    # Worker snapshots: one still running, one that has exited
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    route = ["user", "user.get_profile", "GET", "200"]
+    for pid, requests_total, in_flight in ((os.getppid(), 2, 1), (exited.pid, 3, 4)):
+        snapshot = {
+            "toloka2web_http_requests_total": [[route, requests_total]],
+            "toloka2web_http_requests_in_flight": [[[], in_flight]],
+            "toloka2web_http_request_duration_seconds": [
+                [route[:3], [[1] + [0] * 11, 0.001]]
+            ],
+        }
+        (tmp_path / f"{pid}.json").write_text(json.dumps(snapshot))
+
+    registry.directory = str(tmp_path)
+    try:
+        client.get("/api/profile", headers=API_KEY_HEADERS)
+        assert (tmp_path / f"{os.getpid()}.json").exists()
+        body = client.get("/metrics", headers=API_KEY_HEADERS).get_data(as_text=True)
+    finally:
+        registry.directory = None
+
+    labels = 'blueprint="user",endpoint="user.get_profile"'
+    assert (
+        f'toloka2web_http_requests_total{{{labels},method="GET",status="200"}} 6'
+        in body
+    )
+    assert (
+        f'toloka2web_http_request_duration_seconds_count{{{labels},method="GET"}} 3'
+        in body
+    )
+    # In-flight requests of the exited worker are not counted
+    assert "toloka2web_http_requests_in_flight 2" in body
+
+
+class _FakeResponse:
+    status_code = 503
+    headers = {"Content-Length": "42"}
+
+
+def test_upstream_calls_are_recorded_by_status_and_error_kind(client, monkeypatch):
+    monkeypatch.setattr(MALService, "get_api_key", classmethod(lambda cls, key: "k"))
+    monkeypatch.setattr(
+        "app.services.base_service.requests.get", lambda **kwargs: _FakeResponse()
+    )
+    assert "error" in MALService.get_anime_detail(1)
+
+    def _timeout(**kwargs):
+        raise requests.Timeout("read timed out")
+
+    monkeypatch.setattr("app.services.base_service.requests.get", _timeout)
+    with pytest.raises(requests.Timeout):
+        MALService.search_anime("frieren")
+
+    with pytest.raises(RuntimeError):
+        with track_upstream(TorrentService.UPSTREAM, "torrent_info"):
+            raise RuntimeError("client offline")
+
+    assert client.get("/api/metrics/upstreams").status_code == 401
+    response = client.get("/api/metrics/upstreams", headers=API_KEY_HEADERS)
+    assert response.status_code == 200
+    summary = {(row["upstream"], row["endpoint"]): row for row in response.get_json()}
+
+    detail = summary[("mal", "/anime/{id}")]
+    assert detail["calls"] == 1
+    assert detail["statuses"] == {"503": 1}
+    assert detail["errors"] == {"http": 1}
+    assert detail["bytes"] == 42
+    assert detail["latency_ms"]["p99"] is not None
+
+    assert summary[("mal", "/anime")]["errors"] == {"timeout": 1}
+    assert summary[("torrent_client", "torrent_info")]["statuses"] == {"error": 1}
+
+    body = client.get("/metrics", headers=API_KEY_HEADERS).get_data(as_text=True)
+    assert (
+        'toloka2web_upstream_requests_total{upstream="mal",endpoint="/anime",'
+        'status="timeout"} 1' in body
+    )
+
+
+def _slow_titles():
+    import time
+
+    time.sleep(0.05)
+    return {"release": {"title": "Release"}}
+
+
+def test_admin_can_profile_a_request(app, client, monkeypatch, tmp_path):
+    app.config["PROFILE_DIR"] = str(tmp_path / "profiles")
+    monkeypatch.setattr(
+        "app.services.services.TolokaService.get_titles_with_torrent_status",
+        _slow_titles,
+    )
+
+    plain = client.get("/api/releases", headers=API_KEY_HEADERS)
+    assert "X-Profile-URL" not in plain.headers
+
+    response = client.get("/api/releases?profile=collapsed", headers=API_KEY_HEADERS)
+    assert response.status_code == 200
+    assert response.get_json() == {"release": {"title": "Release"}}
+    collapsed_url = response.headers["X-Profile-URL"]
+    assert collapsed_url.endswith(".collapsed.txt")
+
+    collapsed = client.get(collapsed_url, headers=API_KEY_HEADERS)
+    assert collapsed.status_code == 200
+    assert "_slow_titles" in collapsed.get_data(as_text=True)
+
+    response = client.get(
+        "/api/releases", headers={**API_KEY_HEADERS, "X-Profile": "speedscope"}
+    )
+    speedscope = client.get(response.headers["X-Profile-URL"], headers=API_KEY_HEADERS)
+    profile = speedscope.get_json()
+    assert profile["profiles"][0]["type"] == "sampled"
+    assert "_slow_titles" in {frame["name"] for frame in profile["shared"]["frames"]}
+
+    listing = client.get("/api/profiles", headers=API_KEY_HEADERS).get_json()
+    assert len(listing) == 2
+    assert (
+        client.get("/api/profiles/missing.txt", headers=API_KEY_HEADERS).status_code
+        == 404
+    )
+
+
+def test_profiling_switch_is_ignored_for_non_admins(app, client):
+    from app.models.base import db
+    from app.models.user import User
+
+    user = User(username="tester", roles="user")
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+
+    login = client.post(
+        "/api/auth/login", json={"username": "tester", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {login.get_json()['access_token']}"}
+
+    assert client.get("/api/profile", headers=headers).status_code == 200
+    response = client.get("/api/profile?profile=1", headers=headers)
+    assert response.status_code == 200
+    assert "X-Profile-URL" not in response.headers
+
+    anonymous = client.get("/api/profile", headers={"X-Profile": "1"})
+    assert anonymous.status_code == 401
+    assert "X-Profile-URL" not in anonymous.headers
+
+
+def test_profile_weights_are_measured_time_between_samples():
+    class _LateWakeups(threading.Event):
+        # A loaded sampler thread wakes long after the interval
+        def wait(self, timeout=None):
+            time.sleep(0.02)
+            return self.is_set()
+
+    done = threading.Event()
+    worker = threading.Thread(target=done.wait, args=(5,))
+    worker.start()
+    profiler = SamplingProfiler(worker.ident, interval=0.001)
+    profiler._stop = _LateWakeups()
+    profiler.start()
+    time.sleep(0.3)
+    profiler.stop()
+    done.set()
+    worker.join()
+
+    weights = profiler.to_speedscope("test")["profiles"][0]["weights"]
+    # Not samples * interval (about 0.015s here)
+    assert 0.2 <= sum(weights) <= profiler.duration
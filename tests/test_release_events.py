@@ -0,0 +1,209 @@
+import threading
+
+import pytest
+
+from app.services.event_service import EventService
+from app.services.services import TorrentService
+from app.utils.errors import ServiceUnavailableError
+
+# The fixture replaces the poller; keep the real loop for lifecycle tests
+_real_poll_loop = EventService.__dict__["_poll_loop"]
+
+
+@pytest.fixture()
+def events(monkeypatch):
+    monkeypatch.setattr(EventService, "_subscribers", [])
+    monkeypatch.setattr(EventService, "_snapshot", {})
+    monkeypatch.setattr(EventService, "_poller", None)
+    monkeypatch.setattr(EventService, "_stop", threading.Event())
+    monkeypatch.setattr(EventService, "_job_cursor", 0)
+    monkeypatch.setattr(
+        EventService, "_poll_loop", classmethod(lambda cls, stop, app=None: None)
+    )
+    return EventService
+
+
+def _drain(subscriber):
+    items = []
+    while not subscriber.empty():
+        items.append(subscriber.get_nowait())
+    return items
+
+
+def test_refresh_fans_out_only_changed_torrents(events, monkeypatch):
+    statuses = {
+        "abc": {"state": "downloading", "progress": 0.5, "name": "Demo"},
+        "def": {"state": "uploading", "progress": 1, "name": "Other"},
+    }
+    monkeypatch.setattr(
+        TorrentService,
+        "get_torrent_status_by_hash",
+        classmethod(lambda cls: {k: dict(v) for k, v in statuses.items()}),
+    )
+
+    first = events.subscribe()
+    second = events.subscribe()
+
+    events.refresh()
+    assert len(_drain(first)) == 2
+    assert len(_drain(second)) == 2
+
+    statuses["abc"]["progress"] = 0.75
+    del statuses["def"]
+    events.refresh()
+
+    received = _drain(first)
+    assert ("torrent", {"hash": "abc", **statuses["abc"]}) in received
+    assert ("torrent_removed", {"hash": "def"}) in received
+    assert _drain(second) == received
+
+    events.unsubscribe(first)
+    events.unsubscribe(second)
+    assert events._stop.is_set()
+
+
+def test_resubscribe_while_poller_sleeps_restarts_polling(events, monkeypatch):
+    polls = threading.Semaphore(0)
+    monkeypatch.setattr(EventService, "_poll_loop", _real_poll_loop)
+    monkeypatch.setattr(EventService, "POLL_INTERVAL", 60)
+    monkeypatch.setattr(
+        EventService, "refresh", classmethod(lambda cls: polls.release())
+    )
+
+    first = events.subscribe()
+    assert polls.acquire(timeout=5)
+    old_poller = events._poller
+    # Page reload: the last client leaves and a new one arrives while the
+    # poller is still waiting for its next poll
+    events.unsubscribe(first)
+    second = events.subscribe()
+
+    assert polls.acquire(timeout=5)
+    old_poller.join(timeout=5)
+    assert not old_poller.is_alive()
+    assert events._poller.is_alive() and not events._stop.is_set()
+
+    events.unsubscribe(second)
+    events._poller.join(timeout=5)
+    assert not events._poller.is_alive()
+
+
+def test_subscribers_are_capped_per_worker(client, events, monkeypatch):
+    monkeypatch.setattr(EventService, "MAX_CLIENTS", 1)
+    subscriber = events.subscribe()
+    with pytest.raises(ServiceUnavailableError):
+        events.subscribe()
+
+    response = client.get("/api/releases/events", headers={"X-API-Key": "test-api-key"})
+    assert response.status_code == 503
+    assert events._subscribers == [subscriber]
+    events.unsubscribe(subscriber)
+
+
+def test_release_events_endpoint_streams_snapshot(client, events, monkeypatch):
+    events._snapshot = {"abc": {"state": "stalledUP", "progress": 1, "name": "Demo"}}
+
+    unauthorized = client.get("/api/releases/events")
+    assert unauthorized.status_code == 401
+
+    response = client.get(
+        "/api/releases/events",
+        headers={"X-API-Key": "test-api-key"},
+        buffered=False,
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    chunks = (chunk.decode() for chunk in response.response)
+    assert next(chunks).startswith("retry:")
+    snapshot = next(chunks)
+    assert snapshot.startswith("event: snapshot")
+    assert '"abc"' in snapshot
+    response.close()
+    assert events._subscribers == []
+
+
+def test_update_release_publishes_job_events(client, events, monkeypatch):
+    from app.services.services import TolokaService
+
+    monkeypatch.setattr(
+        TolokaService,
+        "update_release_logic",
+        lambda data: {"response_code": "SUCCESS"},
+    )
+    subscriber = events.subscribe()
+
+    response = client.post(
+        "/api/releases/update",
+        headers={"X-API-Key": "test-api-key"},
+        json={"codename": "demo"},
+    )
+    assert response.status_code == 200
+    # Job events reach clients through the database, like those of other workers
+    assert _drain(subscriber) == []
+    events.relay_jobs()
+
+    jobs = [data for event, data in _drain(subscriber) if event == "job"]
+    assert [job["status"] for job in jobs] == ["started", "finished"]
+    assert jobs[1]["codename"] == "demo"
+    events.unsubscribe(subscriber)
+
+
+def test_failed_job_publishes_failed_event(client, events, monkeypatch):
+    from app.services.services import TolokaService
+
+    def add_release_logic(data):
+        raise RuntimeError("tracker unreachable")
+
+    monkeypatch.setattr(TolokaService, "add_release_logic", add_release_logic)
+    monkeypatch.setattr(
+        TolokaService,
+        "update_release_logic",
+        lambda data: {"error": "release not found"},
+    )
+    subscriber = events.subscribe()
+
+    response = client.post(
+        "/api/releases",
+        headers={"X-API-Key": "test-api-key"},
+        json={"url": "https://toloka.to/t1"},
+    )
+    assert response.status_code == 500
+    client.post(
+        "/api/releases/update",
+        headers={"X-API-Key": "test-api-key"},
+        json={"codename": "demo"},
+    )
+    events.relay_jobs()
+
+    jobs = [data for event, data in _drain(subscriber) if event == "job"]
+    assert [(job["operation"], job["status"]) for job in jobs] == [
+        ("add", "started"),
+        ("add", "failed"),
+        ("update", "started"),
+        ("update", "failed"),
+    ]
+    assert jobs[1]["error"] == "tracker unreachable"
+    assert jobs[3]["result"] == {"error": "release not found"}
+    events.unsubscribe(subscriber)
+
+
+def test_poller_relays_jobs_of_other_workers(app, events, monkeypatch):
+    from app.models.release_event import ReleaseEvent
+
+    monkeypatch.setattr(EventService, "_poll_loop", _real_poll_loop)
+    monkeypatch.setattr(EventService, "JOB_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(EventService, "refresh", classmethod(lambda cls: None))
+    # Published before this client connected: not replayed
+    ReleaseEvent.add("job", {"operation": "add", "status": "finished"})
+
+    subscriber = events.subscribe()
+    # Another worker stores a job event
+    ReleaseEvent.add("job", {"operation": "update", "status": "started"})
+
+    assert subscriber.get(timeout=5) == (
+        "job",
+        {"operation": "update", "status": "started"},
+    )
+    events.unsubscribe(subscriber)
+    events._poller.join(timeout=5)
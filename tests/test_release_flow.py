@@ -1,9 +1,16 @@
+import configparser
 import datetime
+import threading
+import time
 import types
 
+import pytest
+
 from app.models.releases import Releases
 from app.services.config_service import ConfigService
 from app.services.services import TolokaService
+from app.utils.errors import ConflictError
+from app.utils.file_lock import FileLock
 
 
 def test_add_release_flow(client, monkeypatch):
@@ -152,6 +159,162 @@ def test_update_release_logic_force_argument(monkeypatch):
     assert captured["force"] is True
 
 
+def _bulk_spec(title):
+    return {
+        "url": f"https://toloka.to/t{len(title)}",
+        "season": "1",
+        "index": 1,
+        "correction": 0,
+        "title": title,
+    }
+
+
+class _FakeLibrary:
+    """Stand-in for toloka2MediaServer that rewrites titles.ini like the library.
+
+    add_release_by_url adds the release to the titles configuration it was
+    given and writes all of it to titles.ini.
+    """
+
+    def __init__(self, titles_path, monkeypatch):
+        self.titles_path = titles_path
+        self.clients = []
+        monkeypatch.setitem(TolokaService.CONFIG_PATHS, "titles", str(titles_path))
+        monkeypatch.setattr(TolokaService, "initiate_config", self.initiate_config)
+        monkeypatch.setattr(
+            "app.services.services.load_configurations", self.load_configurations
+        )
+        monkeypatch.setattr(
+            "app.services.services.add_release_by_url", self.add_release_by_url
+        )
+
+    def load_configurations(self, app_path, titles_path):
+        titles_config = configparser.ConfigParser()
+        titles_config.read(titles_path, encoding="utf-8")
+        return {}, titles_config, None
+
+    def initiate_config(self):
+        config = types.SimpleNamespace(
+            titles_config=self.load_configurations(None, self.titles_path)[1],
+            application_config=types.SimpleNamespace(default_download_dir="/d"),
+            toloka=object(),
+            client=object(),
+        )
+        self.clients.append((config.toloka, config.client))
+        return config
+
+    def add_release_by_url(self, config):
+        if config.args.title == "Broken":
+            raise RuntimeError("topic not found")
+        # Give other imports a chance to interleave
+        time.sleep(0.01)
+        config.titles_config[config.args.title] = {"season_number": "1"}
+        with open(self.titles_path, "w", encoding="utf-8") as titles_file:
+            config.titles_config.write(titles_file)
+        return types.SimpleNamespace(
+            operation_type=types.SimpleNamespace(name="ADD_RELEASE"),
+            torrent_references=[],
+            titles_references=[],
+            status_message="release added",
+            response_code=types.SimpleNamespace(name="SUCCESS"),
+            operation_logs=[],
+            start_time=None,
+            end_time=None,
+        )
+
+    def sections(self):
+        written = configparser.ConfigParser()
+        written.read(self.titles_path, encoding="utf-8")
+        return sorted(written.sections())
+
+
+def test_add_releases_bulk_adds_each_release_and_syncs_once(
+    client, monkeypatch, tmp_path
+):
+    library = _FakeLibrary(tmp_path / "titles.ini", monkeypatch)
+    syncs = []
+    monkeypatch.setattr(
+        ConfigService, "sync_settings", lambda *args: syncs.append(args)
+    )
+
+    titles = ["First", "Broken", "Third", "Fourth", "Fifth"]
+    response = client.post(
+        "/api/releases/bulk",
+        headers={"X-API-Key": "test-api-key"},
+        json={"releases": [_bulk_spec(t) for t in titles]},
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert (payload["total"], payload["added"], payload["failed"]) == (5, 4, 1)
+    assert [item["title"] for item in payload["results"]] == titles
+    assert payload["results"][1]["error"] == "topic not found"
+    assert syncs == [("release", "from")]
+    # Every release survives the others' rewrites of titles.ini
+    assert library.sections() == ["Fifth", "First", "Fourth", "Third"]
+    # No two imports share a Toloka or torrent client
+    assert len({id(obj) for pair in library.clients for obj in pair}) == 10
+
+
+def test_add_releases_bulk_keeps_concurrent_titles_changes(monkeypatch, tmp_path):
+    titles_path = tmp_path / "titles.ini"
+    titles_path.write_text("[Existing]\nseason_number = 1\n", encoding="utf-8")
+    library = _FakeLibrary(titles_path, monkeypatch)
+    bulk_started = threading.Event()
+    add_release = library.add_release_by_url
+
+    def add_release_by_url(config):
+        bulk_started.set()
+        return add_release(config)
+
+    monkeypatch.setattr("app.services.services.add_release_by_url", add_release_by_url)
+
+    specs = [_bulk_spec(f"Bulk {i}") for i in range(6)]
+    bulk = threading.Thread(target=TolokaService.add_releases_bulk, args=(specs,))
+    bulk.start()
+    assert bulk_started.wait(5)
+    # A single add while the import runs
+    single = TolokaService.add_release_logic(_bulk_spec("Single"))
+    bulk.join()
+
+    assert single["status_message"] == "release added"
+    assert library.sections() == sorted(
+        ["Existing", "Single"] + [spec["title"] for spec in specs]
+    )
+
+
+def test_bulk_import_lock_is_shared_between_workers(monkeypatch, tmp_path):
+    lock_path = str(tmp_path / "bulk_import.lock")
+    monkeypatch.setattr(TolokaService, "_bulk_import_lock", FileLock(lock_path))
+    # A separate lock on the same file stands in for another Gunicorn worker
+    other_worker = FileLock(lock_path)
+    assert other_worker.acquire(blocking=False)
+    try:
+        with pytest.raises(ConflictError):
+            TolokaService.add_releases_bulk([_bulk_spec("First")])
+    finally:
+        other_worker.release()
+
+
+def test_add_releases_bulk_rejects_incomplete_spec(client, monkeypatch):
+    monkeypatch.setattr(
+        TolokaService,
+        "add_releases_bulk",
+        lambda specs: (_ for _ in ()).throw(AssertionError("must not run")),
+    )
+    spec = _bulk_spec("Demo")
+    del spec["url"]
+
+    response = client.post(
+        "/api/releases/bulk",
+        headers={"X-API-Key": "test-api-key"},
+        json=[_bulk_spec("Other"), spec],
+    )
+
+    assert response.status_code == 400
+    assert "Release 1 is missing url" in response.get_json()["error"]["message"]
+
+
 def test_edit_release_accepts_full_year(app):
     form = {
         "codename": "demo-release",
@@ -174,3 +337,76 @@ def test_edit_release_accepts_full_year(app):
 
     assert release is not None
     assert release.publish_date == datetime.datetime(2026, 1, 28, 22, 21)
+
+
+def _add_releases(*specs):
+    from app.models.base import db
+
+    for section, group, ongoing in specs:
+        db.session.add(
+            Releases(
+                section=section,
+                episode_index=1,
+                season_number="1",
+                release_group=group,
+                ongoing=ongoing,
+            )
+        )
+    db.session.commit()
+
+
+def test_bulk_edit_releases_by_codenames(client, monkeypatch):
+    _add_releases(("a", "G1", True), ("b", "G1", True), ("c", "G2", True))
+    syncs = []
+    monkeypatch.setattr(
+        ConfigService, "sync_settings", lambda *args: syncs.append(args)
+    )
+
+    response = client.patch(
+        "/api/releases",
+        headers={"X-API-Key": "test-api-key"},
+        json={"codenames": ["a", "b", "missing"], "changes": {"ongoing": "false"}},
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["updated"] == 2
+    assert payload["not_found"] == ["missing"]
+    assert syncs == [("release", "to")]
+    ongoing = {r.section: r.ongoing for r in Releases.query.all()}
+    assert ongoing == {"a": False, "b": False, "c": True}
+
+
+def test_bulk_delete_releases_by_filter(client, monkeypatch):
+    _add_releases(("a", "G1", True), ("b", "G1", False), ("c", "G2", False))
+    syncs = []
+    monkeypatch.setattr(
+        ConfigService, "sync_settings", lambda *args: syncs.append(args)
+    )
+
+    response = client.delete(
+        "/api/releases",
+        headers={"X-API-Key": "test-api-key"},
+        json={"filter": {"release_group": "G1", "ongoing": False}},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["deleted"] == 1
+    assert syncs == [("release", "to")]
+    assert sorted(r.section for r in Releases.query.all()) == ["a", "c"]
+
+
+def test_bulk_edit_releases_rejects_unknown_fields(client):
+    response = client.patch(
+        "/api/releases",
+        headers={"X-API-Key": "test-api-key"},
+        json={"filter": {"ongoing": True}, "changes": {"hash": "x"}},
+    )
+    assert response.status_code == 400
+
+    response = client.patch(
+        "/api/releases",
+        headers={"X-API-Key": "test-api-key"},
+        json={"changes": {"ongoing": True}},
+    )
+    assert response.status_code == 400
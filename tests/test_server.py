@@ -0,0 +1,37 @@
+from app import server
+
+
+def test_build_server_options_reads_worker_settings_from_env():
+    options = server.build_server_options(
+        "127.0.0.1",
+        8080,
+        env={"WEB_WORKERS": "4", "WEB_THREADS": "16", "WEB_MAX_REQUESTS": "bogus"},
+    )
+    assert options["bind"] == "127.0.0.1:8080"
+    assert options["workers"] == 4
+    assert options["threads"] == 16
+    assert options["worker_class"] == "gthread"
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 0
+
+
+def test_serve_uses_development_server_by_default(app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "run", lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(
+        server, "run_production", lambda *args: calls.append("production")
+    )
+
+    server.serve(app)
+    assert calls == [{"host": "0.0.0.0", "port": 5000, "debug": False}]
+
+    app.config["SERVER_MODE"] = "production"
+    server.serve(app)
+    assert calls[-1] == "production"
+
+
+def test_build_server_options_uses_uvicorn_workers_in_asgi_mode():
+    options = server.build_server_options(
+        "127.0.0.1", 8080, env={}, mode=server.ASGI_MODE
+    )
+    assert options["worker_class"] == "uvicorn_worker.UvicornWorker"
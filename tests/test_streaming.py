@@ -0,0 +1,125 @@
+import threading
+import time
+import types
+
+from app.services.services import StreamingService
+
+
+class _Provider:
+    def __init__(self, name, results=None, delay=None, error=None):
+        self.name = name
+        self.results = results or []
+        self.delay = delay
+        self.error = error
+
+    def search_title(self, query):
+        if self.delay:
+            self.delay.wait(5)
+        if self.error:
+            raise self.error
+        return [f"{self.name}:{query}:{item}" for item in self.results]
+
+
+def _use_main_logic(monkeypatch, main_logic):
+    monkeypatch.setattr(StreamingService, "_main_logic", main_logic)
+    StreamingService.DETAILS_CACHE.invalidate()
+
+
+def test_search_fans_out_and_returns_partial_results(app, monkeypatch):
+    blocked = threading.Event()
+    _use_main_logic(
+        monkeypatch,
+        types.SimpleNamespace(
+            providers={
+                "fast": _Provider("fast", results=[1, 2]),
+                "broken": _Provider("broken", error=RuntimeError("boom")),
+                "slow": _Provider("slow", results=[3], delay=blocked),
+            }
+        ),
+    )
+    monkeypatch.setattr(StreamingService, "PROVIDER_TIMEOUT", 0.2)
+
+    results = StreamingService.search_titles_from_streaming_site("frieren")
+    blocked.set()
+
+    assert results == ["fast:frieren:1", "fast:frieren:2"]
+
+
+def test_library_main_logic_without_providers_is_searched_serially(app, monkeypatch):
+    _use_main_logic(monkeypatch, None)
+    main_logic = StreamingService.get_main_logic()
+    monkeypatch.setattr(main_logic, "search_releases", lambda query: [f"all:{query}"])
+
+    assert StreamingService.get_providers(main_logic) == []
+    assert StreamingService.search_titles_from_streaming_site("x") == ["all:x"]
+
+
+def test_providers_without_search_title_are_searched_serially(app, monkeypatch):
+    _use_main_logic(
+        monkeypatch,
+        types.SimpleNamespace(
+            providers={"uakino": object()},
+            search_releases=lambda query: [f"all:{query}"],
+        ),
+    )
+
+    assert StreamingService.search_titles_from_streaming_site("x") == ["all:x"]
+
+
+def test_hanging_provider_is_skipped_until_it_returns(app, monkeypatch):
+    blocked = threading.Event()
+    slow = _Provider("slow", results=[3], delay=blocked)
+    calls = []
+    search_title = slow.search_title
+    slow.search_title = lambda query: calls.append(query) or search_title(query)
+    _use_main_logic(
+        monkeypatch,
+        types.SimpleNamespace(
+            providers={"fast": _Provider("fast", results=[1]), "slow": slow}
+        ),
+    )
+    monkeypatch.setattr(StreamingService, "_stuck", set())
+    monkeypatch.setattr(StreamingService, "PROVIDER_TIMEOUT", 0.2)
+
+    assert StreamingService.search_titles_from_streaming_site("a") == ["fast:a:1"]
+    # The first call still holds its thread; no second one is started
+    assert StreamingService.search_titles_from_streaming_site("b") == ["fast:b:1"]
+    assert calls == ["a"]
+
+    blocked.set()
+    for _ in range(50):
+        if not StreamingService._stuck:
+            break
+        time.sleep(0.01)
+    assert StreamingService.search_titles_from_streaming_site("c") == [
+        "fast:c:1",
+        "slow:c:3",
+    ]
+
+
+def test_search_without_provider_list_uses_main_logic(app, monkeypatch):
+    _use_main_logic(
+        monkeypatch,
+        types.SimpleNamespace(search_releases=lambda query: [f"all:{query}"]),
+    )
+
+    assert StreamingService.search_titles_from_streaming_site("x") == ["all:x"]
+
+
+def test_release_details_cached_per_provider_and_link(app, monkeypatch):
+    calls = []
+
+    def get_release_details(provider_name, release_url):
+        calls.append((provider_name, release_url))
+        return {"title": release_url}
+
+    _use_main_logic(
+        monkeypatch, types.SimpleNamespace(get_release_details=get_release_details)
+    )
+
+    for _ in range(3):
+        StreamingService.get_streaming_site_release_details("uakino", "/a")
+    StreamingService.get_streaming_site_release_details("uakino", "/b")
+
+    assert calls == [("uakino", "/a"), ("uakino", "/b")]
+    StreamingService.DETAILS_CACHE.invalidate()